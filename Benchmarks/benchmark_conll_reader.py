@@ -0,0 +1,101 @@
+# Compares the line by line CoNLL parsing (read_lines_in) with the bulk parsing
+# in blocks (read_blocks_in): on the demo file and on a synthetic corpus of
+# copies of it. Run from the repository root:
+#   python -m Benchmarks.benchmark_conll_reader --size-mb 1024
+import os
+import shutil
+import tempfile
+import time
+
+import click
+
+from DataReader.conll_data_reader import CoNLLDataReader
+
+DEMO_FILE = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "DemoData", "one_text",
+    "bc_cctv_0000.v4_auto_conll")
+
+
+def read_lines(file_path):
+    with open(file_path, 'r', encoding="utf-8") as f:
+        return CoNLLDataReader().read_lines_in(f)
+
+
+def read_blocks(file_path):
+    with open(file_path, 'r', encoding="utf-8") as f:
+        return CoNLLDataReader().read_blocks_in(f)
+
+
+def time_reader(reader, file_paths, repeat=1):
+    """Returns the best time of repeat runs of the reader over all files,
+    the results are not kept."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in file_paths:
+            reader(file_path)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best
+
+
+def create_corpus(corpus_dir, size_mb, file_mb):
+    """Writes files of about file_mb MB of copies of the demo file until the
+    corpus has size_mb MB. Returns the file paths."""
+    with open(DEMO_FILE, 'r', encoding="utf-8") as f:
+        demo_text = f.read()
+
+    copies_per_file = max(1, file_mb * 2 ** 20 // len(demo_text))
+    file_text = demo_text * copies_per_file
+    file_paths = []
+    total_bytes = 0
+    while total_bytes < size_mb * 2 ** 20:
+        file_path = os.path.join(corpus_dir,
+                                 f"synthetic_{len(file_paths):04d}.conll")
+        with open(file_path, 'w', encoding="utf-8") as f:
+            f.write(file_text)
+        file_paths.append(file_path)
+        total_bytes += os.path.getsize(file_path)
+
+    return file_paths
+
+
+def report(name, file_paths, repeat):
+    size_mb = sum(os.path.getsize(path) for path in file_paths) / 2 ** 20
+    lines_seconds = time_reader(read_lines, file_paths, repeat)
+    blocks_seconds = time_reader(read_blocks, file_paths, repeat)
+    print(f"{name}: {size_mb:.1f} MB")
+    print(f"  read_lines_in:  {lines_seconds:8.3f}s "
+          f"({size_mb / lines_seconds:6.1f} MB/s)")
+    print(f"  read_blocks_in: {blocks_seconds:8.3f}s "
+          f"({size_mb / blocks_seconds:6.1f} MB/s), "
+          f"speedup {lines_seconds / blocks_seconds:.2f}x")
+
+
+@click.command()
+@click.option('--size-mb', type=click.IntRange(min=0), default=1024,
+              show_default=True, help='Size of the synthetic corpus, '
+                                      '0 = demo file only.')
+@click.option('--file-mb', type=click.IntRange(min=1), default=16,
+              show_default=True, help='Size of one synthetic file.')
+@click.option('--repeat', type=click.IntRange(min=1), default=5,
+              show_default=True, help='Runs on the demo file, the best '
+                                      'one is reported.')
+def main(size_mb, file_mb, repeat):
+    if read_lines(DEMO_FILE) != read_blocks(DEMO_FILE):
+        raise click.ClickException("The readers give different results.")
+
+    report("demo file", [DEMO_FILE], repeat)
+
+    if size_mb > 0:
+        corpus_dir = tempfile.mkdtemp(prefix="conll_benchmark_")
+        try:
+            file_paths = create_corpus(corpus_dir, size_mb, file_mb)
+            report("synthetic corpus", file_paths, 1)
+        finally:
+            shutil.rmtree(corpus_dir)
+
+
+if __name__ == '__main__':
+    main()
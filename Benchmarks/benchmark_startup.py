@@ -0,0 +1,118 @@
+# Measures the startup of resolve.py: the wall-clock time and the import time
+# (python -X importtime) of `resolve.py --help` and of a run on a tiny
+# document, and fails if the imports take longer than the budget or import
+# modules that should only be imported on demand (nltk, NumPy, the sieves,
+# the modules of single options and commands). Run from
+# the repository root:
+#   python -m Benchmarks.benchmark_startup --budget-ms 300
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TINY_DOCUMENT = os.path.join(ROOT, "UnitTests", "test_data",
+                             "gold_test.v4_auto_conll")
+
+# modules that resolve.py must not import before they are needed
+LAZY_MODULES = ["nltk", "numpy", "sqlite3", "http.server", "tracemalloc",
+                "CorpusProcessing.significance",
+                "CorpusProcessing.result_store",
+                "CorpusProcessing.metrics",
+                "CorpusProcessing.memory_profile",
+                "CorpusProcessing.corpus_index",
+                "CorpusProcessing.conll_writer",
+                "MultiSievePassCorefResolution.pipeline",
+                "MultiSievePassCorefResolution.sieve_ablation",
+                "MultiSievePassCorefResolution.Sieves.exact_match_sieve",
+                "MultiSievePassCorefResolution.Sieves.precise_construct_sieve",
+                "MultiSievePassCorefResolution.Sieves.pronoun_sieve"]
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_import_times(stderr):
+    """Parses the output of python -X importtime. Returns a dict module name
+    -> cumulative microseconds of the modules imported at the top level
+    (not by another module) and the set of all imported modules."""
+    top_level = {}
+    modules = set()
+    for match in IMPORT_TIME_LINE.finditer(stderr):
+        modules.add(match.group(4))
+        if len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+
+    return top_level, modules
+
+
+def run_command(arguments, repeat=1):
+    """Runs resolve.py with the arguments in a new interpreter. Returns the
+    best wall-clock seconds of repeat runs, the top level import times and
+    the imported modules of the last run."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "resolve.py"] + arguments,
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        seconds = time.perf_counter() - start
+        if process.returncode != 0:
+            raise click.ClickException(f"resolve.py {' '.join(arguments)} "
+                                       f"failed:\n{process.stderr[-2000:]}")
+        best = seconds if best is None else min(best, seconds)
+
+    top_level, modules = parse_import_times(process.stderr)
+    return best, top_level, modules
+
+
+def report(name, seconds, top_level, top):
+    import_ms = sum(top_level.values()) / 1000
+    print(f"{name}: {seconds * 1000:.0f} ms wall-clock, "
+          f"{import_ms:.0f} ms imports")
+    for module, microseconds in sorted(top_level.items(),
+                                       key=lambda item: -item[1])[:top]:
+        print(f"  {microseconds / 1000:8.1f} ms  {module}")
+
+    return import_ms
+
+
+@click.command()
+@click.option('--budget-ms', type=click.FloatRange(min=0), default=300,
+              show_default=True,
+              help='Maximal import time of resolve.py --help.')
+@click.option('--repeat', type=click.IntRange(min=1), default=5,
+              show_default=True,
+              help='Runs of every command, the best one is reported.')
+@click.option('--top', type=click.IntRange(min=0), default=5,
+              show_default=True,
+              help='Number of the slowest imports that are listed.')
+def main(budget_ms, repeat, top):
+    seconds, top_level, modules = run_command(["--help"], repeat)
+    import_ms = report("resolve.py --help", seconds, top_level, top)
+    eager = [module for module in LAZY_MODULES if module in modules]
+
+    out_put_dir = tempfile.mkdtemp(prefix="startup_benchmark_")
+    try:
+        seconds, top_level, _ = run_command(
+            ["-f", TINY_DOCUMENT, "-o", out_put_dir], repeat)
+        report("tiny document", seconds, top_level, top)
+    finally:
+        shutil.rmtree(out_put_dir)
+
+    if eager:
+        raise click.ClickException(f"Imported at startup: "
+                                   f"{', '.join(eager)}.")
+    if import_ms > budget_ms:
+        raise click.ClickException(f"The imports take {import_ms:.0f} ms, "
+                                   f"the budget is {budget_ms:.0f} ms.")
+    print(f"within the budget of {budget_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
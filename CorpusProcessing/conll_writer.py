@@ -0,0 +1,167 @@
+# Writes the resolved clusters into the last column of the original CoNLL
+# files, in the CoNLL-2012 format read by the official scorer. The input is
+# streamed line by line next to the output: only the clusters are kept, the
+# documents are not parsed again.
+import os
+import re
+import threading
+
+from CorpusProcessing.sharding import OUTPUT_PREFIX
+
+# the last column of a line and the whitespace after it
+LAST_COLUMN_PATTERN = re.compile(r'\S+(\s*)$')
+
+
+def get_coreference_columns(clusters):
+    """Returns the coreference column of the tokens of the mentions.
+
+    :param clusters: list of clusters, each a list of (sent_num, start, end)
+        like Document.get_relevant_clusters, the index of a cluster is its ID
+    :return dict {(sent_num, token_index): "(0|1)"}, mentions that start are
+        written before single token mentions and mentions that end
+    """
+    starts = {}
+    singles = {}
+    ends = {}
+    for cluster_ID, cluster in enumerate(clusters):
+        for sent_num, start, end in cluster:
+            if start == end:
+                singles.setdefault((sent_num, start), []).append(
+                    f"({cluster_ID})")
+            else:
+                # longer mentions open first
+                starts.setdefault((sent_num, start), []).append(
+                    (start - end, f"({cluster_ID}"))
+                ends.setdefault((sent_num, end), []).append(
+                    (start - end, f"{cluster_ID})"))
+
+    columns = {}
+    for token in set(starts) | set(singles) | set(ends):
+        # longer mentions close last
+        columns[token] = "|".join(
+            [item for _, item in sorted(starts.get(token, []))]
+            + singles.get(token, [])
+            + [item for _, item in sorted(ends.get(token, []), reverse=True)])
+
+    return columns
+
+
+def write_conll(lines, out_file, part_clusters):
+    """Copies the lines of a CoNLL file to out_file and replaces the last
+    column of the tokens with the resolved clusters.
+
+    The document parts and sentences are counted like the reader does (see
+    CoNLLDataReader.read_parts_in), so that the clusters of a part refer to
+    the same sentences.
+
+    :param lines: iterable of str, e.g. a text stream of the input file
+    :param out_file: text stream
+    :param part_clusters: iterator over the clusters of the document parts
+        in the order of the reader, one item per part is taken
+    :return: number of parts taken
+    """
+    parts = 0
+    columns = {}
+    sentence_num = 0
+    sentence_tokens = 0
+    for line in lines:
+        if line.startswith("#begin document"):
+            columns = get_coreference_columns(next(part_clusters))
+            parts += 1
+            sentence_num = 0
+            sentence_tokens = 0
+        elif line == "\n":
+            # like the reader (see CoNLLDataReader.iterate_sentence_blocks)
+            # only an empty line ends a sentence and only blocks with tokens
+            # are sentences
+            if sentence_tokens:
+                sentence_num += 1
+            sentence_tokens = 0
+        elif not line.startswith("#") and not line.isspace():
+            # tokens before the first part are a part of their own
+            if parts == 0:
+                columns = get_coreference_columns(next(part_clusters))
+                parts += 1
+            token_index = int(line.split(None, 3)[2])
+            column = columns.get((sentence_num, token_index), "-")
+            line = LAST_COLUMN_PATTERN.sub(
+                lambda match: column + match.group(1), line, count=1)
+            sentence_tokens += 1
+
+        out_file.write(line)
+
+    # the reader gives a document for a file without tokens, too
+    if parts == 0:
+        next(part_clusters)
+        parts = 1
+
+    return parts
+
+
+def get_conll_output_name(document_name):
+    """Returns the name of the CoNLL output file of an input file."""
+    return OUTPUT_PREFIX + document_name
+
+
+class ConllOutput:
+    """Writes the CoNLL output of an input file, when the clusters of all its
+    documents are resolved.
+
+    self.out_put_dir: directory of the output files
+    self.data_reader: the reader of the input files, to open (compressed)
+        files and archives
+    """
+
+    def __init__(self, out_put_dir, data_reader):
+        self.out_put_dir = out_put_dir
+        self.data_reader = data_reader
+        # input key -> [file_path, document names, {name: clusters},
+        # whether all documents are registered]
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
+    def add_document(self, input_key, file_path, document_name):
+        """Registers a document of an input file, that is still being read.
+        The output is written after input_read."""
+        with self.__lock:
+            self.__pending.setdefault(
+                input_key, [file_path, [], {}, False])[1].append(document_name)
+
+    def input_read(self, input_key, file_path):
+        """Marks an input file, whose documents were registered with
+        add_document, as read. The output is written at once, if all
+        documents are already done."""
+        with self.__lock:
+            pending = self.__pending.setdefault(
+                input_key, [file_path, [], {}, False])
+            pending[3] = True
+            finished = len(pending[2]) == len(pending[1])
+        if finished:
+            self.__write(input_key)
+
+    def document_done(self, input_key, document_name, clusters):
+        """Stores the clusters of a document, the output file is written
+        when all documents of the input file are done."""
+        with self.__lock:
+            pending = self.__pending[input_key]
+            pending[2][document_name] = clusters
+            finished = pending[3] and len(pending[2]) == len(pending[1])
+        if finished:
+            self.__write(input_key)
+
+    def __write(self, input_key):
+        with self.__lock:
+            file_path, document_names, clusters, _ = \
+                self.__pending.pop(input_key)
+
+        part_clusters = iter([clusters.get(name, [])
+                              for name in document_names])
+        for document_name, f in self.data_reader.iterate_files(file_path):
+            self.__write_file(f, document_name, part_clusters)
+
+    def __write_file(self, f, document_name, part_clusters):
+        out_put_path = os.path.join(self.out_put_dir,
+                                    get_conll_output_name(document_name))
+        with open(out_put_path, 'w', encoding='utf-8', newline='\n') \
+                as out_file:
+            write_conll(f, out_file, part_clusters)
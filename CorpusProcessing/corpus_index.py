@@ -0,0 +1,168 @@
+# Builds an index of a CoNLL corpus: for every file, document part and
+# sentence the byte offsets and token counts, stored in a small json file next
+# to the corpus. With the index a single document can be read without reading
+# the rest of the corpus, and the costs of the files and documents are known
+# before they are read (for sharding and scheduling).
+import json
+import mmap
+import os
+import re
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from CorpusProcessing.manifest import create_file_hash
+from CorpusProcessing.scheduler import estimate_cost_from_tokens
+from CorpusProcessing.sharding import get_input_key
+
+INDEX_FILE = "corpus_index.json"
+
+# a blank line, the end of a sentence block
+BLANK_LINE_PATTERN = re.compile(rb'\n\r?\n')
+
+
+def get_index_path(corpus_path):
+    """Returns the default path of the index of a directory or a file."""
+    if os.path.isdir(corpus_path):
+        return os.path.join(corpus_path, INDEX_FILE)
+
+    return corpus_path + "." + INDEX_FILE
+
+
+def get_sentence_offsets(data, start, end):
+    """Returns the sentences between two byte offsets of a (mmap) buffer as a
+    list of [start, end, tokens]. Like the reader, lines after the last blank
+    line are no sentence and blocks without token lines are skipped."""
+    sentences = []
+    position = start
+    for blank_line in BLANK_LINE_PATTERN.finditer(data, start, end):
+        tokens = sum(1 for line in data[position:blank_line.end()].splitlines()
+                     if line.strip() and not line.startswith(b'#'))
+        if tokens:
+            sentences.append([position, blank_line.end(), tokens])
+        position = blank_line.end()
+
+    return sentences
+
+
+def index_file(file_path, data_reader):
+    """Returns the index entry of an uncompressed file:
+        {"size": 496334, "mtime": 1643284800.0, "hash": "9f86d0...",
+         "parts": [
+            {"document": "bc/cctv/00/cctv_0000", "part": "000",
+             "name": "cctv_0000.v4_auto_conll_part_000",
+             "start": 0, "end": 72611, "tokens": 1960,
+             "sentences": [[start, end, tokens], ...]}, ...]}
+    The hash is the one of the manifest (see manifest.get_file_hash), so
+    that a file read at the offsets of its parts is not read again to hash
+    it. Compressed files and archives can not be read at an offset, their
+    entry has "parts": None and no hash."""
+    stat = os.stat(file_path)
+    entry = {"size": stat.st_size, "mtime": stat.st_mtime, "parts": None}
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    if data_reader.is_archive(file_path) \
+            or data_reader.get_compression(file_path, head) is not None:
+        return entry
+
+    part_offsets = data_reader.get_part_offsets(file_path)
+    file_name = data_reader.get_document_name(file_path)
+    entry["parts"] = []
+    if stat.st_size == 0:
+        entry["hash"] = create_file_hash().hexdigest()
+        return entry
+
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        file_hash = create_file_hash()
+        file_hash.update(data)
+        entry["hash"] = file_hash.hexdigest()
+        for document_id, part, start, end in part_offsets:
+            sentences = get_sentence_offsets(data, start, end)
+            name = file_name if len(part_offsets) == 1 \
+                else data_reader.get_part_name(file_name, part)
+            entry["parts"].append({
+                "document": document_id, "part": part, "name": name,
+                "start": start, "end": end,
+                "tokens": sum(sentence[2] for sentence in sentences),
+                "sentences": sentences})
+
+    return entry
+
+
+class CorpusIndex:
+    """
+    self.root: directory of the corpus, the keys of the files are relative
+        to it (see sharding.get_input_key)
+    self.files: dict, keys are the input keys, values the entries of the
+        files (see index_file)
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+        self.files = {}
+
+    def get_file_path(self, input_key):
+        if self.root is None:
+            return input_key
+
+        return os.path.join(self.root, input_key)
+
+    def build(self, file_paths, data_reader=None):
+        """Indexes the files, whose entries are missing or out of date."""
+        if data_reader is None:
+            data_reader = CoNLLDataReader()
+
+        for file_path in file_paths:
+            if self.get_entry(file_path) is None:
+                self.files[get_input_key(file_path, self.root)] = \
+                    index_file(file_path, data_reader)
+
+    def get_entry(self, file_path):
+        """Returns the entry of a file, None if the file is not indexed or
+        changed since (size or modification time)."""
+        entry = self.files.get(get_input_key(file_path, self.root))
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        if entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            return None
+
+        return entry
+
+    def save(self, index_path):
+        with open(index_path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump({"files": self.files}, f, separators=(',', ':'))
+
+    def load(self, index_path):
+        """Reads an index file, nothing is read if it does not exist."""
+        if not os.path.isfile(index_path):
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.files.update(json.load(f)["files"])
+
+    def find_documents(self, document_ids):
+        """Returns the parts of the given documents as a list of tuples
+        (file_path, part entry). A document is given by its ID (all parts,
+        e.g. "bc/cctv/00/cctv_0000") or its name (one part, e.g.
+        "cctv_0000.v4_auto_conll_part_001")."""
+        found = []
+        for input_key, entry in sorted(self.files.items()):
+            for part in entry["parts"] or []:
+                if part["document"] in document_ids \
+                        or part["name"] in document_ids:
+                    found.append((self.get_file_path(input_key), part))
+
+        return found
+
+    def get_file_cost(self, file_path):
+        """Estimates the processing time of a file from the tokens of its
+        sentences (see scheduler.estimate_cost_from_tokens). Returns None if the
+        file is not indexed or compressed."""
+        entry = self.get_entry(file_path)
+        if entry is None or entry["parts"] is None:
+            return None
+
+        return sum(estimate_cost_from_tokens(
+            sentence[2] for sentence in part["sentences"])
+            for part in entry["parts"])
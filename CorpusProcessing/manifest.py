@@ -0,0 +1,184 @@
+# Keeps a record of the input files, whose documents have been processed
+# completely, in a manifest file in the output directory. Every entry stores a
+# hash of the input file, the sieve configuration, the budget limits and the
+# code version, so that a resumed run can skip exactly the files whose outputs
+# are still valid.
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# directories and files with the source code, that determines the results
+# (the readers, the sieves, the output writers, the budgets and the script)
+CODE_DIRS = ["DataReader", "MultiSievePassCorefResolution", "CorpusProcessing"]
+CODE_FILES = ["resolve.py"]
+
+
+def create_file_hash():
+    """Returns a new hash object of the kind get_file_hash uses, to hash a
+    file while it is read (see AbstractDataReader.iterate_files)."""
+    return hashlib.sha256()
+
+
+def get_file_hash(file_path):
+    """Returns the sha256 hash of the content of a file, read in blocks."""
+    file_hash = create_file_hash()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+def get_code_version(base_dir=None):
+    """Returns a hash of all python files, that determine the results.
+    Any change of a reader, a sieve, an output writer or resolve.py gives a
+    new code version."""
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    file_paths = [os.path.join(base_dir, file_name)
+                  for file_name in CODE_FILES
+                  if os.path.isfile(os.path.join(base_dir, file_name))]
+    for code_dir in CODE_DIRS:
+        for dir_path, dir_names, file_names in os.walk(
+                os.path.join(base_dir, code_dir)):
+            dir_names.sort()
+            file_paths.extend(os.path.join(dir_path, file_name)
+                              for file_name in sorted(file_names)
+                              if file_name.endswith(".py"))
+
+    code_hash = hashlib.sha256()
+    for file_path in file_paths:
+        relative_path = os.path.relpath(file_path, base_dir)
+        code_hash.update(relative_path.replace("\\", "/").encode())
+        code_hash.update(get_file_hash(file_path).encode())
+
+    return code_hash.hexdigest()
+
+
+class RunManifest:
+    """
+    self.path: path of the manifest file (json lines)
+    self.sieves: list of the sieve names of the run
+    self.mentions: str, where the mentions come from ("parse" or "gold")
+    self.code_version: str, see get_code_version
+    self.budget: dict, the budget limits of the documents (see
+        Pipeline), e.g. {"document_seconds": 2.0}
+    self.entries: dict, keys are the input keys, values the last entry
+        {"input": "a.v4_auto_conll", "input_hash": "...", "sieves": [...],
+         "mentions": "parse", "budget": {}, "code_version": "...",
+         "outputs": ["output_a.v4_auto_conll.json"], "degraded": false}
+
+    Entries are appended when all documents of an input file are finished,
+    so that an interrupted run leaves a valid manifest behind. An entry with
+    a degraded document (that ran out of its budget) is never up to date.
+    """
+
+    def __init__(self, out_put_dir, sieves, code_version, mentions="parse",
+                 budget=None):
+        self.out_put_dir = out_put_dir
+        self.path = os.path.join(out_put_dir, MANIFEST_FILE)
+        self.sieves = list(sieves)
+        self.mentions = mentions
+        self.budget = dict(budget or {})
+        self.code_version = code_version
+        self.entries = {}
+        # input key -> [input_hash, outputs, number of unfinished documents,
+        # whether all documents are registered, whether one was degraded]
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
+    def load(self):
+        """Reads the entries of an existing manifest, later entries of the
+        same input replace earlier ones. A broken last line (interrupted
+        write) is ignored."""
+        if not os.path.isfile(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as manifest_file:
+            for line in manifest_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[entry["input"]] = entry
+
+    def is_up_to_date(self, input_key, input_hash):
+        """Checks if the outputs of an input file were produced from the same
+        content, with the same sieves, mentions, budget limits and code
+        version, without degraded documents, and still exist. Entries
+        without mentions were made from the parse trees, entries without
+        budget without limits."""
+        entry = self.entries.get(input_key)
+        if entry is None:
+            return False
+
+        if entry["input_hash"] != input_hash \
+                or entry["sieves"] != self.sieves \
+                or entry.get("mentions", "parse") != self.mentions \
+                or entry.get("budget", {}) != self.budget \
+                or entry["code_version"] != self.code_version \
+                or entry.get("degraded", False):
+            return False
+
+        return all(os.path.isfile(os.path.join(self.out_put_dir, out_put))
+                   for out_put in entry["outputs"])
+
+    def add_document(self, input_key, out_put):
+        """Registers a document of an input file, that is still being read,
+        with its output. The file is finished after input_read."""
+        with self.__lock:
+            pending = self.__pending.setdefault(input_key,
+                                                [None, [], 0, False, False])
+            pending[1].append(out_put)
+            pending[2] += 1
+
+    def input_read(self, input_key, input_hash, outputs=()):
+        """Marks an input file, whose documents were registered with
+        add_document, as read: its hash and further outputs (e.g. the CoNLL
+        output) are known. The entry is written at once, if all documents
+        are already finished."""
+        with self.__lock:
+            pending = self.__pending.setdefault(input_key,
+                                                [None, [], 0, False, False])
+            pending[0] = input_hash
+            pending[1].extend(outputs)
+            pending[3] = True
+            finished = pending[2] == 0
+        if finished:
+            self.__finish(input_key)
+
+    def document_done(self, input_key, degraded=False):
+        """Marks one document of an input file as finished, degraded if it
+        ran out of its budget. The entry of the file is written, when all
+        its documents are finished."""
+        with self.__lock:
+            pending = self.__pending[input_key]
+            pending[2] -= 1
+            pending[4] = pending[4] or degraded
+            finished = pending[2] == 0 and pending[3]
+        if finished:
+            self.__finish(input_key)
+
+    def __finish(self, input_key):
+        """Appends the entry of a finished input file to the manifest."""
+        with self.__lock:
+            input_hash, outputs, _, _, degraded = \
+                self.__pending.pop(input_key)
+            # a degraded entry replaces an older one of the same input,
+            # whose outputs have been overwritten
+            entry = {"input": input_key,
+                     "input_hash": input_hash,
+                     "sieves": self.sieves,
+                     "mentions": self.mentions,
+                     "budget": self.budget,
+                     "code_version": self.code_version,
+                     "outputs": outputs,
+                     "degraded": degraded}
+            self.entries[input_key] = entry
+            with open(self.path, 'a', encoding='utf-8', newline='\n') \
+                    as manifest_file:
+                manifest_file.write(json.dumps(entry) + "\n")
@@ -0,0 +1,140 @@
+# Profiles the memory of a run with tracemalloc: at every stage boundary (read,
+# transform, extract_mentions, each sieve, write) the traced memory is
+# recorded and the growth since the previous stage of the same document (or
+# file) is attributed to the stage. The report gives the bytes per document and
+# per token of every stage and the top allocation sites at the peak, so that
+# the memory per token can be compared between versions.
+import json
+import threading
+import tracemalloc
+
+# allocations of the profiler itself are not reported
+TRACE_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__),
+                 tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+
+
+class MemoryProfiler:
+    """
+    self.top: int, number of allocation sites in the report
+    self.stages: dict, stage name -> dict with the number of records, the
+        documents and tokens and the bytes the traced memory grew during the
+        stage
+    self.peak_bytes: highest traced memory at a stage boundary
+
+    With more than one worker the growth of a stage includes allocations of
+    other threads, run with one worker (-w 1) for an exact attribution.
+    """
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.frames = frames
+        self.stages = {}
+        self.peak_bytes = 0
+        self.__peak_snapshot = None
+        self.__peak_stage = None
+        self.__last_bytes = {}
+        self.__overhead_bytes = 0
+        self.__lock = threading.Lock()
+
+    def start(self):
+        tracemalloc.start(self.frames)
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def begin(self, key):
+        """Marks the start of the first stage of a document or file."""
+        with self.__lock:
+            self.__last_bytes[key] = self.__get_traced_bytes()
+
+    def record(self, stage, key, documents=1, tokens=0, end=False):
+        """Records the end of a stage of a document or file (key). With
+        end=True the key is not followed any further."""
+        with self.__lock:
+            current_bytes = self.__get_traced_bytes()
+            grown_bytes = current_bytes - self.__last_bytes.get(key,
+                                                                current_bytes)
+            if end:
+                self.__last_bytes.pop(key, None)
+            else:
+                self.__last_bytes[key] = current_bytes
+
+            stats = self.stages.setdefault(stage, {
+                "records": 0, "documents": 0, "tokens": 0,
+                "grown_bytes": 0, "traced_bytes": 0})
+            stats["records"] += 1
+            stats["documents"] += documents
+            stats["tokens"] += tokens
+            stats["grown_bytes"] += grown_bytes
+            stats["traced_bytes"] += current_bytes
+
+            # the allocation sites are only taken at a new peak, the memory
+            # of the snapshot is not counted in the stages
+            if current_bytes > self.peak_bytes:
+                self.peak_bytes = current_bytes
+                self.__peak_stage = stage
+                before_bytes = tracemalloc.get_traced_memory()[0]
+                self.__peak_snapshot = tracemalloc.take_snapshot() \
+                    .filter_traces(TRACE_FILTERS)
+                self.__overhead_bytes += \
+                    tracemalloc.get_traced_memory()[0] - before_bytes
+
+    def __get_traced_bytes(self):
+        return tracemalloc.get_traced_memory()[0] - self.__overhead_bytes
+
+    def get_report(self):
+        """Returns the report as a dict with the stages and the top
+        allocation sites (by line and by file) at the peak."""
+        stages = {}
+        for stage, stats in self.stages.items():
+            stages[stage] = dict(stats)
+            stages[stage]["bytes_per_document"] = \
+                stats["grown_bytes"] / stats["documents"] \
+                if stats["documents"] else 0.0
+            stages[stage]["bytes_per_token"] = \
+                stats["grown_bytes"] / stats["tokens"] \
+                if stats["tokens"] else 0.0
+            stages[stage]["mean_traced_bytes"] = \
+                stats["traced_bytes"] / stats["records"]
+
+        sites = {"lineno": [], "filename": []}
+        if self.__peak_snapshot is not None:
+            for key_type in sites:
+                for statistic in self.__peak_snapshot.statistics(
+                        key_type)[:self.top]:
+                    frame = statistic.traceback[0]
+                    site = frame.filename if key_type == "filename" \
+                        else f"{frame.filename}:{frame.lineno}"
+                    sites[key_type].append({"site": site,
+                                            "bytes": statistic.size,
+                                            "count": statistic.count})
+
+        return {"stages": stages,
+                "peak_bytes": self.peak_bytes,
+                "peak_stage": self.__peak_stage,
+                "top_lines": sites["lineno"],
+                "top_files": sites["filename"]}
+
+    def write_report(self, report_path):
+        with open(report_path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(self.get_report(), f, indent=2)
+
+    def format_report(self):
+        """Returns the report as a table for the console."""
+        report = self.get_report()
+        lines = [f"{'stage':<28}{'documents':>10}{'tokens':>10}"
+                 f"{'bytes/doc':>14}{'bytes/token':>14}{'mean MB':>10}"]
+        for stage, stats in report["stages"].items():
+            lines.append(f"{stage:<28}{stats['documents']:>10}"
+                         f"{stats['tokens']:>10}"
+                         f"{stats['bytes_per_document']:>14.0f}"
+                         f"{stats['bytes_per_token']:>14.1f}"
+                         f"{stats['mean_traced_bytes'] / 2 ** 20:>10.1f}")
+
+        lines.append(f"\npeak: {report['peak_bytes'] / 2 ** 20:.1f} MB "
+                     f"after {report['peak_stage']}, top allocation sites:")
+        for site in report["top_lines"]:
+            lines.append(f"{site['bytes'] / 2 ** 20:10.2f} MB "
+                         f"{site['count']:>9} blocks  {site['site']}")
+
+        return "\n".join(lines)
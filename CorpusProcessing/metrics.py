@@ -0,0 +1,226 @@
+# Collects throughput metrics of a run (documents, sentences, tokens and
+# mentions per second, latencies of the processing stages, queued documents and
+# worker utilisation). They can be reported as a progress line, written to a
+# file in the Prometheus text format or served on a local port.
+import collections
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# latencies kept per stage for the percentiles, older ones are dropped
+MAX_LATENCIES = 10000
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+class RunMetrics:
+    """
+    self.workers: int, number of worker threads
+    self.counts: dict with the processed documents, sentences, tokens,
+        mentions and merged mentions (NPs with the span of another mention)
+    self.latencies: dict, keys are stage names ("read", "extract_mentions",
+        "sieves", ...) and values the latest durations in seconds
+    self.stage_seconds: dict, total seconds per stage
+    self.stage_counts: dict, number of durations per stage
+    self.submitted, self.started: documents submitted to and started by
+        the workers
+    self.busy_seconds: seconds the workers spent on documents
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.start_time = time.perf_counter()
+        self.counts = {"documents": 0, "sentences": 0, "tokens": 0,
+                       "mentions": 0, "merged_mentions": 0}
+        self.latencies = {}
+        self.stage_seconds = collections.defaultdict(float)
+        self.stage_counts = collections.defaultdict(int)
+        self.submitted = 0
+        self.started = 0
+        self.busy_seconds = 0.0
+        self.__lock = threading.Lock()
+
+    def record_stage(self, stage, seconds):
+        """Adds the duration of one stage of one document (or file)."""
+        with self.__lock:
+            if stage not in self.latencies:
+                self.latencies[stage] = collections.deque(maxlen=MAX_LATENCIES)
+            self.latencies[stage].append(seconds)
+            self.stage_seconds[stage] += seconds
+            self.stage_counts[stage] += 1
+
+    def document_submitted(self):
+        with self.__lock:
+            self.submitted += 1
+
+    def document_started(self):
+        with self.__lock:
+            self.started += 1
+
+    def document_finished(self, document_obj, seconds):
+        """Counts a finished document and the time a worker spent on it."""
+        with self.__lock:
+            self.counts["documents"] += 1
+            self.counts["sentences"] += len(document_obj.sentences)
+            self.counts["tokens"] += sum(len(sentence.list_of_sent_data)
+                                         for sentence in document_obj.sentences)
+            self.counts["mentions"] += len(document_obj.mentions)
+            self.counts["merged_mentions"] += document_obj.merged_mentions
+            self.busy_seconds += seconds
+
+    def get_snapshot(self):
+        """Returns a consistent copy of the metrics as a dict."""
+        with self.__lock:
+            elapsed = time.perf_counter() - self.start_time
+            percentiles = {}
+            for stage, latencies in self.latencies.items():
+                ordered = sorted(latencies)
+                percentiles[stage] = {
+                    quantile: ordered[min(len(ordered) - 1,
+                                          int(quantile * len(ordered)))]
+                    for quantile in QUANTILES}
+
+            finished = self.counts["documents"]
+            return {"elapsed": elapsed,
+                    "counts": dict(self.counts),
+                    "rates": {name: count / elapsed if elapsed > 0 else 0.0
+                              for name, count in self.counts.items()},
+                    "percentiles": percentiles,
+                    "stage_seconds": dict(self.stage_seconds),
+                    "stage_counts": dict(self.stage_counts),
+                    "queued": self.submitted - self.started,
+                    "running": self.started - finished,
+                    "utilisation": self.busy_seconds
+                    / (elapsed * self.workers) if elapsed > 0 else 0.0}
+
+    def format_progress_line(self):
+        """Returns a one line summary of the progress."""
+        snapshot = self.get_snapshot()
+        counts = snapshot["counts"]
+        rates = snapshot["rates"]
+        line = (f"[{snapshot['elapsed']:.0f}s] "
+                f"{counts['documents']} docs ({rates['documents']:.2f}/s), "
+                f"{counts['tokens']} tokens ({rates['tokens']:.0f}/s), "
+                f"{counts['mentions']} mentions, "
+                f"queued: {snapshot['queued']}, "
+                f"running: {snapshot['running']}, "
+                f"utilisation: {snapshot['utilisation']:.0%}")
+        if "sieves" in snapshot["percentiles"]:
+            p = snapshot["percentiles"]["sieves"]
+            line += (f", sieves p50/p90/p99: {p[0.5]:.3f}/{p[0.9]:.3f}/"
+                     f"{p[0.99]:.3f}s")
+
+        return line
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        snapshot = self.get_snapshot()
+        lines = []
+        for name, count in snapshot["counts"].items():
+            lines.append(f"# HELP coref_{name}_total Processed {name}.")
+            lines.append(f"# TYPE coref_{name}_total counter")
+            lines.append(f"coref_{name}_total {count}")
+
+        lines.append("# HELP coref_stage_seconds Latency of the "
+                     "processing stages.")
+        lines.append("# TYPE coref_stage_seconds summary")
+        for stage, percentiles in sorted(snapshot["percentiles"].items()):
+            for quantile, seconds in percentiles.items():
+                lines.append(f'coref_stage_seconds{{stage="{stage}",'
+                             f'quantile="{quantile}"}} {seconds:.6f}')
+            lines.append(f'coref_stage_seconds_sum{{stage="{stage}"}} '
+                         f'{snapshot["stage_seconds"][stage]:.6f}')
+            lines.append(f'coref_stage_seconds_count{{stage="{stage}"}} '
+                         f'{snapshot["stage_counts"][stage]}')
+
+        gauges = [("queued_documents", "Documents waiting for a worker.",
+                   snapshot["queued"]),
+                  ("running_documents", "Documents processed by a worker.",
+                   snapshot["running"]),
+                  ("worker_utilisation", "Share of worker time spent on "
+                                         "documents.",
+                   snapshot["utilisation"]),
+                  ("documents_per_second", "Finished documents per second.",
+                   snapshot["rates"]["documents"]),
+                  ("tokens_per_second", "Tokens of finished documents per "
+                                        "second.",
+                   snapshot["rates"]["tokens"])]
+        for name, help_text, value in gauges:
+            lines.append(f"# HELP coref_{name} {help_text}")
+            lines.append(f"# TYPE coref_{name} gauge")
+            lines.append(f"coref_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsReporter:
+    """Reports the metrics of a run every interval seconds in a background
+    thread: prints a progress line (to stderr) and writes the metrics to a
+    Prometheus text file. Optionally serves them on http://127.0.0.1:port/."""
+
+    def __init__(self, metrics, interval, progress=True, metrics_file=None,
+                 port=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.progress = progress
+        self.metrics_file = metrics_file
+        self.server = None
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="METRICS")
+        if port is not None:
+            self.server = self.__create_server(port)
+
+    def __create_server(self, port):
+        metrics = self.metrics
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+
+    def start(self):
+        if self.server is not None:
+            threading.Thread(target=self.server.serve_forever, daemon=True,
+                             name="METRICS_HTTP").start()
+        self.__thread.start()
+
+    def __run(self):
+        while not self.__stop.wait(self.interval):
+            self.report()
+
+    def report(self):
+        if self.progress:
+            print(self.metrics.format_progress_line(), file=sys.stderr,
+                  flush=True)
+
+        if self.metrics_file is not None:
+            # written to a temporary file first, so that a reader never
+            # sees a half written file
+            temporary_file = self.metrics_file + ".tmp"
+            with open(temporary_file, 'w', encoding='utf-8',
+                      newline='\n') as f:
+                f.write(self.metrics.to_prometheus())
+            os.replace(temporary_file, self.metrics_file)
+
+    def stop(self):
+        """Stops reporting and reports the final state once more."""
+        self.__stop.set()
+        if self.__thread.is_alive():
+            self.__thread.join()
+        self.report()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
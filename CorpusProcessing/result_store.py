@@ -0,0 +1,224 @@
+# Stores the results of a run in a local SQLite database, next to or instead
+# of reading the json files of the documents: one row per document, score,
+# cluster and clustered mention, with indexes on the document, the sentence
+# and the surface form. Every run gets its own run_id, so that runs can be
+# compared with SQL. The worker threads only put the rows into a queue, one
+# writer thread inserts them in batches, one transaction per batch.
+import datetime
+import queue
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    input TEXT,
+    sieves TEXT,
+    mentions TEXT,
+    code_version TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    document TEXT NOT NULL,
+    noun_phrases INTEGER,
+    mentions INTEGER,
+    merged INTEGER,
+    degraded INTEGER NOT NULL,
+    degradations TEXT,
+    PRIMARY KEY (run_id, document)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    document TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    true_positives INTEGER,
+    false_positives INTEGER,
+    false_negatives INTEGER,
+    precision REAL,
+    recall REAL,
+    f1 REAL,
+    PRIMARY KEY (run_id, document, metric)
+);
+CREATE TABLE IF NOT EXISTS clusters (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    document TEXT NOT NULL,
+    cluster_id INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (run_id, document, cluster_id)
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    document TEXT NOT NULL,
+    cluster_id INTEGER NOT NULL,
+    sent_num INTEGER NOT NULL,
+    span_start INTEGER NOT NULL,
+    span_end INTEGER NOT NULL,
+    surface TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_document ON documents (document);
+CREATE INDEX IF NOT EXISTS scores_metric_f1 ON scores (run_id, metric, f1);
+CREATE INDEX IF NOT EXISTS scores_document ON scores (document, metric);
+CREATE INDEX IF NOT EXISTS mentions_document_sentence
+    ON mentions (run_id, document, sent_num);
+CREATE INDEX IF NOT EXISTS mentions_surface ON mentions (surface);
+CREATE INDEX IF NOT EXISTS mentions_lower_surface
+    ON mentions (surface COLLATE NOCASE);
+"""
+
+
+def get_document_rows(result, document_obj=None):
+    """Returns the rows of a document result (see Pipeline.get_result) as a
+    dict table -> list of tuples without the run_id. The surface forms of the
+    mentions are taken from the Document object, if given."""
+    mention_stats = result.get("mention_stats", {})
+    pair_counts = result.get("pair_counts", {})
+    name = result["document"]
+    rows = {"documents": [(name, mention_stats.get("noun_phrases"),
+                           mention_stats.get("mentions"),
+                           mention_stats.get("merged"),
+                           int(result.get("degraded", False)),
+                           "; ".join(result.get("degradations", [])))],
+            "scores": [],
+            "clusters": [],
+            "mentions": []}
+
+    f1_score = result.get("f1")
+    rows["scores"].append((name, "pairwise",
+                           pair_counts.get("true_positives"),
+                           pair_counts.get("false_positives"),
+                           pair_counts.get("false_negatives"),
+                           result.get("precision"), result.get("recall"),
+                           f1_score if isinstance(f1_score, float)
+                           else None))
+    # the other metrics have no pair counts
+    for metric, scores in result.get("metrics", {}).items():
+        rows["scores"].append((name, metric, None, None, None,
+                               scores["precision"], scores["recall"],
+                               scores["f1"]))
+    if "conll_f1" in result:
+        rows["scores"].append((name, "conll", None, None, None, None, None,
+                               result["conll_f1"]))
+
+    for cluster_ID, cluster in enumerate(result["clusters"]):
+        rows["clusters"].append((name, cluster_ID, len(cluster)))
+        for sent_num, span_start, span_end in cluster:
+            surface = ""
+            if document_obj is not None:
+                surface = document_obj.mentions[tuple((
+                    sent_num, span_start, span_end))].get_mention_as_str()
+            rows["mentions"].append((name, cluster_ID, sent_num, span_start,
+                                     span_end, surface))
+
+    return rows
+
+
+class ResultStore:
+    """
+    self.path: path of the SQLite database, created if it does not exist
+    self.batch_size: number of documents inserted in one transaction
+    self.run_id: int, ID of the run in the runs table (set by start)
+
+    add_document() can be called from any thread, the rows are inserted by
+    the writer thread. The writer takes the documents that are queued when
+    it is free (at most batch_size) and inserts them in one transaction, so
+    the documents of a run that was not closed are committed up to the last
+    finished transaction. An error of the writer stops it and is raised by
+    the next add_document() or by close().
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.run_id = None
+        self.__queue = queue.Queue()
+        self.__error = None
+        self.__started = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="RESULT_STORE")
+        self.__run_info = None
+
+    def start(self, input_path=None, sieves=(), mentions="parse",
+              code_version=None):
+        """Creates the tables, adds the run and starts the writer thread."""
+        self.__run_info = (datetime.datetime.now().isoformat(
+            timespec='seconds'), input_path, ",".join(sieves), mentions,
+            code_version)
+        self.__thread.start()
+        self.__started.wait()
+        self.__raise_error()
+
+    def add_document(self, result, document_obj=None):
+        """Queues the rows of a document result for the writer."""
+        self.__raise_error()
+        self.__queue.put(get_document_rows(result, document_obj))
+
+    def close(self):
+        """Inserts the queued documents and stops the writer thread."""
+        if self.__thread.is_alive():
+            self.__queue.put(None)
+            self.__thread.join()
+        self.__raise_error()
+
+    def __raise_error(self):
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self):
+        try:
+            connection = sqlite3.connect(self.path)
+        except sqlite3.Error as error:
+            self.__error = error
+            self.__started.set()
+            return
+
+        try:
+            # one writer, no reader needs to wait for it
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.executescript(SCHEMA)
+                cursor = connection.execute(
+                    "INSERT INTO runs (started, input, sieves, mentions, "
+                    "code_version) VALUES (?, ?, ?, ?, ?)", self.__run_info)
+                self.run_id = cursor.lastrowid
+            self.__started.set()
+
+            finished = False
+            while not finished:
+                # waits for the first document, then takes what is queued
+                batch = [self.__queue.get()]
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.__queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    finished = True
+                    batch.pop()
+                self.__insert(connection, batch)
+        except Exception as error:
+            # e.g. a value that can not be stored, raised in the caller
+            self.__error = error
+        finally:
+            self.__started.set()
+            connection.close()
+
+    def __insert(self, connection, batch):
+        """Inserts the rows of a batch of documents in one transaction."""
+        if not batch:
+            return
+
+        statements = {
+            "documents": "INSERT OR REPLACE INTO documents VALUES "
+                         "(?, ?, ?, ?, ?, ?, ?)",
+            "scores": "INSERT OR REPLACE INTO scores VALUES "
+                      "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "clusters": "INSERT OR REPLACE INTO clusters VALUES "
+                        "(?, ?, ?, ?)",
+            "mentions": "INSERT INTO mentions VALUES (?, ?, ?, ?, ?, ?, ?)"}
+        with connection:
+            for table, statement in statements.items():
+                connection.executemany(
+                    statement, ((self.run_id,) + row for rows in batch
+                                for row in rows[table]))
@@ -0,0 +1,177 @@
+# Submits documents to an executor with bounded in-flight work: a new document
+# is only accepted when the number of documents (and tokens) in flight is below
+# the limits and, optionally, the memory of the process is below a limit.
+# Finished documents are not kept, so memory does not grow with corpus size.
+# Documents can be dispatched longest-processing-time-first (LPT), so that
+# large documents do not end up at the end of a run on a single worker.
+import os
+import threading
+import time
+
+
+def get_rss_bytes():
+    """Returns the resident set size of the process in bytes, or None if it
+    can not be determined (only /proc/self/statm is supported)."""
+    try:
+        with open("/proc/self/statm", 'r') as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_document_tokens(document_obj):
+    """Returns the number of tokens of a document."""
+    return sum(len(sentence.list_of_sent_data)
+               for sentence in document_obj.sentences)
+
+
+def estimate_cost_from_tokens(sentence_tokens):
+    """Estimates the processing time of a document from the number of tokens
+    of its sentences, e.g. taken from a corpus index. The number of mentions
+    grows with the tokens of a sentence and every mention is compared with the
+    candidates of its own and the previous sentence, so the cost is the sum
+    over the sentences of tokens * (tokens + tokens of previous sentence)."""
+    cost = 0
+    previous_tokens = 0
+    for tokens in sentence_tokens:
+        cost += tokens * (tokens + previous_tokens)
+        previous_tokens = tokens
+
+    return cost
+
+
+def estimate_file_cost(file_path):
+    """Estimates the processing time of a file before reading it: its size
+    in bytes (compressed files are underestimated)."""
+    return os.path.getsize(file_path)
+
+
+def order_longest_first(items, cost):
+    """Returns the items sorted by decreasing cost, items with the same cost
+    keep their order (longest-processing-time-first)."""
+    return sorted(items, key=lambda item: -cost(item))
+
+
+class BoundedExecutor:
+    """Wraps an executor and blocks submit() while the limits are reached.
+    If nothing is in flight, a document is always accepted, so that single
+    documents larger than the limits are still processed.
+
+    self.executor: concurrent.futures.Executor
+    self.max_documents: int, maximal number of documents in flight
+    self.max_tokens: int or None, maximal number of tokens in flight
+    self.max_rss_bytes: int or None, no new document is accepted while the
+        resident memory of the process is above this limit
+    self.errors: list of exceptions raised by the submitted functions
+    self.busy_seconds: total seconds the submitted functions ran
+    self.longest_seconds: seconds of the longest running function
+    """
+
+    def __init__(self, executor, max_documents, max_tokens=None,
+                 max_rss_bytes=None, poll_seconds=0.1):
+        self.executor = executor
+        self.max_documents = max_documents
+        self.max_tokens = max_tokens
+        self.max_rss_bytes = max_rss_bytes
+        self.poll_seconds = poll_seconds
+        self.errors = []
+        self.in_flight_documents = 0
+        self.in_flight_tokens = 0
+        self.busy_seconds = 0.0
+        self.longest_seconds = 0.0
+        self.__first_submit = None
+        self.__last_done = None
+        self.__condition = threading.Condition()
+
+    def __is_full(self, tokens):
+        """Checks if a document with the given number of tokens has to wait."""
+        if self.in_flight_documents == 0:
+            return False
+
+        if self.in_flight_documents >= self.max_documents:
+            return True
+
+        if self.max_tokens is not None \
+                and self.in_flight_tokens + tokens > self.max_tokens:
+            return True
+
+        if self.max_rss_bytes is not None:
+            rss_bytes = get_rss_bytes()
+            if rss_bytes is not None and rss_bytes > self.max_rss_bytes:
+                return True
+
+        return False
+
+    def wait_for_slot(self, tokens=0):
+        """Waits until a document with the given number of tokens would be
+        accepted, e.g. before the next document is read."""
+        with self.__condition:
+            self.__wait_for_slot(tokens)
+
+    def __wait_for_slot(self, tokens):
+        # the memory limit is checked again after poll_seconds, because
+        # memory can be freed without a document being finished
+        while self.__is_full(tokens):
+            self.__condition.wait(self.poll_seconds)
+
+    def submit(self, fn, *args, tokens=0):
+        """Waits for a free slot and submits fn(*args) to the executor.
+        Returns the future."""
+        with self.__condition:
+            self.__wait_for_slot(tokens)
+
+            self.in_flight_documents += 1
+            self.in_flight_tokens += tokens
+            if self.__first_submit is None:
+                self.__first_submit = time.perf_counter()
+
+        future = self.executor.submit(self.__run_timed, fn, *args)
+        future.add_done_callback(
+            lambda done: self.__release(done, tokens))
+
+        return future
+
+    def __run_timed(self, fn, *args):
+        """Runs fn(*args) and adds its duration to the busy time."""
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            with self.__condition:
+                self.busy_seconds += seconds
+                self.longest_seconds = max(self.longest_seconds, seconds)
+
+    def __release(self, future, tokens):
+        """Frees the slot of a finished document."""
+        with self.__condition:
+            self.in_flight_documents -= 1
+            self.in_flight_tokens -= tokens
+            self.__last_done = time.perf_counter()
+            if future.exception() is not None:
+                self.errors.append(future.exception())
+            self.__condition.notify_all()
+
+    def wait(self):
+        """Waits until all submitted documents are finished and raises the
+        first exception of a submitted function, if any."""
+        with self.__condition:
+            while self.in_flight_documents > 0:
+                self.__condition.wait()
+
+        if self.errors:
+            raise self.errors[0]
+
+    def get_makespan(self, workers):
+        """Returns a tuple (makespan, ideal) in seconds: the time from the
+        first submit until the last document finished, and its lower bound
+        for the given number of workers: the busy time evenly distributed,
+        but at least the longest document."""
+        if self.__first_submit is None or self.__last_done is None:
+            return 0.0, 0.0
+
+        makespan = self.__last_done - self.__first_submit
+        ideal = max(self.busy_seconds / workers, self.longest_seconds)
+        return makespan, ideal
@@ -0,0 +1,150 @@
+# Splits a corpus into shards, that can be processed on different machines,
+# and merges the outputs of the shards afterwards. The nodes only have to share
+# the file system: every node computes the same assignment of files to shards
+# from the file paths (and sizes) alone.
+import glob
+import hashlib
+import json
+import os
+
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+from MultiSievePassCorefResolution.coreference_metrics import \
+    get_metric_scores, sum_metric_counts
+
+# prefix of the json files written per document by resolve.py
+OUTPUT_PREFIX = "output_"
+
+
+def parse_shard(shard):
+    """Parses a shard given as "i/n" (0 <= i < n) into a tuple (i, n).
+    Raises a ValueError if the shard is not valid."""
+    try:
+        shard_index, shard_count = [int(part) for part in shard.split("/")]
+    except ValueError:
+        raise ValueError(f"Shard must be given as i/n, not '{shard}'.")
+
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index must be between 0 and n-1, "
+                         f"not '{shard}'.")
+
+    return shard_index, shard_count
+
+
+def get_input_key(file_path, root=None):
+    """Returns the key of an input file, e.g. hashed to select its shard:
+    the path relative to the corpus root and with "/" as separator, so that it
+    is the same on all nodes regardless of where the corpus is mounted."""
+    if root is not None:
+        file_path = os.path.relpath(file_path, root)
+
+    return file_path.replace("\\", "/")
+
+
+def get_shard_by_hash(file_path, shard_count, root=None):
+    """Returns the shard index of a file, based on a hash of its path.
+    md5 is used instead of hash(), which differs between processes."""
+    key = get_input_key(file_path, root).encode("utf-8")
+    return int(hashlib.md5(key).hexdigest(), 16) % shard_count
+
+
+def balance_shards_by_size(file_paths, shard_count, root=None,
+                           file_costs=None):
+    """Assigns the files to shards so that every shard gets about the same
+    number of bytes: the largest file goes first to the shard with the fewest
+    bytes so far. Ties are broken by path, so the result is deterministic.
+    Instead of the bytes other costs of the files can be given, e.g. from a
+    corpus index.
+
+    :return dict {file_path: shard_index}
+    """
+    if file_costs is None:
+        file_costs = {path: os.path.getsize(path) for path in file_paths}
+
+    files = sorted(file_paths,
+                   key=lambda path: (-file_costs[path],
+                                     get_input_key(path, root)))
+    shard_bytes = [0] * shard_count
+    assignment = {}
+    for file_path in files:
+        shard_index = shard_bytes.index(min(shard_bytes))
+        assignment[file_path] = shard_index
+        shard_bytes[shard_index] += file_costs[file_path]
+
+    return assignment
+
+
+def select_shard(file_paths, shard_index, shard_count, balance_by_size=False,
+                 root=None, file_costs=None):
+    """Returns the files of the given shard, in the order of file_paths.
+
+    Args:
+        file_paths: list of all files of the corpus
+        shard_index: int, 0 <= shard_index < shard_count
+        shard_count: int, number of shards
+        balance_by_size: bool, if False the shard is chosen by the hash of
+            the path, else by file size (see balance_shards_by_size)
+        root: directory the paths are relative to when hashing
+        file_costs: dict {file_path: cost} used instead of the file sizes
+            when balancing
+    """
+    if balance_by_size:
+        assignment = balance_shards_by_size(file_paths, shard_count, root,
+                                            file_costs)
+        return [path for path in file_paths
+                if assignment[path] == shard_index]
+
+    return [path for path in file_paths
+            if get_shard_by_hash(path, shard_count, root) == shard_index]
+
+
+def merge_shard_outputs(out_put_dirs):
+    """Reads the json outputs of all shard directories and sums up the pair
+    counts of the documents.
+
+    Raises a ValueError if a document was processed by more than one shard.
+
+    :return dict with keys
+        - documents: list of the output dicts of all documents
+        - true_positives, false_positives, false_negatives: summed up counts
+        - precision, recall, f1: corpus scores from the summed up counts
+        - metrics: dict metric name -> corpus precision, recall, f1 and
+          counts of MUC, B-cubed and CEAF-e (see coreference_metrics)
+        - conll_f1: the average f1 of these metrics
+    """
+    documents = {}
+    for out_put_dir in out_put_dirs:
+        pattern = os.path.join(glob.escape(out_put_dir),
+                               OUTPUT_PREFIX + "*.json")
+        for file_name in sorted(glob.glob(pattern)):
+            with open(file_name, 'r', encoding='utf-8') as json_file:
+                out_put = json.load(json_file)
+
+            if out_put["document"] in documents:
+                raise ValueError(f"Document {out_put['document']} is in more "
+                                 f"than one shard output.")
+            documents[out_put["document"]] = out_put
+
+    counts = [0, 0, 0]
+    for out_put in documents.values():
+        pair_counts = out_put.get("pair_counts", {})
+        counts[0] += pair_counts.get("true_positives", 0)
+        counts[1] += pair_counts.get("false_positives", 0)
+        counts[2] += pair_counts.get("false_negatives", 0)
+
+    precision, recall, f1 = CoreferenceChainResolver.scores_from_counts(
+        *counts)
+    metrics, conll_f1 = get_metric_scores(sum_metric_counts(
+        {metric: scores["counts"] for metric, scores
+         in out_put.get("metrics", {}).items()}
+        for out_put in documents.values()))
+
+    return {"documents": [documents[name] for name in sorted(documents)],
+            "true_positives": counts[0],
+            "false_positives": counts[1],
+            "false_negatives": counts[2],
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+            "metrics": metrics,
+            "conll_f1": conll_f1}
@@ -0,0 +1,188 @@
+# Tests if the difference of the corpus scores of two runs (e.g. two sieve
+# configurations on the same corpus) is significant: paired bootstrap
+# resampling and approximate randomisation over the documents. The per
+# document counts are a documents x counts matrix, so that thousands of
+# resamples are a few matrix products instead of Python loops.
+import time
+
+import numpy as np
+
+from CorpusProcessing.sharding import merge_shard_outputs
+from MultiSievePassCorefResolution.coreference_metrics import METRICS
+
+# columns of the count matrix (per metric): the numerator and denominator of
+# the precision and of the recall, which are summed up over the documents
+PRECISION_NUMERATOR = 0
+PRECISION_DENOMINATOR = 1
+RECALL_NUMERATOR = 2
+RECALL_DENOMINATOR = 3
+
+# maximal number of documents x resamples held in memory at once
+CHUNK_CELLS = 1 << 22
+
+
+def get_count_row(out_put, metric="pairwise"):
+    """Returns the counts of a metric of a document output as
+    [precision numerator, precision denominator, recall numerator,
+     recall denominator], for pairwise from its pair counts. The row of
+    conll has the counts of all METRICS one after the other.
+
+    Raises a ValueError if the output has no counts of the metric."""
+    if metric != "pairwise":
+        metrics = out_put.get("metrics")
+        if metrics is None:
+            raise ValueError(f"Document {out_put['document']} has no metric "
+                             f"counts (written by an older version?).")
+        if metric == "conll":
+            return [count for name in METRICS
+                    for count in metrics[name]["counts"]]
+        return list(metrics[metric]["counts"])
+
+    pair_counts = out_put.get("pair_counts", {})
+    true_positives = pair_counts.get("true_positives", 0)
+    return [true_positives,
+            true_positives + pair_counts.get("false_positives", 0),
+            true_positives,
+            true_positives + pair_counts.get("false_negatives", 0)]
+
+
+def load_run(out_put_dirs, metric="pairwise"):
+    """Reads the json outputs of a run (one or more shard directories) and
+    returns a dict, document name -> count row (see get_count_row)."""
+    return {out_put["document"]: get_count_row(out_put, metric)
+            for out_put in merge_shard_outputs(out_put_dirs)["documents"]}
+
+
+def align_runs(run_a, run_b):
+    """Returns the names of the documents of both runs and their count
+    matrices (documents x counts) in the same order."""
+    names = sorted(set(run_a) & set(run_b))
+    width = len(run_a[names[0]]) if names else 4
+    counts_a = np.array([run_a[name] for name in names],
+                        dtype=np.float64).reshape(len(names), width)
+    counts_b = np.array([run_b[name] for name in names],
+                        dtype=np.float64).reshape(len(names), width)
+
+    return names, counts_a, counts_b
+
+
+def f1_from_sums(sums):
+    """Returns the f1-scores of summed up counts, sums is an array with the
+    counts in the last axis. Like CoreferenceChainResolver.scores_from_counts,
+    a score without denominator is 0.0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(sums[..., PRECISION_DENOMINATOR] > 0,
+                             sums[..., PRECISION_NUMERATOR]
+                             / sums[..., PRECISION_DENOMINATOR], 0.0)
+        recall = np.where(sums[..., RECALL_DENOMINATOR] > 0,
+                          sums[..., RECALL_NUMERATOR]
+                          / sums[..., RECALL_DENOMINATOR], 0.0)
+        return np.where(precision + recall > 0,
+                        2 * precision * recall / (precision + recall), 0.0)
+
+
+def score_from_sums(sums):
+    """Returns the average f1-score of the metrics of summed up counts, the
+    last axis has 4 counts per metric (a single metric is its f1-score)."""
+    return f1_from_sums(sums.reshape(sums.shape[:-1] + (-1, 4))).mean(
+        axis=-1)
+
+
+def get_chunks(total, documents):
+    """Splits a number of resamples into chunks, so that a chunk of
+    resamples x documents has at most CHUNK_CELLS cells."""
+    chunk_size = max(1, CHUNK_CELLS // max(1, documents))
+    return [min(chunk_size, total - start)
+            for start in range(0, total, chunk_size)]
+
+
+def paired_bootstrap(counts_a, counts_b, resamples, rng):
+    """Draws the same documents with replacement for both runs. Returns the
+    scores of both runs for every resample (two arrays)."""
+    documents, width = counts_a.shape
+    counts = np.hstack((counts_a, counts_b))
+    f1_a = []
+    f1_b = []
+    for chunk in get_chunks(resamples, documents):
+        # how often each document is drawn in each resample
+        draws = rng.integers(0, documents, size=(chunk, documents))
+        weights = np.bincount(
+            (draws + documents * np.arange(chunk)[:, None]).ravel(),
+            minlength=chunk * documents).reshape(chunk, documents)
+        sums = weights @ counts
+        f1_a.append(score_from_sums(sums[:, :width]))
+        f1_b.append(score_from_sums(sums[:, width:]))
+
+    return np.concatenate(f1_a), np.concatenate(f1_b)
+
+
+def approximate_randomization(counts_a, counts_b, trials, rng):
+    """Swaps the outputs of the two runs for every document with probability
+    0.5. Returns the differences of the scores (b - a) of every trial."""
+    documents = len(counts_a)
+    differences = []
+    for chunk in get_chunks(trials, documents):
+        swapped = rng.random((chunk, documents)) < 0.5
+        # a shuffled run gets the counts of b where swapped, else those of a
+        sums_a = counts_a.sum(axis=0) + swapped @ (counts_b - counts_a)
+        sums_b = counts_b.sum(axis=0) - swapped @ (counts_b - counts_a)
+        differences.append(score_from_sums(sums_b) - score_from_sums(sums_a))
+
+    return np.concatenate(differences)
+
+
+def compare_runs(run_a, run_b, resamples=10000, trials=10000,
+                 confidence=0.95, seed=None):
+    """Compares the corpus scores (f1, see score_from_sums) of two runs on
+    their common documents.
+
+    :param run_a, run_b: dicts, document name -> count row (see load_run)
+    :return dict with the number of documents (common, only in a, only in b),
+        the scores of both runs and their difference (b - a) with their
+        bootstrap confidence intervals, the p-value of the paired bootstrap
+        and of the approximate randomisation (two-sided) and the seconds
+    """
+    start = time.perf_counter()
+    names, counts_a, counts_b = align_runs(run_a, run_b)
+    if not names:
+        raise ValueError("The runs have no documents in common.")
+
+    rng = np.random.default_rng(seed)
+    f1_a = float(score_from_sums(counts_a.sum(axis=0)))
+    f1_b = float(score_from_sums(counts_b.sum(axis=0)))
+    difference = f1_b - f1_a
+
+    bootstrap_a, bootstrap_b = paired_bootstrap(counts_a, counts_b,
+                                                resamples, rng)
+    bootstrap_differences = bootstrap_b - bootstrap_a
+    percentiles = [50 * (1 - confidence), 50 * (1 + confidence)]
+
+    # the bootstrap differences are centered on the observed difference, a
+    # shift of at least the observed difference counts against it
+    bootstrap_p = (np.count_nonzero(
+        np.abs(bootstrap_differences - difference) >= abs(difference)) + 1) \
+        / (resamples + 1)
+    randomized_differences = approximate_randomization(counts_a, counts_b,
+                                                       trials, rng)
+    randomization_p = (np.count_nonzero(
+        np.abs(randomized_differences) >= abs(difference) - 1e-12) + 1) \
+        / (trials + 1)
+
+    return {"documents": len(names),
+            "only_a": len(set(run_a) - set(run_b)),
+            "only_b": len(set(run_b) - set(run_a)),
+            "f1_a": f1_a,
+            "f1_a_interval": np.percentile(bootstrap_a,
+                                           percentiles).tolist(),
+            "f1_b": f1_b,
+            "f1_b_interval": np.percentile(bootstrap_b,
+                                           percentiles).tolist(),
+            "difference": difference,
+            "difference_interval": np.percentile(bootstrap_differences,
+                                                 percentiles).tolist(),
+            "bootstrap_p": bootstrap_p,
+            "randomization_p": randomization_p,
+            "resamples": resamples,
+            "trials": trials,
+            "confidence": confidence,
+            "seconds": time.perf_counter() - start}
@@ -1,69 +1,274 @@
-# Class in which data structure for data is defined, which should ensure that
-# the data is in the correct form in order to transform it into document
-# objects with the DataTransformer.
-import os
-from abc import ABC, abstractmethod
-
-
-class AbstractDataReader(ABC):
-    """This is an abstracted class for data reader classes. This is to ensure
-    that the data is fitted into the following form to support the modularity
-    of the program if further readers are to be implemented:
-
-    # TODO: data must be in this data structure:
-    # [file_path, [list of [list of documents[list of sentences]]], gold_stand.]
-    # file_path (str)
-    # documents = list of sentences
-    # sentences = list_of_sent_data = list of tuple
-    # [('0', 'In', 'IN', '(TOP(S(PP*']
-    # (index of token in the sentence, token, pos_tag, tree_part)"""
-
-    def __init__(self):
-        self.data = []
-
-    def read_data(self, file_path):
-        """Reads the data from a file, raises a FileNotFoundError
-        if the file does not exist.
-
-        Args:
-            file_path (str): json file
-
-        Returns:
-            a list of dictionaries
-        """
-        try:
-            # checks if path is a file
-            is_file = os.path.isfile(file_path)
-
-            # checks if path is a directory
-            is_directory = os.path.isdir(file_path)
-
-        except FileNotFoundError:
-            raise
-
-        if is_file:
-            self.read_file_in(file_path)
-
-        if is_directory:
-            self.read_data_files(file_path)
-
-    @staticmethod
-    def get_files_from_folder(folder_name):
-        """
-        Takes in a folder name as a str.
-        Returns a list of all file names
-        ending with .txt.
-        """
-        list_of_files = []
-        for file in os.listdir(folder_name):
-            list_of_files.append(folder_name + "/" + file)
-
-        return list_of_files
-
-    @abstractmethod
-    def read_file_in(self, file):
-        pass
-
-    @abstractmethod
-    def read_data_files(self, infile):
-        pass
+# Class in which data structure for data is defined, which should ensure that
+# the data is in the correct form in order to transform it into document
+# objects with the DataTransformer.
+import bz2
+import gzip
+import io
+import lzma
+import os
+import posixpath
+import tarfile
+from abc import ABC, abstractmethod
+
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+
+# modules to open compressed files with, by file extension
+COMPRESSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+# first bytes of compressed files
+MAGIC_BYTES = [(b"\x1f\x8b", ".gz"), (b"BZh", ".bz2"),
+               (b"\xfd7zXZ\x00", ".xz")]
+
+
+class HashingReader(io.RawIOBase):
+    """Binary stream over a file, that passes the bytes through a hash object
+    (e.g. hashlib.sha256()) while they are read, so that a file is hashed in
+    the same read that parses it. Bytes read again after a seek back are
+    hashed once, bytes skipped by a seek forward and the rest of the file on
+    close are hashed, too (e.g. the padding at the end of a tar archive)."""
+
+    def __init__(self, f, file_hash):
+        self.__f = f
+        self.file_hash = file_hash
+        # the bytes before this position have been hashed
+        self.__hashed = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.__f.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        position = self.__f.seek(offset, whence)
+        if position > self.__hashed:
+            self.__f.seek(self.__hashed)
+            self.__hash_until(position)
+        return position
+
+    def readinto(self, buffer):
+        position = self.__f.tell()
+        count = self.__f.readinto(buffer)
+        if count and position + count > self.__hashed:
+            self.file_hash.update(
+                memoryview(buffer)[self.__hashed - position:count])
+            self.__hashed = position + count
+        return count
+
+    def __hash_until(self, end=None):
+        """Hashes the bytes from the hashed position up to end (or the end
+        of the file), the file is then at this position."""
+        while end is None or self.__hashed < end:
+            block = self.__f.read(1 << 20 if end is None
+                                  else min(1 << 20, end - self.__hashed))
+            if not block:
+                break
+            self.file_hash.update(block)
+            self.__hashed += len(block)
+
+    def close(self):
+        if not self.closed and not self.__f.closed:
+            self.__f.seek(self.__hashed)
+            self.__hash_until()
+            self.__f.close()
+        super().close()
+
+
+class AbstractDataReader(ABC):
+    """This is an abstracted class for data reader classes. This is to ensure
+    that the data is fitted into the following form to support the modularity
+    of the program if further readers are to be implemented:
+
+    # TODO: data must be in this data structure:
+    # [file_path, [list of [list of documents[list of sentences]]], gold_stand.]
+    # file_path (str)
+    # documents = list of sentences
+    # sentences = list_of_sent_data = list of tuple
+    # [('0', 'In', 'IN', '(TOP(S(PP*']
+    # (index of token in the sentence, token, pos_tag, tree_part)
+
+    The tokens should be interned in the vocabulary of the reader, so that
+    each token is stored only once for the whole corpus.
+
+    Files can be compressed (.gz, .bz2, .xz) or tar archives of many files,
+    they are decompressed while reading without writing anything to disk."""
+
+    def __init__(self):
+        self.data = []
+        self.vocabulary = Vocabulary()
+
+    def read_data(self, file_path):
+        """Reads the data from a file, raises a FileNotFoundError
+        if the file does not exist.
+
+        Args:
+            file_path (str): json file
+
+        Returns:
+            a list of dictionaries
+        """
+        try:
+            # checks if path is a file
+            is_file = os.path.isfile(file_path)
+
+            # checks if path is a directory
+            is_directory = os.path.isdir(file_path)
+
+        except FileNotFoundError:
+            raise
+
+        if is_file:
+            self.read_data_file(file_path)
+
+        if is_directory:
+            self.read_data_files(file_path)
+
+    @staticmethod
+    def get_files_from_folder(folder_name):
+        """
+        Takes in a folder name as a str.
+        Returns a list of all file names
+        ending with .txt.
+        """
+        list_of_files = []
+        for file in os.listdir(folder_name):
+            list_of_files.append(folder_name + "/" + file)
+
+        return list_of_files
+
+    @staticmethod
+    def get_compression(file_path, head=b""):
+        """Returns the compression (".gz", ".bz2" or ".xz") of a file, based on
+        the first bytes of the file (head) or else on the file extension.
+        Returns None for uncompressed files."""
+        for magic_bytes, compression in MAGIC_BYTES:
+            if head.startswith(magic_bytes):
+                return compression
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in COMPRESSIONS:
+            return extension
+
+        return None
+
+    @staticmethod
+    def get_document_name(file_path):
+        """Returns the file name without directory and compression extension,
+        e.g. "data/cctv_0000.v4_auto_conll.gz" -> "cctv_0000.v4_auto_conll"."""
+        file_name = file_path.replace("\\", "/").split("/")[-1]
+        root, extension = os.path.splitext(file_name)
+        if extension.lower() in COMPRESSIONS:
+            return root
+
+        return file_name
+
+    @classmethod
+    def get_member_name(cls, member_name):
+        """Returns the document name of a file in a tar archive: its path in
+        the archive without compression extension, with "/" escaped, so that
+        files with the same name in different directories of an archive get
+        different names, e.g. "./bc/cctv_0000.v4_auto_conll.gz" ->
+        "bc%2Fcctv_0000.v4_auto_conll"."""
+        path = posixpath.normpath(member_name.replace("\\", "/")).lstrip("/")
+        directory, file_name = posixpath.split(path)
+        name = cls.get_document_name(file_name)
+        if directory and directory != ".":
+            name = directory + "/" + name
+
+        return name.replace("%", "%25").replace("/", "%2F")
+
+    def open_file(self, file_path, stream=None):
+        """Opens a (compressed) file as a text stream, compressed files
+        are decompressed while reading. If a buffered binary stream of the
+        file is given, the text stream reads from it (closing the text
+        stream of a compressed file does not close it)."""
+        if stream is not None:
+            compression = self.get_compression(file_path, stream.peek(6)[:6])
+            if compression is None:
+                return io.TextIOWrapper(stream, encoding="utf-8")
+
+            return COMPRESSIONS[compression].open(stream, 'rt',
+                                                  encoding="utf-8")
+
+        with open(file_path, 'rb') as f:
+            head = f.read(6)
+
+        compression = self.get_compression(file_path, head)
+        if compression is None:
+            return open(file_path, 'r', encoding="utf-8")
+
+        return COMPRESSIONS[compression].open(file_path, 'rt', encoding="utf-8")
+
+    @staticmethod
+    def is_archive(file_path):
+        """Checks if a file is a (compressed) tar archive."""
+        return tarfile.is_tarfile(file_path)
+
+    def iterate_archive(self, file_path, stream=None):
+        """Iterates over the files of a (compressed) tar archive without
+        extracting it. The members are decompressed while they are read,
+        in the order they are stored in the archive. If a binary stream of
+        the archive is given, it is read from the stream.
+
+        :return generator of tuple(member_name, text stream)
+        """
+        with tarfile.open(file_path, mode='r:*', fileobj=stream) as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+
+                # the member stream is buffered, its first bytes are peeked
+                # to detect compressed members without extension
+                stream = archive.extractfile(member)
+                compression = self.get_compression(member.name,
+                                                   stream.peek(6)[:6])
+                if compression is not None:
+                    stream = COMPRESSIONS[compression].open(stream)
+
+                yield member.name, io.TextIOWrapper(stream, encoding="utf-8")
+
+    def iterate_files(self, file_path, file_hash=None):
+        """Iterates over the files of an input file: the (compressed) file
+        itself or every file of a tar archive, named by get_document_name or
+        get_member_name. If a hash object (e.g. hashlib.sha256()) is given,
+        all bytes of the input file are passed through it while it is read.
+
+        :return generator of tuple(document name, text stream)
+        """
+        if file_hash is None:
+            if self.is_archive(file_path):
+                for member_name, f in self.iterate_archive(file_path):
+                    yield self.get_member_name(member_name), f
+            else:
+                with self.open_file(file_path) as f:
+                    yield self.get_document_name(file_path), f
+            return
+
+        with open(file_path, 'rb') as raw_file:
+            raw = HashingReader(raw_file, file_hash)
+            stream = io.BufferedReader(raw)
+            if self.is_archive(file_path):
+                for member_name, f in self.iterate_archive(file_path, stream):
+                    yield self.get_member_name(member_name), f
+            else:
+                with self.open_file(file_path, stream) as f:
+                    yield self.get_document_name(file_path), f
+            # the bytes after the last document
+            raw.close()
+
+    @abstractmethod
+    def read_file_in(self, file):
+        pass
+
+    @abstractmethod
+    def read_data_file(self, file, file_hash=None):
+        """Reads one file or archive and adds its documents to self.data,
+        the bytes of the file are passed through file_hash, if given."""
+        pass
+
+    @abstractmethod
+    def read_data_files(self, infile):
+        pass
@@ -1,185 +1,423 @@
-# class that reads in ConLL-Data and pre process it.
-import DATA as DATA
-import re
-
-from DataReader.abstract_data_reader import AbstractDataReader
-
-
-class CoNLLDataReader(AbstractDataReader):
-    def __init__(self):
-        super().__init__()
-        # list of lists [file_path, document, gold]
-        self.data = []
-
-    def read_data_files(self, file_path):
-        """Retrieves the file names if a folder was passed."""
-        file_list = self.get_files_from_folder(file_path)
-        for file in file_list:
-            doc_tuple = self.read_file_in(file)
-            # [file_path, document, gold]
-            file_name = file.split("/")[-1]
-            self.data.append([file_name, doc_tuple[0], doc_tuple[1]])
-
-    def read_file_in(self, file_path):
-        """Reads a file in and extracts relevant parts of the sentence blocks
-        and the gold standard.
-
-        :arg file (str)
-
-        :return tuple((text, gold))
-                - text: list(text) of
-                        lists(sentences) of
-                        tuples('0', 'In', 'IN', '(TOP(S(PP*')
-                - gold: dict with keys = int and values = list of lists
-                    {23: [[0, 23, 24],...], [[..],[..]], 12: [[2, 0, 5], ..]}
-        """
-        text = []
-        gold = {}
-
-        with open(file_path, 'r', encoding="utf-8") as f:
-            lines_in_sentence = []
-
-            for line in f:
-
-                if line.startswith('#'):
-                    continue
-
-                if len(line) == 0 or line == '\n':
-                    sentence_nr = len(text)
-                    sentence_result_tuple = self.process_sentence_block(
-                        lines_in_sentence, sentence_nr)
-
-                    text.append(sentence_result_tuple[0])
-                    lines_in_sentence.clear()
-
-                    # gold result merging
-                    gold_results_for_sentence = sentence_result_tuple[1]
-                    for gold_nr in gold_results_for_sentence.keys():
-
-                        list_for_gold_nr = []
-
-                        if gold_nr not in gold:
-                            gold[gold_nr] = list_for_gold_nr
-                        else:
-                            list_for_gold_nr = gold[gold_nr]
-
-                        for sub_item in gold_results_for_sentence[gold_nr]:
-                            list_for_gold_nr.append(sub_item)
-
-                    continue
-
-                lines_in_sentence.append(line)
-
-        return tuple((text, gold))
-
-    def process_sentence_block(self, lines_in_sentence, sentence_num):
-        """Processes a block of on sentence from the Conell data, and stores
-        this data in a list of tuples. Extracts the gold standard from the last
-        line and stores it in a dictionary, which has an integer as key and a
-        list of lists as value.
-
-        Args:
-            lines_in_sentence: list of raw lines of the ConLL Data
-        ['bc/cctv/00/cctv_0000   8   0     This    DT    (TOP(S(NP*)     -    -   -   Speaker#1   *    (ARG1*)           *   -\n',
-        'bc/cctv/00/cctv_0000   8   1       is   VBZ          (VP*      be  01   1   Speaker#1    *       (V*)           *   -\n',
-        'bc/cctv/00/cctv_0000   8   2     what    WP   (SBAR(WHNP*)     -    -   -   Speaker#1    *    (ARG2*       (ARG1*)  -\n',
-        'bc/cctv/00/cctv_0000   8   3       we   PRP        (S(NP*)     -    -   -   Speaker#1    *         *       (ARG0*)  -\n',
-        'bc/cctv/00/cctv_0000   8   4     have   VBP          (VP*    have   -   -   Speaker#1    *         *            *   -\n',
-        'bc/cctv/00/cctv_0000   8   5     seen   VBN          (VP*     see  01   3   Speaker#1    *         *          (V*)  -\n',
-        'bc/cctv/00/cctv_0000   8   6    since    IN          (PP*      -    -   -   Speaker#1    *         *   (ARGM-TMP*   -\n',
-        'bc/cctv/00/cctv_0000   8   7    1999     CD    (NP*)))))))     -    -   -   Speaker#1  (DATE)      *)           *)  -\n',
-        'bc/cctv/00/cctv_0000   8   8        .     .            *))     -    -   -   Speaker#1    *         *            *   -\n']
-
-            sentence_num: int
-
-        Returns:
-            tuple((lines, gold_nr_stacks_dict))
-            - lines = list of tuple
-            [('0', 'In', 'IN', '(TOP(S(PP*'),
-            ('1', 'the', 'DT', '(NP(NP*'),
-            ('2', 'summer', 'NN', '*)'), ...]
-
-            - Data structure of the tuple:
-                (index, token, pos-tag, part of tree)
-                ('0', 'In', 'IN', '(TOP(S(PP*')
-
-            - gold_nr_stacks_dict
-            {18: [[1, 1, 1], [1, 5, 10]], 23: [[1, 14, 15]]}
-        """
-        lines = []
-        gold_idx_list_dict = {}
-
-        for line in lines_in_sentence:
-            parts = line.split()
-            # (index, token, pos-tag, part of tree)
-            lines.append(tuple((parts[2], parts[3], parts[4], parts[5])))
-
-            # last column is gold info
-            gold_col_str = parts[-1].strip()
-            row_nr = int(parts[2])
-            self.append_gold_mentions(sentence_num, row_nr, gold_col_str, gold_idx_list_dict)
-
-        return tuple((lines, gold_idx_list_dict))
-
-    def append_gold_mentions(self, sentence_num, row_nr, gold_col_str, gold_idx_list_dict):
-        """
-        Appends gold mentions to a dictionary.
-
-        :param sentence_num: The number of the sentence in this document
-        :param row_nr: The row number of this row in the actual sentence
-        :param gold_col_str: The last column of the conll-table, in which
-                begin and end indices of mentions are defined
-        :param gold_idx_list_dict: dict with list as values
-        """
-        # extract all beginning indices, like in '(23|(12' -> [23,12]
-        begin_indices = self.extract_gold_start_indices(gold_col_str)
-
-        for idx in begin_indices:
-            if idx not in gold_idx_list_dict:
-                # list of list because of multiple occurrences
-                # of same gold nr in same sentence
-                # [sentence_nr, start, end]
-                gold_elems = [[sentence_num, row_nr, -1]]
-                gold_idx_list_dict[idx] = gold_elems
-            else:
-                gold_elems = gold_idx_list_dict[idx]
-                gold_elems.append([sentence_num, row_nr, -1])
-
-        # extract all ending indices, like in '23)|12)' -> [23,12]
-        end_indices = self.extract_gold_end_indices(gold_col_str)
-
-        for idx in end_indices:
-            gold_elems = gold_idx_list_dict[idx]
-            gold_elems[-1][2] = int(row_nr)  # set end row
-
-    @staticmethod
-    def extract_gold_start_indices(gold_col_str):
-        list_str = re.findall(r'\((\d+)', gold_col_str)
-        list_int = [int(i) for i in list_str]
-        return list_int
-
-    @staticmethod
-    def extract_gold_end_indices(gold_col_str):
-        list_str = re.findall(r'(\d+)\)', gold_col_str)
-        list_int = [int(i) for i in list_str]
-        return list_int
-
-
-def demo():
-    dr = CoNLLDataReader()
-    # dr.read_data(DATA.PATH_FLAT_DEV_one_text)
-    dr.read_data_files("data")
-    # data = [file_path, document, gold]
-    # documents = list of sentences
-    # sentences = list_of_sent_data: list of tuple
-    # [('0', 'In', 'IN', '(TOP(S(PP*')]
-    # (index of token, token, pos_tag, tree_part)
-    # gold = {23: [[0, 23, 24], [1, 14, 15]],
-    # [[..],[..]], 12: [[2, 0, 5], ..]}
-    data = dr.data
-    print(data[0][2])
-    #print(list(data[0][2].values()))
-
-
-if __name__ == '__main__':
-    demo()
+# class that reads in ConLL-Data and pre process it.
+import io
+import itertools
+import mmap
+import re
+import sys
+
+from DataReader.abstract_data_reader import AbstractDataReader
+
+# characters read at once by read_blocks_in
+BLOCK_SIZE = 1 << 20
+
+# beginning and ending indices of the gold mentions, like in '(23|12)'
+GOLD_START_PATTERN = re.compile(r'\((\d+)')
+GOLD_END_PATTERN = re.compile(r'(\d+)\)')
+
+# the line that starts a document part, e.g.
+# #begin document (bc/cctv/00/cctv_0000); part 000
+DOCUMENT_BEGIN_PATTERN = re.compile(
+    r'^#begin document \((.*)\); part (\d+).*$', re.MULTILINE)
+DOCUMENT_BEGIN_BYTES_PATTERN = re.compile(
+    rb'^#begin document \((.*)\); part (\d+)', re.MULTILINE)
+
+
+class CoNLLDataReader(AbstractDataReader):
+    def __init__(self):
+        super().__init__()
+        # list of lists [file_path, document, gold]
+        self.data = []
+
+    def read_data_files(self, file_path):
+        """Retrieves the file names if a folder was passed."""
+        file_list = self.get_files_from_folder(file_path)
+        for file in file_list:
+            self.read_data_file(file)
+
+    def read_data_file(self, file_path, file_hash=None):
+        """Reads a (compressed) file or every file of a tar archive and adds
+        the documents to the data, one per document part of a file. If a
+        hash object is given, the file is hashed while it is read (see
+        iterate_files)."""
+        self.data.extend(self.iterate_documents(file_path, file_hash))
+
+    def iterate_documents(self, file_path, file_hash=None):
+        """Yields the documents of a (compressed) file or of every file of a
+        tar archive one after another while the file is read, one per
+        document part [file_path, document, gold]. A file with one part
+        keeps the file name, else the part number is added to it, so the
+        next part is read before a part is yielded."""
+        for file_name, f in self.iterate_files(file_path, file_hash):
+            parts = self.iterate_parts_in(f)
+            first = next(parts)
+            second = next(parts, None)
+            if second is None:
+                yield [file_name, first[2], first[3]]
+                continue
+
+            for part in itertools.chain([first, second], parts):
+                yield [self.get_part_name(file_name, part[1]), part[2],
+                       part[3]]
+
+    @staticmethod
+    def get_part_name(file_name, part):
+        """Returns the name of a document part of a file, e.g.
+        "cctv_0000.v4_auto_conll_part_001"."""
+        return f"{file_name}_part_{part}"
+
+    def read_file_in(self, file_path):
+        """Reads a (compressed) file in as one document, see read_blocks_in
+        (and read_parts_in for files with several document parts).
+
+        :arg file (str)
+        """
+        with self.open_file(file_path) as f:
+            return self.read_blocks_in(f)
+
+    def read_blocks_in(self, f, block_size=BLOCK_SIZE):
+        """Reads a text stream in large blocks and extracts the same sentences
+        and gold standard as read_lines_in, but faster: the blocks are split
+        into sentences at the blank lines at once and only the needed columns
+        (index, token, pos-tag, part of tree and coreference) are split off.
+
+        :arg f: text stream
+        :arg block_size: int, number of characters read at once
+
+        :return tuple((text, gold)), see read_lines_in
+        """
+        text = []
+        gold = {}
+        for sentence_block in self.iterate_sentence_blocks(f, block_size):
+            sentence = self.process_sentence_text(sentence_block, len(text),
+                                                  gold)
+            # e.g. blocks of comments only
+            if sentence:
+                text.append(sentence)
+
+        return tuple((text, gold))
+
+    def read_parts_in(self, f, block_size=BLOCK_SIZE):
+        """Reads a text stream in blocks like read_blocks_in, but splits it
+        into the document parts, that begin with a line like
+        "#begin document (bc/cctv/00/cctv_0000); part 000". Every part gets
+        its own sentence numbers and gold standard.
+
+        :return list of lists [document_id, part, text, gold], document_id and
+            part are None for a stream without such lines (one part)
+        """
+        return list(self.iterate_parts_in(f, block_size))
+
+    def iterate_parts_in(self, f, block_size=BLOCK_SIZE):
+        """Yields the document parts of a text stream like read_parts_in,
+        each as soon as the next one begins, so that only one part of the
+        stream is held in memory. There is at least one part."""
+        current = [None, None, [], {}]
+        parts = 0
+        for sentence_block in self.iterate_sentence_blocks(f, block_size):
+            if "#begin document" not in sentence_block:
+                self.__add_sentence(current, sentence_block)
+                continue
+
+            # [text before, document_id, part, text after, document_id, ...]
+            pieces = DOCUMENT_BEGIN_PATTERN.split(sentence_block)
+            self.__add_sentence(current, pieces[0])
+            for i in range(1, len(pieces), 3):
+                # sentences before the first part are a part of their own
+                if current[0] is not None or current[2]:
+                    yield current
+                    parts += 1
+                current = [pieces[i], pieces[i + 1], [], {}]
+                self.__add_sentence(current, pieces[i + 2])
+
+        if current[0] is not None or current[2] or not parts:
+            yield current
+
+    def __add_sentence(self, part, sentence_block):
+        """Adds the sentence of a block to a part [id, part, text, gold]."""
+        sentence = self.process_sentence_text(sentence_block, len(part[2]),
+                                              part[3])
+        if sentence:
+            part[2].append(sentence)
+
+    @staticmethod
+    def get_part_offsets(file_path):
+        """Returns the byte offsets of the document parts of an uncompressed
+        file, so that each part can be read on its own (see read_part).
+        The file is searched for the "#begin document" lines with mmap.
+
+        :return list of tuples (document_id, part, start, end), one tuple
+            (None, None, 0, size) for a file without such lines
+        """
+        with open(file_path, 'rb') as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return [(None, None, 0, 0)]
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # (document_id, part, start) of every part
+                matches = [(match.group(1).decode("utf-8"),
+                            match.group(2).decode("utf-8"), match.start())
+                           for match in
+                           DOCUMENT_BEGIN_BYTES_PATTERN.finditer(data)]
+                # sentences before the first part are a part of their own
+                leading_lines = data[:matches[0][2]].splitlines() \
+                    if matches else []
+
+        if not matches:
+            return [(None, None, 0, size)]
+
+        offsets = []
+        if any(line.strip() and not line.startswith(b'#')
+               for line in leading_lines):
+            offsets.append((None, None, 0, matches[0][2]))
+        for i, (document_id, part, start) in enumerate(matches):
+            end = matches[i + 1][2] if i + 1 < len(matches) else size
+            offsets.append((document_id, part, start, end))
+
+        return offsets
+
+    def read_part(self, file_path, start, end):
+        """Reads the document part between two byte offsets of an
+        uncompressed file (see get_part_offsets), the file is mapped into
+        memory, so that only the pages of the part are read.
+
+        :return tuple((text, gold)), see read_lines_in
+        """
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            part_bytes = data[start:end]
+
+        # decoded like a file opened in text mode
+        parts = self.read_parts_in(
+            io.TextIOWrapper(io.BytesIO(part_bytes), encoding="utf-8"))
+        return tuple((parts[-1][2], parts[-1][3]))
+
+    @staticmethod
+    def iterate_sentence_blocks(f, block_size=BLOCK_SIZE):
+        """Yields the sentence blocks (lines up to a blank line) of a text
+        stream, which is read in blocks of block_size characters. Like in
+        read_lines_in, lines after the last blank line are no sentence."""
+        rest = ""
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+
+            sentence_blocks = (rest + block).split("\n\n")
+            # the last sentence block may continue in the next block
+            rest = sentence_blocks.pop()
+            yield from sentence_blocks
+
+    def process_sentence_text(self, sentence_block, sentence_num, gold):
+        """Processes the text of one sentence block like process_sentence_block
+        and adds its gold mentions directly to the gold standard of the
+        document. Comment lines are skipped and the coreference column is only
+        searched for mentions if it is not '-'.
+
+        Args:
+            sentence_block: str, lines of one sentence of the ConLL Data
+            sentence_num: int
+            gold: dict with int keys and list of lists as values, the gold
+                standard of the document, see read_lines_in
+
+        Returns:
+            list of tuple (index, token, pos-tag, part of tree)
+            [('0', 'In', 'IN', '(TOP(S(PP*'), ...]
+        """
+        lines = []
+        intern_token = self.vocabulary.intern
+        for line in sentence_block.split("\n"):
+            if not line or line[0] == '#':
+                continue
+
+            # columns 0 - 5 and the rest of the line
+            columns = line.split(None, 6)
+            # a line of whitespace does not end a sentence, only an empty one
+            if not columns:
+                continue
+            # (index, token, pos-tag, part of tree)
+            # tokens and pos-tags are interned, to store each only once
+            lines.append((columns[2], intern_token(columns[3]),
+                          sys.intern(columns[4]), columns[5]))
+
+            # last column is gold info
+            gold_col_str = columns[6].rsplit(None, 1)[-1]
+            if gold_col_str == '-':
+                continue
+
+            row_nr = int(columns[2])
+            for idx in GOLD_START_PATTERN.findall(gold_col_str):
+                idx = int(idx)
+                if idx not in gold:
+                    gold[idx] = [[sentence_num, row_nr, -1]]
+                else:
+                    gold[idx].append([sentence_num, row_nr, -1])
+
+            for idx in GOLD_END_PATTERN.findall(gold_col_str):
+                gold[int(idx)][-1][2] = row_nr  # set end row
+
+        return lines
+
+    def read_lines_in(self, lines):
+        """Reads the lines of a file in and extracts relevant parts of the
+        sentence blocks and the gold standard.
+
+        :arg lines: iterable of str, e.g. a text stream
+
+        :return tuple((text, gold))
+                - text: list(text) of
+                        lists(sentences) of
+                        tuples('0', 'In', 'IN', '(TOP(S(PP*')
+                - gold: dict with keys = int and values = list of lists
+                    {23: [[0, 23, 24],...], [[..],[..]], 12: [[2, 0, 5], ..]}
+        """
+        text = []
+        gold = {}
+        lines_in_sentence = []
+
+        for line in lines:
+
+            if line.startswith('#'):
+                continue
+
+            if len(line) == 0 or line == '\n':
+                sentence_nr = len(text)
+                sentence_result_tuple = self.process_sentence_block(
+                    lines_in_sentence, sentence_nr)
+
+                text.append(sentence_result_tuple[0])
+                lines_in_sentence.clear()
+
+                # gold result merging
+                gold_results_for_sentence = sentence_result_tuple[1]
+                for gold_nr in gold_results_for_sentence.keys():
+
+                    list_for_gold_nr = []
+
+                    if gold_nr not in gold:
+                        gold[gold_nr] = list_for_gold_nr
+                    else:
+                        list_for_gold_nr = gold[gold_nr]
+
+                    for sub_item in gold_results_for_sentence[gold_nr]:
+                        list_for_gold_nr.append(sub_item)
+
+                continue
+
+            lines_in_sentence.append(line)
+
+        return tuple((text, gold))
+
+    def process_sentence_block(self, lines_in_sentence, sentence_num):
+        """Processes a block of on sentence from the Conell data, and stores
+        this data in a list of tuples. Extracts the gold standard from the last
+        line and stores it in a dictionary, which has an integer as key and a
+        list of lists as value.
+
+        Args:
+            lines_in_sentence: list of raw lines of the ConLL Data
+        ['bc/cctv/00/cctv_0000   8   0     This    DT    (TOP(S(NP*)     -    -   -   Speaker#1   *    (ARG1*)           *   -\n',
+        'bc/cctv/00/cctv_0000   8   1       is   VBZ          (VP*      be  01   1   Speaker#1    *       (V*)           *   -\n',
+        'bc/cctv/00/cctv_0000   8   2     what    WP   (SBAR(WHNP*)     -    -   -   Speaker#1    *    (ARG2*       (ARG1*)  -\n',
+        'bc/cctv/00/cctv_0000   8   3       we   PRP        (S(NP*)     -    -   -   Speaker#1    *         *       (ARG0*)  -\n',
+        'bc/cctv/00/cctv_0000   8   4     have   VBP          (VP*    have   -   -   Speaker#1    *         *            *   -\n',
+        'bc/cctv/00/cctv_0000   8   5     seen   VBN          (VP*     see  01   3   Speaker#1    *         *          (V*)  -\n',
+        'bc/cctv/00/cctv_0000   8   6    since    IN          (PP*      -    -   -   Speaker#1    *         *   (ARGM-TMP*   -\n',
+        'bc/cctv/00/cctv_0000   8   7    1999     CD    (NP*)))))))     -    -   -   Speaker#1  (DATE)      *)           *)  -\n',
+        'bc/cctv/00/cctv_0000   8   8        .     .            *))     -    -   -   Speaker#1    *         *            *   -\n']
+
+            sentence_num: int
+
+        Returns:
+            tuple((lines, gold_nr_stacks_dict))
+            - lines = list of tuple
+            [('0', 'In', 'IN', '(TOP(S(PP*'),
+            ('1', 'the', 'DT', '(NP(NP*'),
+            ('2', 'summer', 'NN', '*)'), ...]
+
+            - Data structure of the tuple:
+                (index, token, pos-tag, part of tree)
+                ('0', 'In', 'IN', '(TOP(S(PP*')
+
+            - gold_nr_stacks_dict
+            {18: [[1, 1, 1], [1, 5, 10]], 23: [[1, 14, 15]]}
+        """
+        lines = []
+        gold_idx_list_dict = {}
+
+        for line in lines_in_sentence:
+            parts = line.split()
+            # (index, token, pos-tag, part of tree)
+            # tokens and pos-tags are interned, to store each only once
+            lines.append(tuple((parts[2], self.vocabulary.intern(parts[3]),
+                                sys.intern(parts[4]), parts[5])))
+
+            # last column is gold info
+            gold_col_str = parts[-1].strip()
+            row_nr = int(parts[2])
+            self.append_gold_mentions(sentence_num, row_nr, gold_col_str, gold_idx_list_dict)
+
+        return tuple((lines, gold_idx_list_dict))
+
+    def append_gold_mentions(self, sentence_num, row_nr, gold_col_str, gold_idx_list_dict):
+        """
+        Appends gold mentions to a dictionary.
+
+        :param sentence_num: The number of the sentence in this document
+        :param row_nr: The row number of this row in the actual sentence
+        :param gold_col_str: The last column of the conll-table, in which
+                begin and end indices of mentions are defined
+        :param gold_idx_list_dict: dict with list as values
+        """
+        # extract all beginning indices, like in '(23|(12' -> [23,12]
+        begin_indices = self.extract_gold_start_indices(gold_col_str)
+
+        for idx in begin_indices:
+            if idx not in gold_idx_list_dict:
+                # list of list because of multiple occurrences
+                # of same gold nr in same sentence
+                # [sentence_nr, start, end]
+                gold_elems = [[sentence_num, row_nr, -1]]
+                gold_idx_list_dict[idx] = gold_elems
+            else:
+                gold_elems = gold_idx_list_dict[idx]
+                gold_elems.append([sentence_num, row_nr, -1])
+
+        # extract all ending indices, like in '23)|12)' -> [23,12]
+        end_indices = self.extract_gold_end_indices(gold_col_str)
+
+        for idx in end_indices:
+            gold_elems = gold_idx_list_dict[idx]
+            gold_elems[-1][2] = int(row_nr)  # set end row
+
+    @staticmethod
+    def extract_gold_start_indices(gold_col_str):
+        list_str = GOLD_START_PATTERN.findall(gold_col_str)
+        list_int = [int(i) for i in list_str]
+        return list_int
+
+    @staticmethod
+    def extract_gold_end_indices(gold_col_str):
+        list_str = GOLD_END_PATTERN.findall(gold_col_str)
+        list_int = [int(i) for i in list_str]
+        return list_int
+
+
+def demo():
+    dr = CoNLLDataReader()
+    # dr.read_data(DATA.PATH_FLAT_DEV_one_text)
+    dr.read_data_files("data")
+    # data = [file_path, document, gold]
+    # documents = list of sentences
+    # sentences = list_of_sent_data: list of tuple
+    # [('0', 'In', 'IN', '(TOP(S(PP*')]
+    # (index of token, token, pos_tag, tree_part)
+    # gold = {23: [[0, 23, 24], [1, 14, 15]],
+    # [[..],[..]], 12: [[2, 0, 5], ..]}
+    data = dr.data
+    print(data[0][2])
+    #print(list(data[0][2].values()))
+
+
+if __name__ == '__main__':
+    demo()
@@ -1,36 +1,65 @@
-# Transforms the data from an implemented data reader, which must inherit from
-# the AbstractDataReader class (see data structure) into document objects
-
-from MultiSievePassCorefResolution.document_class import Document
-from MultiSievePassCorefResolution.sentence_class import Sentence
-
-
-class DataTranformer:
-    """This is a class that takes care of instantiating the data from the data
-     reader object into a document object. this favors a modular extension of
-     the program by other readers for other data, they only need to transform
-     the data of the text into the form defined further below.
-
-        # TODO: data must be in this data structure:
-        # [inpath, [list of [list of documents[list of sentences]]], gold_standard]
-        # file_path (str)
-        # documents = list of sentences
-        # sentences = list_of_sent_data = list of tuple
-        # [('0', 'In', 'IN', '(TOP(S(PP*']
-        # (index of token in the sentence, token, pos_tag, tree_part)"""
-
-    @staticmethod
-    def create_document_objects_from_data(data):
-
-        list_of_document_objects = []
-        list_of_sentences_objects = []
-        for file_path, document, gold in data:
-            for sentence in document:
-                new_sent_obj = Sentence(sentence)
-                list_of_sentences_objects.append(new_sent_obj)
-
-            gold_standard = list(gold.values())
-            new_document_obj = Document(file_path, list_of_sentences_objects, gold_standard)
-            list_of_document_objects.append(new_document_obj)
-
-        return list_of_document_objects
+# Transforms the data from an implemented data reader, which must inherit from
+# the AbstractDataReader class (see data structure) into document objects
+
+from MultiSievePassCorefResolution.document_class import Document
+from MultiSievePassCorefResolution.sentence_class import Sentence
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+
+
+class DataTranformer:
+    """This is a class that takes care of instantiating the data from the data
+     reader object into a document object. this favors a modular extension of
+     the program by other readers for other data, they only need to transform
+     the data of the text into the form defined further below.
+
+        # TODO: data must be in this data structure:
+        # [inpath, [list of [list of documents[list of sentences]]], gold_standard]
+        # file_path (str)
+        # documents = list of sentences
+        # sentences = list_of_sent_data = list of tuple
+        # [('0', 'In', 'IN', '(TOP(S(PP*']
+        # (index of token in the sentence, token, pos_tag, tree_part)"""
+
+    @staticmethod
+    def create_document_objects_from_data(data, vocabulary=None,
+                                          requirements=None,
+                                          gold_mentions=False):
+        """The vocabulary (usually the one of the data reader) is shared by
+        all documents, a new one is created if none is passed. requirements
+        is the set of structures the sieves need (see
+        sieve_registry.get_requirements), None builds all of them.
+        With gold_mentions the mentions are the spans of the gold standard
+        instead of the NPs of the parse trees."""
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+
+        return [DataTranformer.create_document_object(
+            file_path, document, gold, vocabulary, requirements,
+            gold_mentions) for file_path, document, gold in data]
+
+    @staticmethod
+    def create_document_object(file_path, document, gold, vocabulary,
+                               requirements=None, gold_mentions=False):
+        """Creates the document object of one document of the data, so that
+        documents can be created one after another while they are read (see
+        create_document_objects_from_data)."""
+        # gold spans per sentence number
+        mention_spans = None
+        if gold_mentions:
+            mention_spans = {}
+            for cluster in gold.values():
+                for sent_num, span_start, span_end in cluster:
+                    mention_spans.setdefault(sent_num, []).append(
+                        tuple((span_start, span_end)))
+
+        list_of_sentences_objects = []
+        for sent_num, sentence in enumerate(document):
+            new_sent_obj = Sentence(
+                sentence, vocabulary, requirements,
+                mention_spans.get(sent_num, [])
+                if mention_spans is not None else None)
+            list_of_sentences_objects.append(new_sent_obj)
+
+        gold_standard = list(gold.values())
+        return Document(file_path, list_of_sentences_objects, gold_standard,
+                        vocabulary)
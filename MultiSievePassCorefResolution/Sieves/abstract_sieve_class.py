@@ -1,73 +1,161 @@
-# Base class for the sieve classes. Abstract method is is_compatible()
-# were the sieves have deterministic rules to decide if a mention and a
-# candidate can be grouped in on cluster.
-from abc import ABC, abstractmethod
-
-
-class AbstractSieve(ABC):
-    """Abstract Sieve class that forces all sieve classes to define a
-    method 'sieve' which resolves the coreference chains applying its rule.
-    """
-
-    def sieve(self, document_obj):
-        """Extracts possible candidates according to the syntactic structure:
-            - from the same sentence or:
-              candidates are sorted based on left-to-right breadth-first
-              traversal of syntax tree
-            - from the previous sentence:
-              - if mention is nominal: Candidates are sorted based on
-              right-to-left breadth-first traversal of the syntax tree.
-              - if mention is pronominal: Candidates are sorted based on
-              left-to right-breadth-first traversal of the syntax tree."""
-
-        for mention in document_obj.mentions.values():
-
-            # Each sieve always tries to resolve only first mention in a cluster:
-            # check if mention is head_mention in a cluster:
-            cluster_ID = mention.cluster_ID
-            if cluster_ID in document_obj.clusters and \
-                    document_obj.clusters[cluster_ID].head_mention_span \
-                    == mention.sent_num_span:
-
-                # check if mention is nominal or pronominal
-                if mention.is_nominal():
-                    left_to_right_traversal = True
-                else:
-                    left_to_right_traversal = False
-
-                # candidates = list of mention objects
-                # [candidates of same sentence, candidates of previous sentence]
-                candidates = document_obj.get_candidates(mention,
-                                                         left_to_right_traversal)
-
-                for candidate in candidates:
-
-                    # method specified in each sieve class
-                    if self.is_compatible(mention, candidate, document_obj):
-                        # print(f"M: {mention.sent_num_span}")
-                        # print(f"C: {candidate.sent_num_span}")
-                        document_obj.unify_clusters(mention, candidate)
-
-        return document_obj
-
-    @staticmethod
-    def __search_pruning(mention):
-        """Two mentions are not linked if the candidate is either an
-        indefinite pronoun or begin with an indefinite article.
-        """
-        # returns True if begins with an indefinite article
-        if mention.starts_with_an_indefinite_article():
-            return True
-
-        # returns True is an indefinite pronoun
-        if mention.is_an_indefinite_pronoun():
-            return True
-
-        else:
-            return False
-
-    @abstractmethod
-    def is_compatible(self, mention, candidate, document_obj):
-        """Checks if mention and candidate are compatible with each other,
-        depending on the specific rule of the sieve."""
-        pass
+# Base class for the sieve classes. Abstract method is is_compatible()
+# were the sieves have deterministic rules to decide if a mention and a
+# candidate can be grouped in on cluster.
+from abc import ABC, abstractmethod
+
+# structures of a document a sieve can require (see AbstractSieve.requires)
+# the nltk Tree of the sentences
+PARSE_TREE = "parse_tree"
+# the sentences as strings
+SENTENCE_STRINGS = "sentence_strings"
+
+
+class AbstractSieve(ABC):
+    """Abstract Sieve class that forces all sieve classes to define a
+    method 'sieve' which resolves the coreference chains applying its rule.
+
+    Sieves can declare cheap necessary conditions of is_compatible(), so that
+    most candidates are rejected before is_compatible() is called:
+        - prefilter_mention(mention): False if no candidate can be compatible
+    or evaluate their rules for all candidates of a mention at once:
+        - compatibility_mask(mention, candidate_rows, features): the outcome
+          of the rules for every candidate, from the numpy columns of the
+          MentionFeatures of the document (mask_is_complete = False, if only
+          some rules are vectorised)
+
+    Expensive sieves (expensive = True) are skipped first, when the time
+    budget of a document (see SieveBudget) runs short.
+
+    A sieve declares the structures it needs in requires, only the union of
+    the requirements of the applied sieves is built for the documents.
+    Structures that are not required are built on first use. The mention
+    features and the candidates are needed by every sieve, they are built
+    by the document on first use (see Document.get_mention_features).
+    """
+
+    expensive = False
+
+    requires = frozenset()
+
+    mask_is_complete = True
+
+    def sieve(self, document_obj, budget=None):
+        """Extracts possible candidates according to the syntactic structure:
+            - from the same sentence or:
+              candidates are sorted based on left-to-right breadth-first
+              traversal of syntax tree
+            - from the previous sentence:
+              - if mention is nominal: Candidates are sorted based on
+              right-to-left breadth-first traversal of the syntax tree.
+              - if mention is pronominal: Candidates are sorted based on
+              left-to right-breadth-first traversal of the syntax tree.
+
+        If a SieveBudget is given, at most budget.max_candidates candidates
+        are checked per mention and the sieve stops when its time budget is
+        exceeded (the clusters found so far remain)."""
+
+        sieve_name = type(self).__name__
+        features = document_obj.get_mention_features()
+        mentions = features.mentions
+
+        for mention in document_obj.mentions.values():
+
+            # Each sieve always tries to resolve only first mention in a cluster:
+            # check if mention is head_mention in a cluster:
+            cluster_ID = mention.cluster_ID
+            if cluster_ID in document_obj.clusters and \
+                    document_obj.clusters[cluster_ID].head_mention_span \
+                    == mention.sent_num_span:
+
+                if budget is not None and budget.is_exceeded():
+                    budget.add_degradation(f"{sieve_name}: stopped, time "
+                                           f"budget exceeded")
+                    break
+
+                # no candidate can be compatible, e.g. for pruned mentions
+                if not self.prefilter_mention(mention):
+                    continue
+
+                # check if mention is nominal or pronominal
+                if mention.is_nominal():
+                    left_to_right_traversal = True
+                else:
+                    left_to_right_traversal = False
+
+                # rows of the candidates (see mention.table_idx)
+                # [candidates of same sentence, candidates of previous sentence]
+                candidate_rows = document_obj.get_candidate_rows(
+                    mention, left_to_right_traversal)
+
+                # the same closest candidates are checked, whether the
+                # rules are vectorised or not
+                candidate_rows = self.__cap(budget, candidate_rows,
+                                            sieve_name)
+                mask = self.compatibility_mask(mention, candidate_rows,
+                                               features)
+                if mask is None:
+                    checked_rows = candidate_rows
+                    matched = [False] * len(checked_rows)
+                elif self.mask_is_complete:
+                    checked_rows = candidate_rows[mask]
+                    matched = [True] * len(checked_rows)
+                else:
+                    checked_rows = candidate_rows
+                    matched = mask
+
+                # greedy merging in the order of the traversal
+                for row, is_matched in zip(checked_rows, matched):
+                    candidate = mentions[row]
+
+                    # method specified in each sieve class
+                    if is_matched or self.is_compatible(mention, candidate,
+                                                        document_obj):
+                        # print(f"M: {mention.sent_num_span}")
+                        # print(f"C: {candidate.sent_num_span}")
+                        document_obj.unify_clusters(mention, candidate)
+
+        return document_obj
+
+    @staticmethod
+    def __cap(budget, candidate_rows, sieve_name):
+        """Returns at most budget.max_candidates candidates."""
+        if budget is None:
+            return candidate_rows
+
+        return budget.cap_candidates(candidate_rows, sieve_name)
+
+    def prefilter_mention(self, mention):
+        """Returns False if the mention can not be compatible with any
+        candidate, so that no candidates are extracted for it.
+        Default: True."""
+        return True
+
+    def compatibility_mask(self, mention, candidate_rows, features):
+        """Returns a bool numpy array, True for the candidates (given by their
+        rows in the MentionFeatures) that are compatible with the mention by
+        vectorised rules. If mask_is_complete is False, is_compatible() is
+        still called for the other candidates.
+        Default: None, is_compatible() is called for every candidate."""
+        return None
+
+    @staticmethod
+    def _search_pruning(mention):
+        """Two mentions are not linked if the candidate is either an
+        indefinite pronoun or begin with an indefinite article.
+        """
+        # returns True if begins with an indefinite article
+        if mention.starts_with_an_indefinite_article():
+            return True
+
+        # returns True is an indefinite pronoun
+        if mention.is_an_indefinite_pronoun():
+            return True
+
+        else:
+            return False
+
+    @abstractmethod
+    def is_compatible(self, mention, candidate, document_obj):
+        """Checks if mention and candidate are compatible with each other,
+        depending on the specific rule of the sieve."""
+        pass
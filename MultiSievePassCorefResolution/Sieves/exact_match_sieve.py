@@ -1,27 +1,31 @@
-# Links two Referring Expressions if they match exactly the same string.
-from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
-
-
-class ExactMatchSieve(AbstractSieve):
-
-    def is_compatible(self, mention, candidate, document_obj):
-        """Checks if mention and candidate are compatible with each other.
-        Case insensitive to also find matches that are at the beginning
-        of the sentence. Returns True if so, otherwise returns False. """
-
-        # convert all tokens to lower in both lists
-        mention_list_lower = [item.lower() for item
-                              in mention.mention_token_list]
-        candidates_list_lower = [item.lower() for item
-                                 in candidate.mention_token_list]
-
-        # check if its an exact match
-        if mention_list_lower == candidates_list_lower \
-                and mention.cluster_ID != candidate.cluster_ID:
-
-            return True
-
-        # if no exact match
-        else:
-
-            return False
+# Links two Referring Expressions if they match exactly the same string.
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
+
+
+class ExactMatchSieve(AbstractSieve):
+
+    def compatibility_mask(self, mention, candidate_rows, features):
+        """The rule of is_compatible for all candidates at once: the codes of
+        the lower cased tokens are equal and the cluster IDs differ."""
+        string_codes = features.get_string_codes()
+        cluster_IDs = features.get_cluster_IDs()
+        row = mention.table_idx
+        return (string_codes[candidate_rows] == string_codes[row]) \
+            & (cluster_IDs[candidate_rows] != cluster_IDs[row])
+
+    def is_compatible(self, mention, candidate, document_obj):
+        """Checks if mention and candidate are compatible with each other.
+        Case insensitive to also find matches that are at the beginning
+        of the sentence. Returns True if so, otherwise returns False. """
+
+        # check if its an exact match, the IDs of the lower cased tokens
+        # are compared
+        if mention.lower_token_ids == candidate.lower_token_ids \
+                and mention.cluster_ID != candidate.cluster_ID:
+
+            return True
+
+        # if no exact match
+        else:
+
+            return False
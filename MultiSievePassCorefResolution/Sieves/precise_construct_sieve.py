@@ -1,119 +1,166 @@
-# The sieve links two referring expressions if they correspond to one of these
-# constructions: Apposition, Predicative Nominative or Acronym.
-from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
-import re
-
-
-class PreciseConstructSieve(AbstractSieve):
-
-    def is_compatible(self, mention, candidate, document_obj):
-        """Checks if mention and candidate are compatible with each other.
-        Case insensitive to also find matches that are at the beginning
-        of the sentence. Returns True if so, otherwise returns False."""
-
-        # prune search if a indefinite pronoun or indefinite article
-        # implemented in the abstract class
-        if self.__search_pruning(mention):
-            return False
-
-        # check if its an Acronym
-        if self.__is_acronym(mention, candidate):
-
-            return True
-
-        # get sentence
-        sentence = document_obj.sentences[mention.sent_num_span[0]].\
-            get_sentence_as_str()
-
-        candidate_str = candidate.get_mention_as_str()
-        mention_str = mention.get_mention_as_str()
-
-        # check if is a Predicative Nominative
-        if self.__is_predicative_nominative(sentence, mention, candidate,
-                                            mention_str, candidate_str):
-            return True
-
-        # check if it is a Apposition
-        if self.__is_apposition(sentence, mention_str, candidate_str):
-
-            return True
-
-        # not Apposition, Predicative Nominative nor a Acronym
-        else:
-
-            return False
-
-    @staticmethod
-    def __is_apposition(sentence, mention_str, candidate_str):
-        """Checks if the mention is a apposition of the candidate, based on the rule,
-        that candidate (NP) and mention (NP) are separated by a comma."""
-        reg_ex = candidate_str + ", " + mention_str + ", "
-        if len(re.findall(reg_ex, sentence)) > 0:
-
-            return True
-
-        else:
-
-            return False
-
-    @staticmethod
-    def __is_predicative_nominative(sentence, mention, candidate,
-                                    mention_str, candidate_str):
-        """Checks if is a Predicative Nominative based on a simple rule,
-        that candidate (NP) and the mention (NP) are linked with a form
-        of the verb to be. """
-
-        # check if candidate and mention are from the same sentence
-        if mention.sent_num_span[0] == candidate.sent_num_span[0]:
-            # check if mention and candidate are linked with the verb "to be"
-            to_be = [" am ", " are ", " is ", " was ", " were ",
-                     " will be ", " has been ", " have been "]
-
-            # check if a elem of to_be list is in sentence
-            verb_is_in_sent = any(verb in sentence for verb in to_be)
-            if verb_is_in_sent:
-                # get verb
-                for verb in to_be:
-                    idx = sentence.find(verb)
-                    if idx != -1:
-                        combi = candidate_str + verb + mention_str
-                        if combi in sentence:
-
-                            return True
-        else:
-
-            return False
-
-    def __is_acronym(self, mention, candidate):
-        """Checks if mention or candidate is a acronym of the other."""
-
-        # mention and candidate are tagged as nnp
-        # and one is the acronym of the other one
-        if "NNP" in mention.info and "NNP" in candidate.info:
-            # convert all tokens to lower in both lists
-            mention_list_lower = [item.lower() for item
-                                  in mention.mention_token_list]
-            candidates_list_lower = [item.lower() for item
-                                     in candidate.mention_token_list]
-
-            mention_acro = self.__get_acronym(mention_list_lower)
-            candidate_acro = self.__get_acronym(candidates_list_lower)
-            if mention_acro and candidate_acro:
-                if mention_acro == candidates_list_lower \
-                        or candidate_acro == mention_list_lower:
-
-                    return True
-        else:
-
-            return False
-
-    @staticmethod
-    def __get_acronym(string_list):
-        """Creates two acronyms, one dotted and another not."""
-        letter_list = []
-        for l in string_list:
-            if l[0].isalpha():
-                letter_list.append(l[0])
-        if len(letter_list) == 1:
-            letter_list = []
-        return "".join(letter_list), (".".join(letter_list) + ".")
+# The sieve links two referring expressions if they correspond to one of these
+# constructions: Apposition, Predicative Nominative or Acronym.
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import \
+    AbstractSieve, SENTENCE_STRINGS
+import re
+
+import numpy as np
+
+
+class PreciseConstructSieve(AbstractSieve):
+
+    # searches the sentence strings for appositions and predicative nominatives
+    expensive = True
+
+    # only the acronyms are vectorised
+    mask_is_complete = False
+
+    requires = AbstractSieve.requires | {SENTENCE_STRINGS}
+
+    def prefilter_mention(self, mention):
+        """Pruned mentions are not linked."""
+        return not self._search_pruning(mention)
+
+    def compatibility_mask(self, mention, candidate_rows, features):
+        """The acronym rule of is_compatible for all candidates at once:
+        both are tagged as NNP and the codes of the lower cased tokens of one
+        are equal to a code of the acronyms of the other."""
+        proper = features.get_flag_column(
+            "proper", lambda m: "NNP" in m.info)
+        row = mention.table_idx
+        if not proper[row]:
+            return np.zeros(len(candidate_rows), dtype=bool)
+
+        string_codes = features.get_string_codes()
+        acronym_codes = features.get_code_column(
+            "acronyms", lambda m: self.__get_acronym_ids(
+                m.lower_token_ids, features.vocabulary) if "NNP" in m.info
+            else [], width=2)
+        candidate_strings = string_codes[candidate_rows]
+        candidate_acronyms = acronym_codes[candidate_rows]
+        return proper[candidate_rows] \
+            & ((candidate_strings == acronym_codes[row, 0])
+               | (candidate_strings == acronym_codes[row, 1])
+               | (candidate_acronyms[:, 0] == string_codes[row])
+               | (candidate_acronyms[:, 1] == string_codes[row]))
+
+    def is_compatible(self, mention, candidate, document_obj):
+        """Checks if mention and candidate are compatible with each other.
+        Case insensitive to also find matches that are at the beginning
+        of the sentence. Returns True if so, otherwise returns False."""
+
+        # prune search if a indefinite pronoun or indefinite article
+        # implemented in the abstract class
+        if self._search_pruning(mention):
+            return False
+
+        # check if its an Acronym
+        if self.__is_acronym(mention, candidate, document_obj.vocabulary):
+
+            return True
+
+        # get sentence
+        sentence = document_obj.sentences[mention.sent_num_span[0]].\
+            get_sentence_as_str()
+
+        candidate_str = candidate.get_mention_as_str()
+        mention_str = mention.get_mention_as_str()
+
+        # check if is a Predicative Nominative
+        if self.__is_predicative_nominative(sentence, mention, candidate,
+                                            mention_str, candidate_str):
+            return True
+
+        # check if it is a Apposition
+        if self.__is_apposition(sentence, mention_str, candidate_str):
+
+            return True
+
+        # not Apposition, Predicative Nominative nor a Acronym
+        else:
+
+            return False
+
+    @staticmethod
+    def __is_apposition(sentence, mention_str, candidate_str):
+        """Checks if the mention is a apposition of the candidate, based on the rule,
+        that candidate (NP) and mention (NP) are separated by a comma."""
+        reg_ex = candidate_str + ", " + mention_str + ", "
+        if len(re.findall(reg_ex, sentence)) > 0:
+
+            return True
+
+        else:
+
+            return False
+
+    @staticmethod
+    def __is_predicative_nominative(sentence, mention, candidate,
+                                    mention_str, candidate_str):
+        """Checks if is a Predicative Nominative based on a simple rule,
+        that candidate (NP) and the mention (NP) are linked with a form
+        of the verb to be. """
+
+        # check if candidate and mention are from the same sentence
+        if mention.sent_num_span[0] == candidate.sent_num_span[0]:
+            # check if mention and candidate are linked with the verb "to be"
+            to_be = [" am ", " are ", " is ", " was ", " were ",
+                     " will be ", " has been ", " have been "]
+
+            # check if a elem of to_be list is in sentence
+            verb_is_in_sent = any(verb in sentence for verb in to_be)
+            if verb_is_in_sent:
+                # get verb
+                for verb in to_be:
+                    idx = sentence.find(verb)
+                    if idx != -1:
+                        combi = candidate_str + verb + mention_str
+                        if combi in sentence:
+
+                            return True
+        else:
+
+            return False
+
+    def __is_acronym(self, mention, candidate, vocabulary):
+        """Checks if mention or candidate is a acronym of the other."""
+
+        # mention and candidate are tagged as nnp
+        # and one is the acronym of the other one
+        if "NNP" in mention.info and "NNP" in candidate.info:
+            # the acronyms as IDs of the vocabulary, compared with the
+            # lower cased token IDs of the other mention
+            mention_acro = self.__get_acronym_ids(mention.lower_token_ids,
+                                                  vocabulary)
+            candidate_acro = self.__get_acronym_ids(candidate.lower_token_ids,
+                                                    vocabulary)
+            if candidate.lower_token_ids in mention_acro \
+                    or mention.lower_token_ids in candidate_acro:
+
+                return True
+
+        return False
+
+    @staticmethod
+    def __get_acronym(string_list):
+        """Creates two acronyms, one dotted and another not."""
+        letter_list = []
+        for l in string_list:
+            if l[0].isalpha():
+                letter_list.append(l[0])
+        if len(letter_list) == 1:
+            letter_list = []
+        return "".join(letter_list), (".".join(letter_list) + ".")
+
+    def __get_acronym_ids(self, lower_token_ids, vocabulary):
+        """Returns the acronyms of a mention as a list of one-element tuples
+        of vocabulary IDs. Acronyms, that are no token of the corpus, can not
+        match any mention and are left out."""
+        string_list = [vocabulary.get_token(ID) for ID in lower_token_ids]
+        acronym_ids = []
+        for acronym in self.__get_acronym(string_list):
+            ID = vocabulary.get_id(acronym)
+            if len(acronym) > 1 and ID is not None:
+                acronym_ids.append(tuple((ID,)))
+
+        return acronym_ids
@@ -1,121 +1,193 @@
-from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
-from MultiSievePassCorefResolution.errors import InvalidSieveClassError
-import itertools
-
-
-class CoreferenceChainResolver:
-    """Objects of this class will call individual sieve classes
-    and apply the sieve method on one document object to extract
-    the coreference chains from the given text.
-
-    The multi-pass-sieve approach is a rule-based, that applies
-    independent rules to the referring expressions extracted (mentions)
-    from the document. Each sieve operates on the output of the previous
-    one and each sieve decides for an expression whether it can be
-    resolved or not, and if so, to which cluster it should be assigned.
-    """
-
-    def __init__(self):
-        """
-        data: document object
-        sieve_objects: list of Sieve objects
-        (that inherit from AbstractSieve Class)
-        """
-        self.document_obj = None
-        self.sieve_objects = None
-
-    def resolve(self, document_obj, sieve_objects):
-        self.__verify_input(sieve_objects)
-
-        self.document_obj = document_obj
-        self.sieve_objects = sieve_objects
-
-    @staticmethod
-    def __verify_input(objects):
-        if any([not isinstance(obj, AbstractSieve) for obj in objects]):
-            raise InvalidSieveClassError(
-                'Sieve objects must inherit from AbstractSieveClass.')
-
-    def sieve_mentions(self):
-        """Calls the sieve method that is defined in the abstract class (which
-        expects the abstract method sieve to be implemented). Apply the sieve
-        of each class to the document object, in the order in which the sieves
-        are given in the list.
-
-        :return: sieved_document_obj, where the cluster attribute were
-            manipulated in order to do Coreference Resolution: referring
-            expressions are grouped based on the underlying referent and the
-            deterministic rules applied in the sieve classes methods: All
-            expressions in a cluster refer to the same entity.
-            The clusters in the cluster attribute of the document object
-            representing the coreference chains.
-        """
-
-        for sieve_class in self.sieve_objects:
-            sieved_document_obj = sieve_class.sieve(self.document_obj)
-
-            return sieved_document_obj
-
-    @staticmethod
-    def create_pairwise_combination(lst):
-        """Combines all elements of a list in pairs.
-        :param  lst: (list) [(212, 3, 3), (212, 0, 0)]
-        :return: pair_order_list [((212, 3, 3), (212, 0, 0))]
-        """
-        pairwise_ordered_list = []
-        # if only one or less elements in list
-        if len(lst) < 2:
-            return pairwise_ordered_list
-
-        pairwise_ordered_list = itertools.combinations(lst, 2)
-
-        return list(pairwise_ordered_list)
-
-    def create_transitive_shell(self, lst):
-        """Forms the transitive shell, in which the elements within each cluster
-        are formed into pairs.
-        :param  lst: (list)
-                [[[0, 23, 24], [1, 14, 15]], [[1, 1, 1], [1, 5, 10]]]
-        :return: transitive_shell set of strings
-                {'((0, 23, 24), (1, 14, 15))', '((1, 1, 1), (1, 5, 10))'}
-        """
-        transitive_shell = set()
-
-        for cluster in lst:
-            new_pairs = self.create_pairwise_combination(cluster)  # returns a list
-            for pair in new_pairs:
-                # replace to have the same structure in gold and in result
-                transitive_shell.add(str(pair).replace("[", "(").replace("]", ")"))
-
-        return transitive_shell
-
-    def evaluate(self, gold):
-        """Pairwise F1 is used for evaluation, in which pairs are formed from
-        the mentions within each cluster (transitive shell), which are compared
-        to the pairs of the gold standard. Singleton clusters containing only
-        one mention, are ignored."""
-
-        # gold be like
-        #  [[[0, 23, 24], [1, 14, 15], [4, 29, 30]], [[9, 11, 12], [12, 10, 11]]]
-
-        if len(gold) == 0:
-            return "No gold standard!"
-
-        # transitive shell for gold
-        gold_transitiv_shell = self.create_transitive_shell(gold)
-
-        result = []
-        result_cluster = list(self.document_obj.clusters.values())
-        for cluster in result_cluster:
-            result.append(cluster.get_mentions())
-
-        # transitive shell for result
-        result_transitiv_shell = self.create_transitive_shell(result)
-
-        true_positives = len(gold_transitiv_shell.intersection(result_transitiv_shell))
-        false_negatives = len(gold_transitiv_shell) - true_positives
-        false_positives = len(result_transitiv_shell) - true_positives
-
-        f1_score = true_positives / (true_positives + 0.5 * (false_positives + false_negatives))
-
-        return f1_score
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
+from MultiSievePassCorefResolution.errors import InvalidSieveClassError
+import itertools
+
+
+class CoreferenceChainResolver:
+    """Objects of this class will call individual sieve classes
+    and apply the sieve method on one document object to extract
+    the coreference chains from the given text.
+
+    The multi-pass-sieve approach is a rule-based, that applies
+    independent rules to the referring expressions extracted (mentions)
+    from the document. Each sieve operates on the output of the previous
+    one and each sieve decides for an expression whether it can be
+    resolved or not, and if so, to which cluster it should be assigned.
+    """
+
+    def __init__(self):
+        """
+        data: document object
+        sieve_objects: list of Sieve objects
+        (that inherit from AbstractSieve Class)
+        """
+        self.document_obj = None
+        self.sieve_objects = None
+        self.budget = None
+
+    def resolve(self, document_obj, sieve_objects, budget=None):
+        """budget: SieveBudget or None, limits the time and the candidates
+        the sieves spend on the document"""
+        self.__verify_input(sieve_objects)
+
+        self.document_obj = document_obj
+        self.sieve_objects = sieve_objects
+        self.budget = budget
+
+    @staticmethod
+    def __verify_input(objects):
+        if any([not isinstance(obj, AbstractSieve) for obj in objects]):
+            raise InvalidSieveClassError(
+                'Sieve objects must inherit from AbstractSieveClass.')
+
+    def sieve_mentions(self, sieve_done=None):
+        """Calls the sieve method that is defined in the abstract class (which
+        expects the abstract method sieve to be implemented). Apply the sieve
+        of each class to the document object, in the order in which the sieves
+        are given in the list.
+
+        :return: sieved_document_obj, where the cluster attribute were
+            manipulated in order to do Coreference Resolution: referring
+            expressions are grouped based on the underlying referent and the
+            deterministic rules applied in the sieve classes methods: All
+            expressions in a cluster refer to the same entity.
+            The clusters in the cluster attribute of the document object
+            representing the coreference chains.
+
+        With a budget, the remaining sieves are skipped when the time budget
+        of the document is exceeded and expensive sieves are skipped when it
+        runs short. What was left out is recorded in budget.degradations.
+
+        :param sieve_done: function or None, called with each sieve object
+            after it was applied (e.g. to profile the memory of the sieves)
+        """
+
+        budget = self.budget
+        if budget is not None:
+            budget.start_document()
+
+        sieved_document_obj = self.document_obj
+        for sieve_class in self.sieve_objects:
+            if budget is not None:
+                sieve_name = type(sieve_class).__name__
+                if budget.is_document_exceeded():
+                    budget.add_degradation(f"{sieve_name}: skipped, document "
+                                           f"time budget exceeded")
+                    continue
+                if sieve_class.expensive and budget.should_skip_expensive():
+                    budget.add_degradation(f"{sieve_name}: skipped, document "
+                                           f"time budget running short")
+                    continue
+                budget.start_sieve()
+
+            sieved_document_obj = sieve_class.sieve(sieved_document_obj,
+                                                     budget)
+            if sieve_done is not None:
+                sieve_done(sieve_class)
+
+        return sieved_document_obj
+
+    @staticmethod
+    def create_pairwise_combination(lst):
+        """Combines all elements of a list in pairs.
+        :param  lst: (list) [(212, 3, 3), (212, 0, 0)]
+        :return: pair_order_list [((212, 3, 3), (212, 0, 0))]
+        """
+        pairwise_ordered_list = []
+        # if only one or less elements in list
+        if len(lst) < 2:
+            return pairwise_ordered_list
+
+        pairwise_ordered_list = itertools.combinations(lst, 2)
+
+        return list(pairwise_ordered_list)
+
+    def create_transitive_shell(self, lst):
+        """Forms the transitive shell, in which the elements within each cluster
+        are formed into pairs.
+        :param  lst: (list)
+                [[[0, 23, 24], [1, 14, 15]], [[1, 1, 1], [1, 5, 10]]]
+        :return: transitive_shell set of strings
+                {'((0, 23, 24), (1, 14, 15))', '((1, 1, 1), (1, 5, 10))'}
+        """
+        transitive_shell = set()
+
+        for cluster in lst:
+            new_pairs = self.create_pairwise_combination(cluster)  # returns a list
+            for pair in new_pairs:
+                # replace to have the same structure in gold and in result
+                transitive_shell.add(str(pair).replace("[", "(").replace("]", ")"))
+
+        return transitive_shell
+
+    def count_pairs(self, gold):
+        """Counts the true positive, false positive and false negative pairs
+        of the transitive shells of the result clusters and the gold standard.
+        The counts can be summed up over documents to get corpus scores.
+
+        :param  gold: (list)
+                [[[0, 23, 24], [1, 14, 15], [4, 29, 30]], [[9, 11, 12]]]
+        :return: tuple(true_positives, false_positives, false_negatives)
+        """
+        # transitive shell for gold
+        gold_transitiv_shell = self.create_transitive_shell(gold)
+
+        result = []
+        result_cluster = list(self.document_obj.clusters.values())
+        for cluster in result_cluster:
+            result.append(cluster.get_mentions())
+
+        # transitive shell for result
+        result_transitiv_shell = self.create_transitive_shell(result)
+
+        true_positives = len(gold_transitiv_shell.intersection(result_transitiv_shell))
+        false_negatives = len(gold_transitiv_shell) - true_positives
+        false_positives = len(result_transitiv_shell) - true_positives
+
+        return true_positives, false_positives, false_negatives
+
+    @staticmethod
+    def f1_from_counts(true_positives, false_positives, false_negatives):
+        """Calculates the f1-score from (summed up) pair counts.
+        Returns 0.0 if there is no pair at all."""
+        denominator = true_positives + 0.5 * (false_positives + false_negatives)
+        if denominator == 0:
+            return 0.0
+
+        return true_positives / denominator
+
+    @classmethod
+    def scores_from_counts(cls, true_positives, false_positives,
+                           false_negatives):
+        """Returns (precision, recall, f1) of (summed up) pair counts."""
+        precision = 0.0
+        if true_positives + false_positives > 0:
+            precision = true_positives / (true_positives + false_positives)
+
+        recall = 0.0
+        if true_positives + false_negatives > 0:
+            recall = true_positives / (true_positives + false_negatives)
+
+        f1_score = cls.f1_from_counts(true_positives, false_positives,
+                                      false_negatives)
+
+        return precision, recall, f1_score
+
+    def evaluate(self, gold):
+        """Pairwise F1 is used for evaluation, in which pairs are formed from
+        the mentions within each cluster (transitive shell), which are compared
+        to the pairs of the gold standard. Singleton clusters containing only
+        one mention, are ignored."""
+
+        # gold be like
+        #  [[[0, 23, 24], [1, 14, 15], [4, 29, 30]], [[9, 11, 12], [12, 10, 11]]]
+
+        if len(gold) == 0:
+            return "No gold standard!"
+
+        true_positives, false_positives, false_negatives = \
+            self.count_pairs(gold)
+
+        f1_score = true_positives / (true_positives + 0.5 * (false_positives + false_negatives))
+
+        return f1_score
@@ -0,0 +1,252 @@
+# The standard coreference metrics MUC, B-cubed and CEAF-e and their average
+# (the CoNLL score), computed from a sparse overlap table of the key (gold)
+# and the response clusters instead of enumerating mention pairs. Every
+# metric of a document is given as counts
+#   [precision numerator, precision denominator,
+#    recall numerator, recall denominator],
+# which are summed up over the documents to get the corpus scores.
+from collections import defaultdict
+
+METRICS = ("muc", "bcub", "ceafe")
+# all scores of a document: the pairwise score, the METRICS and the CoNLL
+# score (their average f1)
+ALL_METRICS = ("pairwise",) + METRICS + ("conll",)
+
+
+class OverlapTable:
+    """
+    self.key_sizes: list of the number of mentions of every key cluster
+    self.response_sizes: list of the number of mentions of every response
+        cluster
+    self.overlaps: dict (key cluster index, response cluster index) ->
+        number of mentions both clusters have, only for clusters that
+        share a mention
+
+    Built in one pass over the mentions, the metrics only use the table.
+    """
+
+    def __init__(self, key, response):
+        """key, response: list of clusters, each a list of mentions like
+        [[(0, 23, 24), (1, 14, 15)], [[9, 11, 12], [12, 10, 11]]]"""
+        key = [set(map(tuple, cluster)) for cluster in key]
+        response = [set(map(tuple, cluster)) for cluster in response]
+        self.key_sizes = [len(cluster) for cluster in key]
+        self.response_sizes = [len(cluster) for cluster in response]
+
+        response_of_mention = {}
+        for response_idx, cluster in enumerate(response):
+            for mention in cluster:
+                response_of_mention[mention] = response_idx
+
+        self.overlaps = defaultdict(int)
+        for key_idx, cluster in enumerate(key):
+            for mention in cluster:
+                response_idx = response_of_mention.get(mention)
+                if response_idx is not None:
+                    self.overlaps[key_idx, response_idx] += 1
+
+    def get_muc_counts(self):
+        """MUC (Vilain et al., 1995): the links needed to join the partitions
+        of every key cluster by the response clusters, and vice versa for the
+        precision. A mention of a cluster that is missing on the other side
+        is a partition of its own."""
+        key_partitions = [0] * len(self.key_sizes)
+        key_covered = [0] * len(self.key_sizes)
+        response_partitions = [0] * len(self.response_sizes)
+        response_covered = [0] * len(self.response_sizes)
+        for (key_idx, response_idx), count in self.overlaps.items():
+            key_partitions[key_idx] += 1
+            key_covered[key_idx] += count
+            response_partitions[response_idx] += 1
+            response_covered[response_idx] += count
+
+        # size - (partitions + uncovered mentions) links of every cluster
+        recall_numerator = sum(covered - partitions for covered, partitions
+                               in zip(key_covered, key_partitions))
+        precision_numerator = sum(
+            covered - partitions for covered, partitions
+            in zip(response_covered, response_partitions))
+
+        return [precision_numerator,
+                sum(size - 1 for size in self.response_sizes if size > 0),
+                recall_numerator,
+                sum(size - 1 for size in self.key_sizes if size > 0)]
+
+    def get_b_cubed_counts(self):
+        """B-cubed (Bagga and Baldwin, 1998): the share of the cluster of a
+        mention, that is in the cluster of the mention on the other side,
+        summed up over the mentions."""
+        precision_numerator = 0.0
+        recall_numerator = 0.0
+        for (key_idx, response_idx), count in self.overlaps.items():
+            precision_numerator += count * count \
+                / self.response_sizes[response_idx]
+            recall_numerator += count * count / self.key_sizes[key_idx]
+
+        return [precision_numerator, sum(self.response_sizes),
+                recall_numerator, sum(self.key_sizes)]
+
+    def get_ceafe_counts(self):
+        """Entity based CEAF (Luo, 2005): the similarity
+        2 * |K & R| / (|K| + |R|) of the best one to one assignment of the
+        key and response clusters. Only clusters that share mentions can be
+        assigned, so every connected component of the overlap table is
+        assigned on its own."""
+        similarity = 0.0
+        for component in self.__get_components():
+            key_indices = sorted({key_idx for key_idx, _ in component})
+            response_indices = sorted({response_idx for _, response_idx
+                                       in component})
+            weights = [[0.0] * len(response_indices) for _ in key_indices]
+            key_positions = {idx: i for i, idx in enumerate(key_indices)}
+            response_positions = {idx: i for i, idx
+                                  in enumerate(response_indices)}
+            for key_idx, response_idx in component:
+                weights[key_positions[key_idx]][
+                    response_positions[response_idx]] = \
+                    2 * self.overlaps[key_idx, response_idx] \
+                    / (self.key_sizes[key_idx]
+                       + self.response_sizes[response_idx])
+
+            similarity += sum(weights[row][column] for row, column
+                              in get_max_assignment(weights))
+
+        return [similarity, len(self.response_sizes),
+                similarity, len(self.key_sizes)]
+
+    def __get_components(self):
+        """Returns the connected components of the overlap table as lists of
+        (key cluster index, response cluster index), with union find over
+        the clusters (response clusters after the key clusters)."""
+        parents = list(range(len(self.key_sizes) + len(self.response_sizes)))
+
+        def find(node):
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        offset = len(self.key_sizes)
+        for key_idx, response_idx in self.overlaps:
+            parents[find(key_idx)] = find(offset + response_idx)
+
+        components = defaultdict(list)
+        for key_idx, response_idx in self.overlaps:
+            components[find(key_idx)].append((key_idx, response_idx))
+
+        return list(components.values())
+
+    def get_metric_counts(self):
+        """Returns a dict metric name -> counts of all METRICS."""
+        return {"muc": self.get_muc_counts(),
+                "bcub": self.get_b_cubed_counts(),
+                "ceafe": self.get_ceafe_counts()}
+
+
+def get_max_assignment(weights):
+    """Returns the one to one assignment of the rows to the columns of a
+    weight matrix (list of lists) with the maximal sum of weights, as a list
+    of (row, column). Hungarian method with potentials, O(n^2 * m) for n
+    rows and m columns. If there are more rows than columns, the matrix is
+    transposed."""
+    if not weights or not weights[0]:
+        return []
+    if len(weights) > len(weights[0]):
+        return [(row, column) for column, row
+                in get_max_assignment([list(column)
+                                       for column in zip(*weights)])]
+
+    rows = len(weights)
+    columns = len(weights[0])
+    infinity = float('inf')
+    # minimises the costs -weights, index 0 is a virtual row and column
+    row_potentials = [0.0] * (rows + 1)
+    column_potentials = [0.0] * (columns + 1)
+    row_of_column = [0] * (columns + 1)
+    previous_column = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        column = 0
+        min_reduced = [infinity] * (columns + 1)
+        used = [False] * (columns + 1)
+        while row_of_column[column] != 0:
+            used[column] = True
+            current_row = row_of_column[column]
+            delta = infinity
+            next_column = 0
+            for candidate in range(1, columns + 1):
+                if used[candidate]:
+                    continue
+                reduced = -weights[current_row - 1][candidate - 1] \
+                    - row_potentials[current_row] \
+                    - column_potentials[candidate]
+                if reduced < min_reduced[candidate]:
+                    min_reduced[candidate] = reduced
+                    previous_column[candidate] = column
+                if min_reduced[candidate] < delta:
+                    delta = min_reduced[candidate]
+                    next_column = candidate
+            for candidate in range(columns + 1):
+                if used[candidate]:
+                    row_potentials[row_of_column[candidate]] += delta
+                    column_potentials[candidate] -= delta
+                else:
+                    min_reduced[candidate] -= delta
+            column = next_column
+        # augmenting path back to the virtual column
+        while column != 0:
+            row_of_column[column] = row_of_column[previous_column[column]]
+            column = previous_column[column]
+
+    return [(row_of_column[column] - 1, column - 1)
+            for column in range(1, columns + 1) if row_of_column[column] != 0]
+
+
+def get_metric_counts(key, response):
+    """Returns a dict metric name -> counts of the METRICS of one document,
+    key and response are lists of clusters (see OverlapTable)."""
+    return OverlapTable(key, response).get_metric_counts()
+
+
+def sum_metric_counts(metric_counts_list):
+    """Sums up the metric counts (dicts metric name -> counts) of
+    documents."""
+    summed = {metric: [0, 0, 0, 0] for metric in METRICS}
+    for metric_counts in metric_counts_list:
+        for metric, counts in metric_counts.items():
+            summed[metric] = [total + count for total, count
+                              in zip(summed[metric], counts)]
+
+    return summed
+
+
+def scores_from_metric_counts(counts):
+    """Returns (precision, recall, f1) of the (summed up) counts of a
+    metric. A score without denominator is 0.0."""
+    precision_numerator, precision_denominator, recall_numerator, \
+        recall_denominator = counts
+    precision = precision_numerator / precision_denominator \
+        if precision_denominator > 0 else 0.0
+    recall = recall_numerator / recall_denominator \
+        if recall_denominator > 0 else 0.0
+    f1_score = 2 * precision * recall / (precision + recall) \
+        if precision + recall > 0 else 0.0
+
+    return precision, recall, f1_score
+
+
+def get_metric_scores(metric_counts):
+    """Returns the scores of metric counts (dict metric name -> counts) as
+    a dict metric name -> {"precision", "recall", "f1", "counts"} and the
+    CoNLL score, the average f1 of the METRICS."""
+    scores = {}
+    for metric in METRICS:
+        precision, recall, f1_score = scores_from_metric_counts(
+            metric_counts[metric])
+        scores[metric] = {"precision": precision, "recall": recall,
+                          "f1": f1_score,
+                          "counts": list(metric_counts[metric])}
+
+    conll_f1 = sum(scores[metric]["f1"] for metric in METRICS) / len(METRICS)
+
+    return scores, conll_f1
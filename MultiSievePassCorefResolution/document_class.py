@@ -1,174 +1,313 @@
-# This is a class which bundles all attributes of a document together.
-# By definition, a read-in file corresponds to a document object.
-from MultiSievePassCorefResolution.cluster_class import Cluster
-from MultiSievePassCorefResolution.mention_class import Mention
-from collections import OrderedDict
-
-
-class Document:
-    """
-    self.mentions: dict of mention objects
-        - keys are the (sent_num, span_start, span_end)
-    self.sentences: list of sentence objects
-    self.clusters: dict of cluster objects
-        - keys are cluster_ID (int)
-    self.gold: list of lists
-        - [[[0, 23, 24], [1, 14, 15], [4, 29, 30]], [[9, 11, 12]]]
-    """
-    def __init__(self, path, sentences, gold):
-        self.path = path
-        self.mentions = OrderedDict()
-        self.sentences = sentences
-        self.clusters = {}
-        self.gold = gold
-
-    def extract_mentions(self):
-        """Instantiate the mention objects from the list of sentence objects and
-        initialize the cluster objects."""
-        ID = 0
-        for count, sent_obj in enumerate(self.sentences):
-            for mention in sent_obj.mentions:
-                # mention =
-                # [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
-                mention_token_list = mention[0]
-                span_start = mention[1][0]
-                span_end = mention[1][1]
-                sent_num_span = (count, span_start, span_end)
-                info = mention[2]
-
-                # instantiate mention object
-                new_mention = Mention(ID, sent_num_span, mention_token_list, info)
-                self.mentions[sent_num_span] = new_mention
-
-                # instantiate cluster object
-                # (ID, information, head_mention_span, head_mention)
-                new_cluster = (ID, info, sent_num_span, mention_token_list)
-                self.__initialize_cluster(new_cluster)
-                ID += 1
-
-    def __initialize_cluster(self, new_cluster):
-        """Instantiate a new Cluster object and add to cluster dict."""
-        ID = new_cluster[0]
-        info = new_cluster[1]
-        head_mention_span = new_cluster[2]
-        mention_token_list = new_cluster[3]
-        new_cluster = Cluster(ID, info, head_mention_span, mention_token_list)
-
-        self.clusters[ID] = new_cluster
-
-    def get_candidates(self, mention, left_to_right_traversal):
-        """
-        Extracts the potential coreference candidates for a mention based on
-        the syntactic structure:
-
-        1. In the same sentence:
-            - Candidates in the same sentence are sorted based on left-to-right
-            breadth-first traversal of the syntax tree.
-
-        2. In the previous sentence:
-            - Nominal Mentions: candidates are sorted based on right-to-left-
-            Breadth-first traversal (right-to-left breadth-first traversal) of
-            the syntax tree.
-
-            - Pronominal Mentions: Candidates are sorted based on left-to-left
-            breadth-first traversal of the left-to-right breadth-first traversal
-            of the syntax tree.
-
-        :param  mention: mention object
-                left_to_right_traversal: bool
-        :return: candidates: list of mention objects
-        """
-        candidates = []  # list of mention objects
-
-        # candidates from same sentence
-        # get the sentence number of the sentence in which the mention occurs
-        act_sent_num = mention.get_actual_sentence_num()
-        akt_sent_ordered_candidates = self.sentences[act_sent_num].levelorder(
-            left_to_right_traversal)  # [[(0, 1)], [(3, 4)], [(6, 8)], [(9, 12)]]
-
-        # get mention span to check, if candidates from same sentence
-        # are reasonable, e.g. syntactically before the mention
-        mention_span = mention.get_span()
-
-        # get mention objects
-        candidates_akt_sent = self.__fetch_candidates(act_sent_num,
-                                                      akt_sent_ordered_candidates,
-                                                      mention_span)
-        candidates.extend(candidates_akt_sent)
-
-        # candidates from previous sentence
-        # get the sentence number of the previous sentence
-        prev_sent_num = mention.get_previous_sentence_num()
-
-        # if there is no previous sentence
-        if prev_sent_num < 0:
-            candidates_prev_sent = []
-
-        else:
-            prev_sent_ordered_candidates = \
-                self.sentences[prev_sent_num].levelorder(left_to_right_traversal)
-            candidates_prev_sent = \
-                self.__fetch_candidates(prev_sent_num, prev_sent_ordered_candidates)
-
-        candidates.extend(candidates_prev_sent)
-
-        return candidates
-
-    def __fetch_candidates(self, sent_num, list_of_spans, mention_span=None):
-        """Retrieves the potential candidates from a sentence.
-        So all mention objects from the sentence object."""
-        mention_objects = []
-
-        for elem in list_of_spans:
-            new_candidate = self.mentions[(sent_num, elem[0][0], elem[0][1])]
-            if mention_span:
-                # filter out only the candidates from the same sentence
-                # that were syntactically realized before the mention:
-                if new_candidate.get_span() > mention_span:
-                    mention_objects.append(new_candidate)
-            else:
-                mention_objects.append(new_candidate)
-
-        return mention_objects
-
-    def unify_clusters(self, mention, candidate):
-        """Unifies two clusters and updates the cluster dict."""
-        # get the ID's
-        mention_cluster_ID = mention.cluster_ID
-        candidate_cluster_ID = candidate.cluster_ID
-        if candidate_cluster_ID not in self.clusters:
-            return
-
-        if mention_cluster_ID not in self.clusters:
-            return
-
-        # get the two clusters
-        mention_cluster = self.clusters[mention_cluster_ID]
-        candidate_cluster = self.clusters[candidate_cluster_ID]
-
-        # integrate mentions from mention_cluster to candidate_candidates
-        candidate_cluster.add_mentions(mention_cluster.get_mentions())
-
-        # update the cluster dict
-        self.__update_cluster_map(mention_cluster_ID)
-
-    def __update_cluster_map(self, mention_cluster_ID):
-        """Deletes a cluster from the map that has been unified
-        into another cluster."""
-        self.clusters.pop(mention_cluster_ID)
-
-    def get_clusters(self):
-        """Returns the clusters as a list of lists."""
-        return self.clusters.values()
-
-    def get_relevant_clusters(self, more_than=1):
-        """Returns the relevant clusters as a list of lists.
-        more_than is default by 1."""
-        relevant_clusters = []
-        clusters = list(self.get_clusters())
-        for cluster in clusters:
-            if len(cluster.mentions) > more_than:
-                relevant_clusters.append(cluster.mentions)
-        return relevant_clusters
-
-
+# This is a class which bundles all attributes of a document together.
+# By definition, a read-in file corresponds to a document object.
+from MultiSievePassCorefResolution.cluster_class import Cluster
+from MultiSievePassCorefResolution.mention_class import Mention
+from MultiSievePassCorefResolution.mention_features import MentionFeatures
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+from collections import OrderedDict
+
+import numpy as np
+
+
+class Document:
+    """
+    self.mentions: dict of mention objects
+        - keys are the (sent_num, span_start, span_end)
+    self.sentences: list of sentence objects
+    self.clusters: dict of cluster objects
+        - keys are cluster_ID (int)
+    self.gold: list of lists
+        - [[[0, 23, 24], [1, 14, 15], [4, 29, 30]], [[9, 11, 12]]]
+    self.vocabulary: Vocabulary object, usually shared by the whole corpus
+    self.merged_mentions: int, number of NPs merged into a mention with the
+        same span during extract_mentions (see get_mention_stats)
+
+    The cluster state can be saved with snapshot_clusters() and set back with
+    restore_clusters(). Instead of copying the clusters, every unification
+    after the first snapshot is written to a log, which is undone on restore.
+    """
+    def __init__(self, path, sentences, gold, vocabulary=None):
+        self.path = path
+        self.mentions = OrderedDict()
+        self.sentences = sentences
+        self.clusters = {}
+        self.gold = gold
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        self.vocabulary = vocabulary
+        self.merged_mentions = 0
+        # list of (merged cluster, ID of receiving cluster, its former length)
+        # None as long as no snapshot has been taken
+        self.__cluster_log = None
+        # built on first use, see get_mention_features and get_candidate_rows
+        self.__mention_features = None
+        self.__sentence_rows = {}
+
+    def extract_mentions(self):
+        """Instantiate the mention objects from the list of sentence objects and
+        initialize the cluster objects. Every span gives one mention and one
+        cluster, NPs with the same span are counted as merged."""
+        self.__cluster_log = None
+        self.__mention_features = None
+        self.__sentence_rows = {}
+        self.merged_mentions = 0
+        ID = 0
+        for count, sent_obj in enumerate(self.sentences):
+            self.merged_mentions += sent_obj.merged_mentions
+            for mention in sent_obj.mentions:
+                # mention =
+                # [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
+                mention_token_list = mention[0]
+                span_start = mention[1][0]
+                span_end = mention[1][1]
+                sent_num_span = (count, span_start, span_end)
+                # no second mention and (orphan) cluster for the same span
+                if sent_num_span in self.mentions:
+                    self.merged_mentions += 1
+                    continue
+                info = mention[2]
+                token_ids = self.vocabulary.get_ids(mention_token_list)
+                lower_token_ids = self.vocabulary.get_lower_ids(token_ids)
+
+                # instantiate mention object
+                new_mention = Mention(ID, sent_num_span, mention_token_list,
+                                      info, token_ids, lower_token_ids)
+                self.mentions[sent_num_span] = new_mention
+
+                # instantiate cluster object
+                # (ID, information, head_mention_span, head_mention)
+                new_cluster = (ID, info, sent_num_span, mention_token_list)
+                self.__initialize_cluster(new_cluster)
+                ID += 1
+
+        # rows of the mentions in mention tables, e.g. of the sieve pre-filters
+        for table_idx, mention in enumerate(self.mentions.values()):
+            mention.table_idx = table_idx
+
+    def get_mention_stats(self):
+        """Returns a dict with the number of noun phrases of the document,
+        the mentions extracted from them and the merged noun phrases."""
+        return {"noun_phrases": len(self.mentions) + self.merged_mentions,
+                "mentions": len(self.mentions),
+                "merged": self.merged_mentions}
+
+    def __initialize_cluster(self, new_cluster):
+        """Instantiate a new Cluster object and add to cluster dict."""
+        ID = new_cluster[0]
+        info = new_cluster[1]
+        head_mention_span = new_cluster[2]
+        mention_token_list = new_cluster[3]
+        new_cluster = Cluster(ID, info, head_mention_span, mention_token_list)
+
+        self.clusters[ID] = new_cluster
+
+    def get_candidates(self, mention, left_to_right_traversal):
+        """
+        Extracts the potential coreference candidates for a mention based on
+        the syntactic structure:
+
+        1. In the same sentence:
+            - Candidates in the same sentence are sorted based on left-to-right
+            breadth-first traversal of the syntax tree.
+
+        2. In the previous sentence:
+            - Nominal Mentions: candidates are sorted based on right-to-left-
+            Breadth-first traversal (right-to-left breadth-first traversal) of
+            the syntax tree.
+
+            - Pronominal Mentions: Candidates are sorted based on left-to-left
+            breadth-first traversal of the left-to-right breadth-first traversal
+            of the syntax tree.
+
+        :param  mention: mention object
+                left_to_right_traversal: bool
+        :return: candidates: list of mention objects
+        """
+        candidates = []  # list of mention objects
+
+        # candidates from same sentence
+        # get the sentence number of the sentence in which the mention occurs
+        act_sent_num = mention.get_actual_sentence_num()
+        akt_sent_ordered_candidates = self.sentences[act_sent_num].levelorder(
+            left_to_right_traversal)  # [[(0, 1)], [(3, 4)], [(6, 8)], [(9, 12)]]
+
+        # get mention span to check, if candidates from same sentence
+        # are reasonable, e.g. syntactically before the mention
+        mention_span = mention.get_span()
+
+        # get mention objects
+        candidates_akt_sent = self.__fetch_candidates(act_sent_num,
+                                                      akt_sent_ordered_candidates,
+                                                      mention_span)
+        candidates.extend(candidates_akt_sent)
+
+        # candidates from previous sentence
+        # get the sentence number of the previous sentence
+        prev_sent_num = mention.get_previous_sentence_num()
+
+        # if there is no previous sentence
+        if prev_sent_num < 0:
+            candidates_prev_sent = []
+
+        else:
+            prev_sent_ordered_candidates = \
+                self.sentences[prev_sent_num].levelorder(left_to_right_traversal)
+            candidates_prev_sent = \
+                self.__fetch_candidates(prev_sent_num, prev_sent_ordered_candidates)
+
+        candidates.extend(candidates_prev_sent)
+
+        return candidates
+
+    def get_mention_features(self):
+        """Returns the MentionFeatures of the mentions, built on first use."""
+        if self.__mention_features is None:
+            self.__mention_features = MentionFeatures(self)
+
+        return self.__mention_features
+
+    def get_candidate_rows(self, mention, left_to_right_traversal):
+        """Returns the candidates of get_candidates as a numpy array of their
+        rows (mention.table_idx), in the same order. The candidates of every
+        sentence are collected once and the candidates of the same sentence
+        are selected with one comparison of the spans."""
+        act_sent_num = mention.get_actual_sentence_num()
+        rows, starts, ends = self.__get_sentence_rows(act_sent_num,
+                                                      left_to_right_traversal)
+
+        # candidates with a span greater than the span of the mention,
+        # like in __fetch_candidates
+        span_start, span_end = mention.get_span()
+        rows = rows[(starts > span_start)
+                    | ((starts == span_start) & (ends > span_end))]
+
+        prev_sent_num = mention.get_previous_sentence_num()
+        if prev_sent_num < 0:
+            return rows
+
+        prev_rows = self.__get_sentence_rows(prev_sent_num,
+                                             left_to_right_traversal)[0]
+        return np.concatenate((rows, prev_rows))
+
+    def __get_sentence_rows(self, sent_num, left_to_right_traversal):
+        """Returns the rows, span starts and span ends of the mentions of a
+        sentence in the order of the traversal, as numpy arrays."""
+        key = tuple((sent_num, left_to_right_traversal))
+        if key not in self.__sentence_rows:
+            spans = [elem[0] for elem in self.sentences[sent_num].levelorder(
+                left_to_right_traversal)]
+            rows = [self.mentions[(sent_num, span[0], span[1])].table_idx
+                    for span in spans]
+            self.__sentence_rows[key] = tuple((
+                np.array(rows, dtype=np.int64),
+                np.array([span[0] for span in spans], dtype=np.int64),
+                np.array([span[1] for span in spans], dtype=np.int64)))
+
+        return self.__sentence_rows[key]
+
+    def __fetch_candidates(self, sent_num, list_of_spans, mention_span=None):
+        """Retrieves the potential candidates from a sentence.
+        So all mention objects from the sentence object."""
+        mention_objects = []
+
+        for elem in list_of_spans:
+            new_candidate = self.mentions[(sent_num, elem[0][0], elem[0][1])]
+            if mention_span:
+                # filter out only the candidates from the same sentence
+                # that were syntactically realized before the mention:
+                if new_candidate.get_span() > mention_span:
+                    mention_objects.append(new_candidate)
+            else:
+                mention_objects.append(new_candidate)
+
+        return mention_objects
+
+    def unify_clusters(self, mention, candidate):
+        """Unifies two clusters and updates the cluster dict."""
+        # get the ID's
+        mention_cluster_ID = mention.cluster_ID
+        candidate_cluster_ID = candidate.cluster_ID
+        if candidate_cluster_ID not in self.clusters:
+            return
+
+        if mention_cluster_ID not in self.clusters:
+            return
+
+        # get the two clusters
+        mention_cluster = self.clusters[mention_cluster_ID]
+        candidate_cluster = self.clusters[candidate_cluster_ID]
+
+        # remember the unification, so that it can be undone
+        if self.__cluster_log is not None:
+            self.__cluster_log.append(tuple((mention_cluster,
+                                             candidate_cluster_ID,
+                                             len(candidate_cluster.mentions))))
+
+        # integrate mentions from mention_cluster to candidate_candidates
+        candidate_cluster.add_mentions(mention_cluster.get_mentions())
+
+        # update the cluster dict
+        self.__update_cluster_map(mention_cluster_ID)
+
+    def __update_cluster_map(self, mention_cluster_ID):
+        """Deletes a cluster from the map that has been unified
+        into another cluster."""
+        self.clusters.pop(mention_cluster_ID)
+
+    def snapshot_clusters(self):
+        """Saves the current cluster state in O(1) and returns a snapshot (int),
+        that can be passed to restore_clusters(). Snapshots are positions in
+        the log of unifications: restoring a snapshot invalidates all
+        snapshots taken after it."""
+        if self.__cluster_log is None:
+            self.__cluster_log = []
+
+        return len(self.__cluster_log)
+
+    def restore_clusters(self, snapshot):
+        """Sets the clusters back to the state of a snapshot by undoing the
+        unifications since then, latest first. Mention lists are shortened in
+        place and merged clusters are put back, nothing is copied.
+        Raises a ValueError for an unknown or invalidated snapshot."""
+        if self.__cluster_log is None or snapshot > len(self.__cluster_log):
+            raise ValueError(f"Invalid cluster snapshot: {snapshot}")
+
+        reinserted = False
+        while len(self.__cluster_log) > snapshot:
+            mention_cluster, candidate_cluster_ID, length = \
+                self.__cluster_log.pop()
+            del self.clusters[candidate_cluster_ID].mentions[length:]
+            self.clusters[mention_cluster.ID] = mention_cluster
+            reinserted = True
+
+        # the IDs are given in ascending order, so sorting by ID brings
+        # back the original order of the cluster dict
+        if reinserted:
+            self.clusters = {ID: self.clusters[ID]
+                             for ID in sorted(self.clusters)}
+
+    def get_cluster_changes(self, snapshot):
+        """Returns the unifications since a snapshot, e.g. those of one sieve,
+        as a list of tuples (ID of merged cluster, ID of receiving cluster)."""
+        if self.__cluster_log is None or snapshot > len(self.__cluster_log):
+            raise ValueError(f"Invalid cluster snapshot: {snapshot}")
+
+        return [tuple((mention_cluster.ID, candidate_cluster_ID))
+                for mention_cluster, candidate_cluster_ID, _
+                in self.__cluster_log[snapshot:]]
+
+    def get_clusters(self):
+        """Returns the clusters as a list of lists."""
+        return self.clusters.values()
+
+    def get_relevant_clusters(self, more_than=1):
+        """Returns the relevant clusters as a list of lists.
+        more_than is default by 1."""
+        relevant_clusters = []
+        clusters = list(self.get_clusters())
+        for cluster in clusters:
+            if len(cluster.mentions) > more_than:
+                relevant_clusters.append(cluster.mentions)
+        return relevant_clusters
+
+
@@ -1,2 +1,6 @@
-class InvalidSieveClassError(Exception):
-    pass
+class InvalidSieveClassError(Exception):
+    pass
+
+
+class UnknownSieveError(Exception):
+    pass
@@ -0,0 +1,91 @@
+# This is a class which holds features of all mentions of a document as numpy
+# columns (one row per mention, see mention.table_idx). The sieves compare a
+# mention with a whole candidate window at once, e.g. number agreement or
+# string equality, instead of calling is_compatible() for every pair.
+import numpy as np
+
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class \
+    import AbstractSieve
+
+
+class MentionFeatures:
+    """
+    self.mentions: list of the mention objects, index = mention.table_idx
+    self.vocabulary: Vocabulary object of the document
+    self.columns: dict, name -> numpy array with one row per mention
+
+    The columns are built when a sieve asks for them the first time. Keys
+    (e.g. lower cased tokens or acronyms) are encoded as integers with one
+    code table for all columns, so that keys of different columns can be
+    compared. The cluster IDs of the mentions are set in extract_mentions and
+    do not change during sieving, so they can be stored as a column, too.
+    """
+
+    def __init__(self, document_obj):
+        self.mentions = list(document_obj.mentions.values())
+        self.vocabulary = document_obj.vocabulary
+        self.columns = {}
+        self.__codes = {}
+
+    def get_flag_column(self, name, predicate):
+        """Returns a bool column with predicate(mention) for every mention."""
+        if name not in self.columns:
+            self.columns[name] = np.fromiter(
+                (predicate(mention) for mention in self.mentions),
+                dtype=bool, count=len(self.mentions))
+
+        return self.columns[name]
+
+    def get_value_column(self, name, function):
+        """Returns an int column with function(mention) for every mention."""
+        if name not in self.columns:
+            self.columns[name] = np.fromiter(
+                (function(mention) for mention in self.mentions),
+                dtype=np.int64, count=len(self.mentions))
+
+        return self.columns[name]
+
+    def get_code_column(self, name, keys_function, width=1):
+        """Returns an int column (mentions x width) with the codes of the
+        hashable keys returned by keys_function(mention), at most width keys
+        per mention, missing keys are -1."""
+        if name not in self.columns:
+            column = np.full((len(self.mentions), width), -1, dtype=np.int64)
+            for row, mention in enumerate(self.mentions):
+                for i, key in enumerate(keys_function(mention)[:width]):
+                    column[row, i] = self.__codes.setdefault(key,
+                                                             len(self.__codes))
+            self.columns[name] = column
+
+        return self.columns[name]
+
+    def get_string_codes(self):
+        """Codes of the lower cased tokens of the mentions."""
+        return self.get_code_column(
+            "lower_tokens", lambda mention: [mention.lower_token_ids])[:, 0]
+
+    def get_plural(self):
+        return self.get_flag_column("plural",
+                                    lambda mention: mention.is_plural())
+
+    def get_pronoun(self):
+        return self.get_flag_column("pronoun",
+                                    lambda mention: mention.is_pronoun())
+
+    def get_nominal(self):
+        return self.get_flag_column("nominal",
+                                    lambda mention: mention.is_nominal())
+
+    def get_pruned(self):
+        return self.get_flag_column("pruned", AbstractSieve._search_pruning)
+
+    def get_cluster_IDs(self):
+        return self.get_value_column("cluster_ID",
+                                     lambda mention: mention.cluster_ID)
+
+    def get_sentence_distance(self, row, candidate_rows):
+        """Returns the number of sentences between a mention and its
+        candidates."""
+        sentences = self.get_value_column(
+            "sentence", lambda mention: mention.sent_num_span[0])
+        return sentences[row] - sentences[candidate_rows]
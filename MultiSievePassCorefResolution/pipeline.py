@@ -0,0 +1,193 @@
+# An in-process API to resolve the coreference chains of documents without
+# files: a Pipeline is configured once with its sieves and resolves CoNLL
+# text, sentences of token tuples or Document objects. The sieves have no
+# state, so the same sieve objects are used for all documents and threads.
+from collections import deque
+from concurrent.futures.thread import ThreadPoolExecutor
+import io
+import threading
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+from MultiSievePassCorefResolution.coreference_metrics import \
+    get_metric_counts, get_metric_scores
+from MultiSievePassCorefResolution.document_class import Document
+from MultiSievePassCorefResolution.sieve_budget import SieveBudget
+from MultiSievePassCorefResolution.sieve_registry import DEFAULT_SIEVES, \
+    create_sieves, get_requirements, parse_sieve_names
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+
+MENTION_MODES = ("parse", "gold")
+
+
+class Pipeline:
+    """
+    self.sieve_names: list of the names of the sieves (see sieve_registry)
+    self.sieve_objects: list of the sieve objects, used for all documents
+    self.requirements: set of the structures the sieves need
+    self.gold_mentions: bool, the mentions are the gold spans instead of the
+        NPs of the parse trees
+    self.budget_limits: dict with the arguments of a SieveBudget or None,
+        every document gets its own budget with these limits
+    self.vocabulary: Vocabulary shared by all documents or None, then every
+        source gets a new one (so that it does not grow in a long running
+        service)
+
+    Usage:
+        pipeline = Pipeline(["exact", "pronoun"])
+        results = pipeline.resolve(conll_text)
+        results[0]["clusters"]  # [[(0, 1, 2), (3, 0, 0)], ...]
+    """
+
+    def __init__(self, sieves=None, mentions="parse", budget_limits=None,
+                 vocabulary=None):
+        """sieves: list of sieve names or a comma separated str, default:
+        DEFAULT_SIEVES. Raises an UnknownSieveError for an unknown sieve and
+        a ValueError for an unknown mention mode."""
+        if sieves is None:
+            sieves = DEFAULT_SIEVES
+        if isinstance(sieves, str):
+            sieves = [sieves]
+        if mentions not in MENTION_MODES:
+            raise ValueError(f"Unknown mention mode '{mentions}', choose "
+                             f"from: {', '.join(MENTION_MODES)}.")
+
+        self.sieve_names = parse_sieve_names(",".join(sieves))
+        self.sieve_objects = create_sieves(self.sieve_names)
+        self.requirements = get_requirements(self.sieve_names)
+        self.gold_mentions = mentions == "gold"
+        self.budget_limits = budget_limits
+        self.vocabulary = vocabulary
+        # the shared vocabulary is only changed by one thread at a time
+        self.__lock = threading.Lock()
+
+    def create_documents(self, source, name="document", gold=None):
+        """Returns the Document objects of a source:
+            - str: text in the CoNLL format, one document per document part
+              (a text with several parts gives the names name_part_000, ...)
+            - list of sentences, each a list of tuples
+              (token, pos_tag, tree_part) or
+              (index, token, pos_tag, tree_part), one document
+            - Document object, returned as it is
+
+        :param gold: gold standard of a list of sentences, list of clusters
+            [[[0, 23, 24], [1, 14, 15]], [[9, 11, 12]]], the gold standard of
+            a CoNLL text is read from its last column
+        """
+        if isinstance(source, Document):
+            return [source]
+
+        vocabulary = self.vocabulary
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+
+        with self.__lock:
+            if isinstance(source, str):
+                data_reader = CoNLLDataReader()
+                data_reader.vocabulary = vocabulary
+                parts = data_reader.read_parts_in(io.StringIO(source))
+                data = [[name if len(parts) == 1
+                         else data_reader.get_part_name(name, part[1]),
+                         part[2], part[3]] for part in parts]
+            else:
+                sentences = [[self.__get_token_tuple(i, elem)
+                              for i, elem in enumerate(sentence)]
+                             for sentence in source]
+                data = [[name, sentences, dict(enumerate(gold or []))]]
+
+            return DataTranformer.create_document_objects_from_data(
+                data, vocabulary, self.requirements, self.gold_mentions)
+
+    @staticmethod
+    def __get_token_tuple(index, elem):
+        """Returns a token as (index, token, pos_tag, tree_part)."""
+        if len(elem) == 3:
+            return tuple((str(index),)) + tuple(elem)
+
+        return tuple(elem)
+
+    def apply_sieves(self, document_obj, sieve_done=None):
+        """Applies the sieves to a document, whose mentions are extracted.
+        Returns the resolver and the budget (None without limits)."""
+        budget = SieveBudget(**self.budget_limits) if self.budget_limits \
+            else None
+        resolver = CoreferenceChainResolver()
+        resolver.resolve(document_obj, self.sieve_objects, budget)
+        resolver.sieve_mentions(sieve_done)
+
+        return resolver, budget
+
+    @staticmethod
+    def get_result(document_obj, resolver, budget=None):
+        """Returns the clusters and scores of a sieved document as a dict,
+        like the json output of a document."""
+        true_positives, false_positives, false_negatives = \
+            resolver.count_pairs(document_obj.gold)
+        precision, recall, f1_score = CoreferenceChainResolver \
+            .scores_from_counts(true_positives, false_positives,
+                                false_negatives)
+
+        result = dict()
+        result["document"] = document_obj.path
+        result["clusters"] = document_obj.get_relevant_clusters()
+        result["precision"] = precision
+        result["recall"] = recall
+        # like CoreferenceChainResolver.evaluate
+        result["f1"] = f1_score if document_obj.gold \
+            else "No gold standard!"
+        # MUC, B-cubed and CEAF-e with their counts, that can be summed up
+        # like the pair counts, and their average f1 (CoNLL score)
+        result["metrics"], result["conll_f1"] = get_metric_scores(
+            get_metric_counts(document_obj.gold, result["clusters"]))
+        # noun phrases, mentions and NPs merged into a mention with the same
+        # span
+        result["mention_stats"] = document_obj.get_mention_stats()
+        # pair counts, that can be summed up to corpus scores (see merge)
+        result["pair_counts"] = {"true_positives": true_positives,
+                                 "false_positives": false_positives,
+                                 "false_negatives": false_negatives}
+        # a degraded document was only partly resolved within its budget
+        result["degraded"] = budget is not None and budget.is_degraded()
+        result["degradations"] = budget.degradations if budget is not None \
+            else []
+
+        return result
+
+    def resolve_document(self, document_obj):
+        """Extracts the mentions of a Document, applies the sieves and
+        returns the result (see get_result)."""
+        document_obj.extract_mentions()
+        resolver, budget = self.apply_sieves(document_obj)
+
+        return self.get_result(document_obj, resolver, budget)
+
+    def resolve(self, source, name="document", gold=None):
+        """Resolves the documents of a source (see create_documents) and
+        returns a list with the result of every document."""
+        return [self.resolve_document(document_obj) for document_obj
+                in self.create_documents(source, name, gold)]
+
+    def resolve_all(self, sources, workers=1):
+        """Resolves the documents of an iterable of sources, the i-th source
+        is named document_i. Yields the results in the order of the
+        documents. With more than one worker the documents are resolved in
+        threads, at most 2 * workers documents are created in advance."""
+        documents = (document_obj for i, source in enumerate(sources)
+                     for document_obj
+                     in self.create_documents(source, f"document_{i}"))
+        if workers == 1:
+            for document_obj in documents:
+                yield self.resolve_document(document_obj)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for document_obj in documents:
+                pending.append(executor.submit(self.resolve_document,
+                                               document_obj))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -1,184 +1,254 @@
-# This is a class which bundles all attributes of one sentence of a document.
-from nltk import Tree
-
-
-class Sentence:
-    """
-    - self.list_of_sent_data: list of tuple
-        [('0', 'In', 'IN', '(TOP(S(PP*'), ...]
-        (index of token, token, pos_tag, tree_part)
-    - self.tree: nltk.Tree object
-    - self.sentence_str: sentence as a string
-    - self.mentions: list of mention information
-        [[list_of_token], (span_start, span_end), [list_of_info]]
-        [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
-    """
-    def __init__(self, list_of_sent_data):
-        self.list_of_sent_data = list_of_sent_data
-        self.tree = self.__create_tree_obj()
-        self.sentence_str = self.__create_sent_as_str()
-        self.mentions = self.__extract_mentions()
-
-    def get_sentence_as_str(self):
-        return self.sentence_str.strip()
-
-    def __create_sent_as_str(self):
-        """Creates sentence as a string."""
-        sentence = ""
-        for elem in self.list_of_sent_data:
-            sentence = sentence + " " + elem[1]
-
-        return sentence.strip()
-
-    def __create_tree_obj(self):
-        """Creates a nltk Tree object."""
-        sent_tree = ""
-        for elem in self.list_of_sent_data:
-            treepart = elem[3].replace("*", " " + elem[1])
-            sent_tree = sent_tree + " " + treepart
-
-        return Tree.fromstring(sent_tree)
-
-    def __extract_mentions(self):
-        """Extracts mentions from the nltk Tree.
-        In this approach, it is assumed that each NP is a Mention.
-        one mention be like:
-            mention = [list_of_token, span_tuple, list_of_mention_info]
-            [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
-        """
-        mentions = []
-        for s in self.tree.subtrees(lambda x: x.label() == "NP"):
-            mention = s.leaves()
-            span = self.__get_mention_span(mention)
-            info = self.__extract_mention_information([mention, span[0]])
-            mentions.append([mention, span[0], info])
-
-        return mentions
-
-    def __get_mention_span(self, mention):
-        """Returns the mention span (indexes) as a tuple(span_start,span_end)."""
-        sentence_tokenized = self.sentence_str.split()
-        indexes = [(i, i+len(mention) - 1) for i in range(len(sentence_tokenized))
-                   if sentence_tokenized[i:i+len(mention)] == mention]
-
-        return indexes
-
-    def __extract_mention_information(self, mention):
-        """Extract the information for a mention. Returns a set."""
-        # TODO: numerus (person, belebtheit?)
-        # mention = [['the', 'summer', 'of', '2005'], (1, 5)]
-        info = set()
-        for i in range(mention[1][0],mention[1][1]):
-            info.add(self.list_of_sent_data[i][2])
-
-        return info
-
-    def __get_list_of_leaves(self, list_of_trees):
-        """Extract the list of leaves (token) for a given list of nltk Trees."""
-        list_of_leaves = []
-        for elem in list_of_trees:
-            list_of_leaves.append(elem.leaves())
-
-        return list_of_leaves
-
-    def levelorder(self, left_to_right=True):
-        """Method that traverses the nltk Tree of the sentence in levelorder.
-        Returns the mentions in the order in which they were passed through
-        as a list."""
-        mentions = []
-        if left_to_right:
-            list_of_trees = self.__levelorder_left_to_right()
-        else:
-            list_of_trees = self.__levelorder_right_to_left()
-        list_of_leaves = self.__get_list_of_leaves(list_of_trees)
-        for mention in list_of_leaves:
-            mention_span = self.__get_mention_span(mention)
-            mentions.append(mention_span)
-
-        return mentions
-
-    def __levelorder_left_to_right(self):
-        """Traverses the nltk tree in level order from left to right.
-        Returns mention (NP) in order in which they were passed through
-        as a list."""
-        level_order = []
-
-        queue = [self.tree]
-        while len(queue) != 0:
-            current_tree = queue[0]
-            queue.pop(0)
-            if isinstance(current_tree, str):
-                continue
-            for child in current_tree:
-                queue.append(child)
-                if not isinstance(child, str):
-                    if child.label() == "NP":
-                        level_order.append(child)
-
-        return level_order
-
-    def __levelorder_right_to_left(self):
-        """Traverses the nltk tree in level order from right to left.
-        Returns mention (NP) in order in which they were passed through
-        as a list."""
-
-        level_order = []
-
-        queue = [self.tree]
-        while len(queue) != 0:
-            current_tree = queue[0]
-            queue.pop(0)
-            if isinstance(current_tree, str):
-                continue
-
-            for child in current_tree[::-1]:
-                queue.append(child)
-                if not isinstance(child, str):
-                    if child.label() == "NP":
-                        level_order.append(child)
-
-        return level_order
-
-
-def demo():
-    one_sent = [('0', 'In', 'IN', '(TOP(S(PP*'),
-                ('1', 'the', 'DT', '(NP(NP*'),
-                ('2', 'summer', 'NN', '*)'),
-                ('3', 'of', 'IN', '(PP*'),
-                ('4', '2005', 'CD', '(NP*))))'),
-                ('5', ',', ',', '*'),
-                ('6', 'a', 'DT', '(NP(NP*'),
-                ('7', 'picture', 'NN', '*)'),
-                ('8', 'that', 'WDT', '(SBAR(WHNP*)'),
-                ('9', 'people', 'NNS', '(S(NP*)'),
-                ('10', 'have', 'VBP', '(VP*'),
-                ('11', 'long', 'RB', '(ADVP*)'),
-                ('12', 'been', 'VBN', '(VP*'),
-                ('13', 'looking', 'VBG', '(VP*'),
-                ('14', 'forward', 'RB', '(ADVP*)'),
-                ('15', 'to', 'TO', '(S(VP*'),
-                ('16', 'started', 'VBD', '(VP*'),
-                ('17', 'emerging', 'VBG', '(S(VP*'),
-                ('18', 'with', 'IN', '(PP*'),
-                ('19', 'frequency', 'NN', '(NP*))'),
-                ('20', 'in', 'IN', '(PP*'),
-                ('21', 'various', 'JJ', '(NP*'),
-                ('22', 'major', 'JJ', '*'),
-                ('23', 'Hong', 'NNP', '(NML*'),
-                ('24', 'Kong', 'NNP', '*)'),
-                ('25', 'media', 'NNS', '*)))))))))))))'),
-                ('26', '.', '.', '*))')]
-
-    sent_obj = Sentence(one_sent)
-    tree = sent_obj.tree
-    print("NLTK-Tree:")
-    tree.pretty_print()
-    m = sent_obj.levelorder()
-    print("Traverses the nltk Tree of the sentence in levelorder:")
-    print(m)
-    # [[(6, 25)], [(1, 4)], [(6, 7)], [(1, 2)], [(4, 4)],
-    # [(9, 9)], [(19, 19)], [(21, 25)]]
-
-
-if __name__ == '__main__':
-    demo()
+# This is a class which bundles all attributes of one sentence of a document.
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import \
+    PARSE_TREE, SENTENCE_STRINGS
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+
+
+class Sentence:
+    """
+    - self.list_of_sent_data: list of tuple
+        [('0', 'In', 'IN', '(TOP(S(PP*'), ...]
+        (index of token, token, pos_tag, tree_part)
+    - self.vocabulary: Vocabulary object, the leaves of the tree are the
+        token strings stored in the vocabulary
+    - self.tree: nltk.Tree object, None until get_tree() is called if the
+        sieves do not require it (see sieve_registry.get_requirements)
+    - self.sentence_str: sentence as a string, None until
+        get_sentence_as_str() is called if the sieves do not require it
+    - self.mentions: list of mention information
+        [[list_of_token], (span_start, span_end), [list_of_info]]
+        [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
+    - self.merged_mentions: int, number of NPs that were not extracted as
+        mentions of their own, because their span is already a mention
+
+    The NPs and their depth in the tree are read from the tree parts with a
+    stack, the nltk Tree is not needed for the mentions and the levelorder.
+    With gold mention spans, the mentions are the gold spans and the tree
+    parts are not read at all.
+    """
+    def __init__(self, list_of_sent_data, vocabulary=None, requirements=None,
+                 mention_spans=None):
+        """requirements: set of the structures the sieves need (see
+        AbstractSieve.requires), None builds all of them.
+        mention_spans: list of (span_start, span_end) of the gold mentions
+        of the sentence, None extracts the mentions from the NPs."""
+        self.list_of_sent_data = list_of_sent_data
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        self.vocabulary = vocabulary
+        self.__tokens = [vocabulary.intern(elem[1])
+                         for elem in list_of_sent_data]
+        # (depth, span_start, span_end, spans) of the NPs in preorder
+        if mention_spans is None:
+            self.__noun_phrases = self.__parse_noun_phrases()
+        else:
+            self.__noun_phrases = self.__nest_mention_spans(mention_spans)
+        self.tree = None
+        if requirements is None or PARSE_TREE in requirements:
+            self.tree = self.__create_tree_obj()
+        self.sentence_str = None
+        if requirements is None or SENTENCE_STRINGS in requirements:
+            self.sentence_str = self.__create_sent_as_str()
+        self.merged_mentions = 0
+        self.mentions = self.__extract_mentions()
+
+    def get_sentence_as_str(self):
+        if self.sentence_str is None:
+            self.sentence_str = self.__create_sent_as_str()
+
+        return self.sentence_str.strip()
+
+    def get_tree(self):
+        """Returns the nltk Tree of the sentence, built on first use."""
+        if self.tree is None:
+            self.tree = self.__create_tree_obj()
+
+        return self.tree
+
+    def __create_sent_as_str(self):
+        """Creates sentence as a string."""
+        sentence = ""
+        for elem in self.list_of_sent_data:
+            sentence = sentence + " " + elem[1]
+
+        return sentence.strip()
+
+    def __create_tree_obj(self):
+        """Creates a nltk Tree object."""
+        sent_tree = ""
+        for elem in self.list_of_sent_data:
+            treepart = elem[3].replace("*", " " + elem[1])
+            sent_tree = sent_tree + " " + treepart
+
+        # nltk takes longer to import than the rest of the program, it is
+        # only imported when a tree is needed
+        from nltk import Tree
+
+        return Tree.fromstring(sent_tree, read_leaf=self.vocabulary.intern)
+
+    def __parse_noun_phrases(self):
+        """Reads the NPs from the tree parts, like nltk would build the tree:
+        the root has depth 0, every "(" opens a child of the open node and
+        the "*" is the token. Returns a list of tuples
+        (depth, span_start, span_end, spans) in preorder, spans are the
+        spans of the tokens of the NP (see __get_mention_span)."""
+        noun_phrases = []
+        # [label, depth, span_start] of the open nodes
+        stack = []
+        has_root = False
+        for i, elem in enumerate(self.list_of_sent_data):
+            for label in elem[3].replace("*", "(*").split("(")[1:]:
+                closing = len(label) - len(label.rstrip(")"))
+                label = label[:len(label) - closing]
+                if label != "*":
+                    # like nltk, only one tree per sentence
+                    if not stack and has_root:
+                        raise ValueError(f"Invalid tree in sentence: "
+                                         f"{self.list_of_sent_data}")
+                    has_root = True
+                    stack.append([label, len(stack), i])
+                for _ in range(closing):
+                    if not stack:
+                        raise ValueError(f"Invalid tree in sentence: "
+                                         f"{self.list_of_sent_data}")
+                    label, depth, span_start = stack.pop()
+                    if label == "NP":
+                        noun_phrases.append((depth, span_start, i))
+
+        if stack:
+            raise ValueError(f"Invalid tree in sentence: "
+                             f"{self.list_of_sent_data}")
+
+        # preorder: parents (opened earlier or at the same token) first
+        noun_phrases.sort(key=lambda noun_phrase: (noun_phrase[1],
+                                                   noun_phrase[0]))
+        return [(depth, span_start, span_end, self.__get_mention_span(
+            self.__tokens[span_start:span_end + 1]))
+            for depth, span_start, span_end in noun_phrases]
+
+    def __nest_mention_spans(self, mention_spans):
+        """Orders gold mention spans like the NPs of __parse_noun_phrases:
+        in preorder (enclosing spans first) and with their depth in the
+        nesting of the spans, so that the levelorder is a breadth-first
+        traversal of the nested mentions. Duplicate spans and spans outside
+        of the sentence are left out."""
+        spans = sorted({tuple((span_start, span_end))
+                        for span_start, span_end in mention_spans
+                        if 0 <= span_start <= span_end < len(self.__tokens)},
+                       key=lambda span: (span[0], -span[1]))
+
+        noun_phrases = []
+        # ends of the enclosing spans
+        stack = []
+        for span_start, span_end in spans:
+            while stack and stack[-1] < span_end:
+                stack.pop()
+            noun_phrases.append((len(stack) + 1, span_start, span_end,
+                                 [tuple((span_start, span_end))]))
+            stack.append(span_end)
+
+        return noun_phrases
+
+    def __extract_mentions(self):
+        """Extracts mentions from the NPs of the tree.
+        In this approach, it is assumed that each NP is a Mention.
+        one mention be like:
+            mention = [list_of_token, span_tuple, list_of_mention_info]
+            [['the', 'summer', 'of', '2005'], (1, 5), ['DT', 'NN', 'IN', 'CD']]
+
+        There is one mention per distinct span: NPs with the span of an
+        earlier NP, e.g. in unary chains like (NP (NP ...)), are merged into
+        it. Subtrees are visited parents first, so the maximal projection
+        is kept.
+        """
+        mentions = []
+        spans = set()
+        for _, span_start, span_end, span in self.__noun_phrases:
+            mention = self.__tokens[span_start:span_end + 1]
+            if span[0] in spans:
+                self.merged_mentions += 1
+                continue
+            spans.add(span[0])
+            info = self.__extract_mention_information([mention, span[0]])
+            mentions.append([mention, span[0], info])
+
+        return mentions
+
+    def __get_mention_span(self, mention):
+        """Returns the mention span (indexes) as a tuple(span_start,span_end)."""
+        sentence_tokenized = self.__tokens
+        indexes = [(i, i+len(mention) - 1) for i in range(len(sentence_tokenized))
+                   if sentence_tokenized[i:i+len(mention)] == mention]
+
+        return indexes
+
+    def __extract_mention_information(self, mention):
+        """Extract the information for a mention. Returns a set."""
+        # TODO: numerus (person, belebtheit?)
+        # mention = [['the', 'summer', 'of', '2005'], (1, 5)]
+        info = set()
+        for i in range(mention[1][0],mention[1][1]):
+            info.add(self.list_of_sent_data[i][2])
+
+        return info
+
+    def levelorder(self, left_to_right=True):
+        """Method that traverses the tree of the sentence in levelorder.
+        Returns the mentions in the order in which they were passed through
+        as a list.
+
+        A breadth-first traversal passes the nodes level by level, and within
+        a level from left to right (or right to left), so the NPs below the
+        root are sorted by their depth and their position."""
+        direction = 1 if left_to_right else -1
+        noun_phrases = sorted(
+            (noun_phrase for noun_phrase in self.__noun_phrases
+             if noun_phrase[0] > 0),
+            key=lambda noun_phrase: (noun_phrase[0],
+                                     direction * noun_phrase[1]))
+
+        return [noun_phrase[3] for noun_phrase in noun_phrases]
+
+
+def demo():
+    one_sent = [('0', 'In', 'IN', '(TOP(S(PP*'),
+                ('1', 'the', 'DT', '(NP(NP*'),
+                ('2', 'summer', 'NN', '*)'),
+                ('3', 'of', 'IN', '(PP*'),
+                ('4', '2005', 'CD', '(NP*))))'),
+                ('5', ',', ',', '*'),
+                ('6', 'a', 'DT', '(NP(NP*'),
+                ('7', 'picture', 'NN', '*)'),
+                ('8', 'that', 'WDT', '(SBAR(WHNP*)'),
+                ('9', 'people', 'NNS', '(S(NP*)'),
+                ('10', 'have', 'VBP', '(VP*'),
+                ('11', 'long', 'RB', '(ADVP*)'),
+                ('12', 'been', 'VBN', '(VP*'),
+                ('13', 'looking', 'VBG', '(VP*'),
+                ('14', 'forward', 'RB', '(ADVP*)'),
+                ('15', 'to', 'TO', '(S(VP*'),
+                ('16', 'started', 'VBD', '(VP*'),
+                ('17', 'emerging', 'VBG', '(S(VP*'),
+                ('18', 'with', 'IN', '(PP*'),
+                ('19', 'frequency', 'NN', '(NP*))'),
+                ('20', 'in', 'IN', '(PP*'),
+                ('21', 'various', 'JJ', '(NP*'),
+                ('22', 'major', 'JJ', '*'),
+                ('23', 'Hong', 'NNP', '(NML*'),
+                ('24', 'Kong', 'NNP', '*)'),
+                ('25', 'media', 'NNS', '*)))))))))))))'),
+                ('26', '.', '.', '*))')]
+
+    sent_obj = Sentence(one_sent)
+    tree = sent_obj.tree
+    print("NLTK-Tree:")
+    tree.pretty_print()
+    m = sent_obj.levelorder()
+    print("Traverses the nltk Tree of the sentence in levelorder:")
+    print(m)
+    # [[(6, 25)], [(1, 4)], [(6, 7)], [(1, 2)], [(4, 4)],
+    # [(9, 9)], [(19, 19)], [(21, 25)]]
+
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,170 @@
+# Runs several sieve configurations (orderings of sieves) on the same corpus.
+# The configurations are stored in a prefix tree, so that sieves which several
+# configurations have in common at the beginning are applied only once per
+# document. The cluster state after a shared prefix is saved and restored for
+# every configuration that branches off from it.
+import time
+
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import AbstractSieve
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+from MultiSievePassCorefResolution.coreference_metrics import \
+    get_metric_counts, get_metric_scores, sum_metric_counts
+from MultiSievePassCorefResolution.errors import InvalidSieveClassError
+
+
+class _PrefixNode:
+    """One node of the prefix tree of sieve configurations.
+
+    self.sieve: sieve object applied when the node is entered
+        (None for the root)
+    self.children: list of _PrefixNode
+    self.configurations: list of configuration indices, that end in this node
+    self.seconds: time (float) spent on applying the sieve of this node
+    """
+
+    def __init__(self, sieve=None):
+        self.sieve = sieve
+        self.children = []
+        self.configurations = []
+        self.seconds = 0.0
+
+    def get_child(self, sieve):
+        """Returns the child node for a sieve object, creates it if needed.
+        Sieves are compared by identity, so the same sieve object must be
+        used in all configurations to share a prefix."""
+        for child in self.children:
+            if child.sieve is sieve:
+                return child
+
+        child = _PrefixNode(sieve)
+        self.children.append(child)
+        return child
+
+
+class SieveAblation:
+    """Objects of this class apply a list of sieve configurations to document
+    objects and sum up the pair counts of every configuration.
+
+    self.configurations: list of lists of sieve objects
+        (that inherit from AbstractSieve Class)
+    self.counts: list of [true_positives, false_positives, false_negatives]
+        per configuration, summed up over all documents
+    self.metric_counts: list of dicts metric name -> counts of the MUC,
+        B-cubed and CEAF-e metrics per configuration, summed up over all
+        documents (see coreference_metrics)
+    self.documents: number of documents processed
+    self.mention_seconds: time (float) spent on extracting mentions
+    """
+
+    def __init__(self, configurations):
+        for sieve_objects in configurations:
+            self.__verify_input(sieve_objects)
+
+        self.configurations = configurations
+        self.counts = [[0, 0, 0] for _ in configurations]
+        self.metric_counts = [sum_metric_counts([]) for _ in configurations]
+        self.documents = 0
+        self.mention_seconds = 0.0
+        self.__root = self.__build_prefix_tree(configurations)
+
+    @staticmethod
+    def __verify_input(objects):
+        if any([not isinstance(obj, AbstractSieve) for obj in objects]):
+            raise InvalidSieveClassError(
+                'Sieve objects must inherit from AbstractSieveClass.')
+
+    @staticmethod
+    def __build_prefix_tree(configurations):
+        """Inserts every configuration into a prefix tree."""
+        root = _PrefixNode()
+        for idx, sieve_objects in enumerate(configurations):
+            node = root
+            for sieve in sieve_objects:
+                node = node.get_child(sieve)
+            node.configurations.append(idx)
+
+        return root
+
+    def run(self, document_obj):
+        """Extracts the mentions of one document object and applies all
+        configurations to it. The pair counts of the document are added
+        to the counts of each configuration."""
+        start = time.perf_counter()
+        document_obj.extract_mentions()
+        self.mention_seconds += time.perf_counter() - start
+
+        resolver = CoreferenceChainResolver()
+        resolver.resolve(document_obj, [])
+        self.__walk(self.__root, resolver, document_obj)
+        self.documents += 1
+
+    def __walk(self, node, resolver, document_obj):
+        """Depth-first traversal of the prefix tree. The cluster state is
+        saved before the first child and restored before every other child,
+        so each child continues from the state after the shared prefix."""
+        for idx in node.configurations:
+            counts = resolver.count_pairs(document_obj.gold)
+            for i, count in enumerate(counts):
+                self.counts[idx][i] += count
+            self.metric_counts[idx] = sum_metric_counts([
+                self.metric_counts[idx],
+                get_metric_counts(document_obj.gold,
+                                  document_obj.get_relevant_clusters())])
+
+        snapshot = None
+        if len(node.children) > 1:
+            snapshot = document_obj.snapshot_clusters()
+
+        for i, child in enumerate(node.children):
+            if i > 0:
+                document_obj.restore_clusters(snapshot)
+
+            start = time.perf_counter()
+            child.sieve.sieve(document_obj)
+            child.seconds += time.perf_counter() - start
+
+            self.__walk(child, resolver, document_obj)
+
+    def get_sieve_seconds(self, idx):
+        """Returns the time a configuration would have spent on its sieves
+        if it had been run on its own: the sum over its path in the tree."""
+        seconds = 0.0
+        node = self.__root
+        for sieve in self.configurations[idx]:
+            node = node.get_child(sieve)
+            seconds += node.seconds
+
+        return seconds
+
+    def get_shared_seconds(self):
+        """Returns the time actually spent on applying sieves."""
+        seconds = 0.0
+        stack = list(self.__root.children)
+        while stack:
+            node = stack.pop()
+            seconds += node.seconds
+            stack.extend(node.children)
+
+        return seconds
+
+    def get_results(self):
+        """Returns a list of dicts, one per configuration, with the corpus
+        precision, recall, f1 (pairwise), the scores of the MUC, B-cubed
+        and CEAF-e metrics, the CoNLL score and the sieve time in seconds."""
+        results = []
+        for idx, counts in enumerate(self.counts):
+            precision, recall, f1_score = \
+                CoreferenceChainResolver.scores_from_counts(*counts)
+            metric_scores, conll_f1 = get_metric_scores(
+                self.metric_counts[idx])
+            results.append({
+                "configuration": self.configurations[idx],
+                "precision": precision,
+                "recall": recall,
+                "f1": f1_score,
+                "metrics": metric_scores,
+                "conll_f1": conll_f1,
+                "seconds": self.get_sieve_seconds(idx)})
+
+        return results
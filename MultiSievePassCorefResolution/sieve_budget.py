@@ -0,0 +1,91 @@
+# This is a class which limits the work the sieves spend on one document.
+# A pathological document (e.g. a very long sentence) should not stall a
+# whole batch: when a budget is exceeded, the sieves degrade gracefully and
+# the document is flagged as degraded in the output.
+import time
+
+
+class SieveBudget:
+    """
+    self.document_seconds: float or None, time budget of the whole document;
+        when it is exceeded, the remaining sieves are skipped and the clusters
+        found so far are returned
+    self.sieve_seconds: float or None, time budget of one sieve; when it is
+        exceeded, the sieve stops and the next sieve is applied
+    self.max_candidates: int or None, maximal number of candidates checked
+        per mention, the closest candidates (first in traversal order) are kept
+    self.expensive_fraction: float, expensive sieves (see
+        AbstractSieve.expensive) are skipped, once this fraction of the
+        document budget is used up
+    self.degradations: list of str, what was left out for the document
+    """
+
+    def __init__(self, document_seconds=None, sieve_seconds=None,
+                 max_candidates=None, expensive_fraction=0.5):
+        self.document_seconds = document_seconds
+        self.sieve_seconds = sieve_seconds
+        self.max_candidates = max_candidates
+        self.expensive_fraction = expensive_fraction
+        self.degradations = []
+        self.__document_start = None
+        self.__deadline = None
+
+    def start_document(self):
+        """Starts the time budget of the document."""
+        self.__document_start = time.perf_counter()
+        self.__deadline = None
+        if self.document_seconds is not None:
+            self.__deadline = self.__document_start + self.document_seconds
+
+    def start_sieve(self):
+        """Starts the time budget of the next sieve, it ends at the latest
+        with the budget of the document."""
+        if self.__document_start is None:
+            self.start_document()
+
+        self.__deadline = None
+        if self.document_seconds is not None:
+            self.__deadline = self.__document_start + self.document_seconds
+        if self.sieve_seconds is not None:
+            sieve_deadline = time.perf_counter() + self.sieve_seconds
+            if self.__deadline is None or sieve_deadline < self.__deadline:
+                self.__deadline = sieve_deadline
+
+    def get_document_elapsed(self):
+        if self.__document_start is None:
+            return 0.0
+
+        return time.perf_counter() - self.__document_start
+
+    def is_exceeded(self):
+        """Checks if the budget of the current sieve (or the document)
+        is used up."""
+        return self.__deadline is not None \
+            and time.perf_counter() > self.__deadline
+
+    def is_document_exceeded(self):
+        return self.document_seconds is not None \
+            and self.get_document_elapsed() > self.document_seconds
+
+    def should_skip_expensive(self):
+        """Checks if expensive sieves should be skipped for the document."""
+        return self.document_seconds is not None \
+            and self.get_document_elapsed() \
+            > self.expensive_fraction * self.document_seconds
+
+    def cap_candidates(self, candidates, sieve_name):
+        """Returns at most max_candidates candidates."""
+        if self.max_candidates is None \
+                or len(candidates) <= self.max_candidates:
+            return candidates
+
+        self.add_degradation(f"{sieve_name}: candidates capped at "
+                             f"{self.max_candidates} per mention")
+        return candidates[:self.max_candidates]
+
+    def add_degradation(self, reason):
+        if reason not in self.degradations:
+            self.degradations.append(reason)
+
+    def is_degraded(self):
+        return len(self.degradations) > 0
@@ -0,0 +1,85 @@
+# Registry of the sieve classes by name. The sieves are selected by name (e.g.
+# on the command line) and declare the structures of a document they need
+# (see AbstractSieve.requires), so that only the union of the requirements of
+# the selected sieves is built for the documents. The modules of the sieves
+# are only imported when a sieve is used.
+import importlib
+
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class \
+    import AbstractSieve
+from MultiSievePassCorefResolution.errors import InvalidSieveClassError, \
+    UnknownSieveError
+
+# sieve classes selectable by name: the class or the path
+# "package.module.ClassName" of a class that is not imported yet
+SIEVES = {"exact": "MultiSievePassCorefResolution.Sieves.exact_match_sieve."
+                   "ExactMatchSieve",
+          "precise": "MultiSievePassCorefResolution.Sieves."
+                     "precise_construct_sieve.PreciseConstructSieve",
+          "pronoun": "MultiSievePassCorefResolution.Sieves.pronoun_sieve."
+                     "PronounSieve"}
+
+# sieves applied by default, in this order
+DEFAULT_SIEVES = ["exact", "precise", "pronoun"]
+
+
+def register_sieve(name, sieve_class):
+    """Makes a sieve class selectable by name. sieve_class is a class or the
+    path "package.module.ClassName" of a class, which is imported when the
+    sieve is used."""
+    if not isinstance(sieve_class, str):
+        _verify_sieve_class(sieve_class)
+
+    SIEVES[name] = sieve_class
+
+
+def _verify_sieve_class(sieve_class):
+    """Raises an InvalidSieveClassError if sieve_class is not a sieve."""
+    if not (isinstance(sieve_class, type)
+            and issubclass(sieve_class, AbstractSieve)):
+        raise InvalidSieveClassError(
+            'Sieve classes must inherit from AbstractSieveClass.')
+
+
+def get_sieve_class(name):
+    """Returns the sieve class of a name, its module is imported on first
+    use. Raises an UnknownSieveError for an unknown name."""
+    if name not in SIEVES:
+        raise UnknownSieveError(f"Unknown sieve '{name}', choose from: "
+                                f"{', '.join(SIEVES)}.")
+
+    sieve_class = SIEVES[name]
+    if isinstance(sieve_class, str):
+        module_name, class_name = sieve_class.rsplit(".", 1)
+        sieve_class = getattr(importlib.import_module(module_name),
+                              class_name)
+        _verify_sieve_class(sieve_class)
+        SIEVES[name] = sieve_class
+
+    return sieve_class
+
+
+def parse_sieve_names(sieve_names):
+    """Turns a comma separated list of sieve names like "exact,pronoun" into
+    a list of names. Raises an UnknownSieveError for an unknown name."""
+    names = [name.strip() for name in sieve_names.split(",")]
+    for name in names:
+        if name not in SIEVES:
+            raise UnknownSieveError(f"Unknown sieve '{name}', choose from: "
+                                    f"{', '.join(SIEVES)}.")
+
+    return names
+
+
+def create_sieves(sieve_names):
+    """Returns a list with a new sieve object for every name."""
+    return [get_sieve_class(name)() for name in sieve_names]
+
+
+def get_requirements(sieve_names):
+    """Returns the union of the structures required by the sieves."""
+    requirements = set()
+    for name in sieve_names:
+        requirements |= get_sieve_class(name).requires
+
+    return frozenset(requirements)
@@ -0,0 +1,77 @@
+# This is a class which interns the tokens of a corpus.
+# Every distinct token (surface form) is stored once and gets an integer ID,
+# its lower cased form gets an ID as well. Sieves can then compare mentions
+# as tuples of integers instead of lowering and comparing strings.
+
+
+class Vocabulary:
+    """
+    self.tokens: list of str, the token of each ID
+        ['In', 'in', 'the', 'summer', ...]
+    self.token_ids: dict, keys are tokens and values their ID
+        {'In': 0, 'in': 1, 'the': 2, 'summer': 3, ...}
+    self.lower_ids: list of int, ID of the lower cased form of each ID
+        [1, 1, 2, 3, ...]
+    """
+    def __init__(self):
+        self.tokens = []
+        self.token_ids = {}
+        self.lower_ids = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add_token(self, token):
+        """Adds a token and its lower cased form, if not known yet.
+        Returns the ID of the token."""
+        ID = self.token_ids.get(token)
+        if ID is not None:
+            return ID
+
+        ID = len(self.tokens)
+        self.tokens.append(token)
+        self.token_ids[token] = ID
+        # placeholder, replaced below if the lower cased form differs
+        self.lower_ids.append(ID)
+
+        lower_token = token.lower()
+        if lower_token != token:
+            self.lower_ids[ID] = self.add_token(lower_token)
+
+        return ID
+
+    def intern(self, token):
+        """Adds a token and returns the stored string object of it, so that
+        the same token is kept only once in memory."""
+        return self.tokens[self.add_token(token)]
+
+    def get_id(self, token):
+        """Returns the ID of a token or None if the token is unknown.
+        Does not add the token."""
+        return self.token_ids.get(token)
+
+    def get_token(self, ID):
+        return self.tokens[ID]
+
+    def get_lower_id(self, ID):
+        return self.lower_ids[ID]
+
+    def get_ids(self, tokens):
+        """Adds a list of tokens and returns a tuple of their IDs."""
+        return tuple(self.add_token(token) for token in tokens)
+
+    def get_lower_ids(self, IDs):
+        """Returns the IDs of the lower cased forms for a tuple of IDs."""
+        return tuple(self.lower_ids[ID] for ID in IDs)
+
+
+def demo():
+    vocabulary = Vocabulary()
+    IDs = vocabulary.get_ids(['In', 'the', 'summer', 'in', 'The'])
+    print(f"IDs: {IDs}")
+    print(f"Lower cased IDs: {vocabulary.get_lower_ids(IDs)}")
+    print(f"Tokens: {vocabulary.tokens}")
+
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,102 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tarfile
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.manifest import create_file_hash, get_file_hash
+from DataReader.conll_data_reader import CoNLLDataReader
+
+TEST_FILE = "test_data/gold_test.v4_auto_conll"
+
+
+class TestCompressedInput(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.expected = CoNLLDataReader().read_file_in(TEST_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def compress(self, module, file_name):
+        path = os.path.join(self.directory, file_name)
+        with open(TEST_FILE, 'rb') as f_in, module.open(path, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        return path
+
+    def test_read_compressed_files(self):
+        for module, extension in [(gzip, ".gz"), (bz2, ".bz2"), (lzma, ".xz")]:
+            path = self.compress(module, "gold_test.v4_auto_conll" + extension)
+            dr = CoNLLDataReader()
+            dr.read_data(path)
+            assert len(dr.data) == 1
+            assert dr.data[0][0] == "gold_test.v4_auto_conll"
+            assert tuple(dr.data[0][1:]) == self.expected
+
+    def test_detect_by_magic_bytes(self):
+        path = self.compress(gzip, "gold_test_without_extension")
+        assert CoNLLDataReader().read_file_in(path) == self.expected
+
+    def test_read_tar_archive(self):
+        member = self.compress(gzip, "second.v4_auto_conll.gz")
+        path = os.path.join(self.directory, "corpus.tar.xz")
+        with tarfile.open(path, 'w:xz') as archive:
+            archive.add(TEST_FILE, arcname="a/first.v4_auto_conll")
+            archive.add(member, arcname="b/second.v4_auto_conll.gz")
+
+        dr = CoNLLDataReader()
+        dr.read_data(self.directory)
+        names = sorted(entry[0] for entry in dr.data)
+        # the archive members (named by their path) and the compressed
+        # member itself
+        assert names == ["a%2Ffirst.v4_auto_conll",
+                         "b%2Fsecond.v4_auto_conll", "second.v4_auto_conll"]
+        for entry in dr.data:
+            assert tuple(entry[1:]) == self.expected
+
+    def test_archive_members_with_the_same_name(self):
+        path = os.path.join(self.directory, "corpus.tar")
+        with tarfile.open(path, 'w') as archive:
+            archive.add(TEST_FILE, arcname="./a/x.v4_auto_conll")
+            archive.add(TEST_FILE, arcname="b/x.v4_auto_conll")
+            archive.add(TEST_FILE, arcname="x.v4_auto_conll")
+
+        dr = CoNLLDataReader()
+        dr.read_data(path)
+        assert [entry[0] for entry in dr.data] == [
+            "a%2Fx.v4_auto_conll", "b%2Fx.v4_auto_conll", "x.v4_auto_conll"]
+        assert dr.get_member_name("a%b/x.v4_auto_conll.gz") \
+            == "a%25b%2Fx.v4_auto_conll"
+
+    def test_compressed_member_without_extension(self):
+        member = self.compress(gzip, "gold_test_without_extension")
+        path = os.path.join(self.directory, "corpus.tar")
+        with tarfile.open(path, 'w') as archive:
+            archive.add(member, arcname="a/gold_test.v4_auto_conll")
+
+        dr = CoNLLDataReader()
+        dr.read_data_file(path)
+        assert [entry[0] for entry in dr.data] == [
+            "a%2Fgold_test.v4_auto_conll"]
+        assert tuple(dr.data[0][1:]) == self.expected
+
+    def test_hash_while_reading(self):
+        member = self.compress(gzip, "second.v4_auto_conll.gz")
+        archive_path = os.path.join(self.directory, "corpus.tar.gz")
+        with tarfile.open(archive_path, 'w:gz') as archive:
+            archive.add(TEST_FILE, arcname="a/first.v4_auto_conll")
+            archive.add(member, arcname="b/second.v4_auto_conll.gz")
+
+        for path in [TEST_FILE, member, archive_path]:
+            dr = CoNLLDataReader()
+            dr.read_data_file(path)
+            file_hash = create_file_hash()
+            hashed = CoNLLDataReader()
+            hashed.read_data_file(path, file_hash)
+            # one read gives the same documents and the hash of the file
+            assert hashed.data == dr.data
+            assert file_hash.hexdigest() == get_file_hash(path)
@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.conll_writer import ConllOutput, \
+    get_conll_output_name, get_coreference_columns, write_conll
+from DataReader.conll_data_reader import CoNLLDataReader
+
+TEST_FILE = "test_data/gold_test.v4_auto_conll"
+
+
+def as_clusters(gold):
+    return sorted(sorted(tuple(mention) for mention in cluster)
+                  for cluster in gold.values())
+
+
+class TestConllWriter(TestCase):
+
+    def test_coreference_columns(self):
+        columns = get_coreference_columns([[(0, 1, 3), (1, 0, 0)],
+                                           [(0, 1, 1), (0, 3, 5)]])
+        assert columns == {(0, 1): "(0|(1)", (0, 3): "(1|0)",
+                           (0, 5): "1)", (1, 0): "(0)"}
+
+    def test_written_clusters_are_read_back(self):
+        with open(TEST_FILE, 'r') as f:
+            text = f.read().rstrip("\n") + "\n"
+        # two parts with different clusters
+        text = text + text.replace("part 000", "part 001")
+        clusters = [[[(0, 23, 24), (1, 14, 15)], [(2, 0, 0), (2, 3, 5)]],
+                    [[(0, 1, 1), (3, 2, 4)]]]
+
+        out_file = io.StringIO()
+        parts = write_conll(io.StringIO(text), out_file, iter(clusters))
+        assert parts == 2
+
+        written = out_file.getvalue()
+        # only the last column is changed
+        assert [line.split()[:-1] for line in written.splitlines()] == \
+            [line.split()[:-1] for line in text.splitlines()]
+
+        read_parts = CoNLLDataReader().read_parts_in(io.StringIO(written))
+        assert [as_clusters(part[3]) for part in read_parts] == \
+            [sorted(sorted(cluster) for cluster in part_clusters)
+             for part_clusters in clusters]
+
+    def test_whitespace_line_does_not_end_a_sentence(self):
+        with open(TEST_FILE, 'r') as f:
+            lines = f.read().rstrip("\n").split("\n")
+        # a line of spaces in the first sentence, a line break with "\r"
+        # in the second one, both like in the reader
+        first = lines.index("") - 2
+        lines.insert(first, "   ")
+        second = lines.index("", first + 3) + 2
+        lines.insert(second, "\r")
+        text = "\n".join(lines) + "\n"
+        _, gold = CoNLLDataReader().read_blocks_in(io.StringIO(text))
+        clusters = as_clusters(gold)
+
+        out_file = io.StringIO()
+        write_conll(io.StringIO(text), out_file, iter([clusters]))
+        _, written_gold = CoNLLDataReader().read_blocks_in(
+            io.StringIO(out_file.getvalue()))
+        assert as_clusters(written_gold) == clusters
+
+    def test_output_written_when_read_and_done(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with open(TEST_FILE, 'r') as f:
+                text = f.read().rstrip("\n") + "\n"
+            path = os.path.join(directory, "two_parts.v4_auto_conll")
+            with open(path, 'w') as f:
+                f.write(text + text.replace("part 000", "part 001"))
+            out_put_path = os.path.join(
+                directory, get_conll_output_name("two_parts.v4_auto_conll"))
+
+            data_reader = CoNLLDataReader()
+            conll_output = ConllOutput(directory, data_reader)
+            names = [document[0] for document
+                     in data_reader.iterate_documents(path)]
+            # the documents are registered while the file is read
+            conll_output.add_document("a", path, names[0])
+            conll_output.document_done("a", names[0], [[(0, 1, 1),
+                                                        (1, 0, 0)]])
+            conll_output.add_document("a", path, names[1])
+            conll_output.input_read("a", path)
+            assert not os.path.isfile(out_put_path)
+            conll_output.document_done("a", names[1], [])
+
+            with open(out_put_path, 'r') as f:
+                read_parts = data_reader.read_parts_in(f)
+            assert [as_clusters(part[3]) for part in read_parts] == \
+                [[[(0, 1, 1), (1, 0, 0)]], []]
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,81 @@
+import itertools
+import random
+from unittest import TestCase
+
+from MultiSievePassCorefResolution.coreference_metrics import METRICS, \
+    OverlapTable, get_max_assignment, get_metric_counts, get_metric_scores, \
+    scores_from_metric_counts, sum_metric_counts
+
+
+class TestCoreferenceMetrics(TestCase):
+
+    def setUp(self):
+        # example of Pradhan et al. (2014), scored with the reference scorer
+        self.key = [["a", "b", "c"], ["d", "e", "f", "g"]]
+        self.response = [["a", "b"], ["c", "d"], ["f", "g", "h", "i"]]
+
+    def assert_scores(self, counts, precision, recall):
+        scores = scores_from_metric_counts(counts)
+        assert abs(scores[0] - precision) < 1e-4
+        assert abs(scores[1] - recall) < 1e-4
+
+    def test_reference_example(self):
+        metric_counts = get_metric_counts(self.key, self.response)
+        self.assert_scores(metric_counts["muc"], 0.4, 0.4)
+        self.assert_scores(metric_counts["bcub"], 0.5, 0.4167)
+        self.assert_scores(metric_counts["ceafe"], 0.4333, 0.65)
+
+        scores, conll_f1 = get_metric_scores(metric_counts)
+        assert abs(conll_f1 - sum(scores[metric]["f1"]
+                                  for metric in METRICS) / 3) < 1e-12
+
+    def test_identical_clusters(self):
+        scores, conll_f1 = get_metric_scores(
+            get_metric_counts(self.key, self.key))
+        assert all(scores[metric]["f1"] == 1.0 for metric in METRICS)
+        assert conll_f1 == 1.0
+
+        # no clusters on one side
+        scores, conll_f1 = get_metric_scores(get_metric_counts(self.key, []))
+        assert conll_f1 == 0.0
+
+    def test_mentions_as_lists_and_tuples(self):
+        key = [[[0, 1, 2], [1, 3, 3]], [[2, 0, 0], [2, 5, 6]]]
+        response = [[(0, 1, 2), (1, 3, 3), (2, 0, 0)]]
+        table = OverlapTable(key, response)
+        assert dict(table.overlaps) == {(0, 0): 2, (1, 0): 1}
+        assert table.get_muc_counts() == [1, 2, 1, 2]
+
+    def test_max_assignment(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            rows, columns = rng.randint(1, 5), rng.randint(1, 5)
+            weights = [[rng.choice([0.0, rng.random()])
+                        for _ in range(columns)] for _ in range(rows)]
+            assignment = get_max_assignment(weights)
+            assert len({row for row, _ in assignment}) == len(assignment)
+            assert len({column for _, column in assignment}) \
+                == len(assignment)
+
+            # every assignment of the smaller side to the larger one
+            pairs = [[(row, column) for row, column
+                      in zip(range(rows), order)] for order
+                     in itertools.permutations(range(columns), rows)] \
+                if rows <= columns else \
+                [[(row, column) for row, column
+                  in zip(order, range(columns))] for order
+                 in itertools.permutations(range(rows), columns)]
+            best = max(sum(weights[row][column] for row, column in pairing)
+                       for pairing in pairs)
+            assert abs(sum(weights[row][column] for row, column
+                           in assignment) - best) < 1e-9
+
+    def test_sum_metric_counts(self):
+        first = get_metric_counts(self.key, self.response)
+        second = get_metric_counts(self.key, self.key)
+        summed = sum_metric_counts([first, second])
+        for metric in METRICS:
+            assert summed[metric] == [a + b for a, b
+                                      in zip(first[metric], second[metric])]
+        assert sum_metric_counts([]) == {metric: [0, 0, 0, 0]
+                                         for metric in METRICS}
@@ -0,0 +1,86 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.corpus_index import CorpusIndex, get_index_path
+from CorpusProcessing.manifest import get_file_hash
+from CorpusProcessing.scheduler import estimate_cost_from_tokens
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+
+TEST_FILE = "test_data/gold_test.v4_auto_conll"
+
+
+class TestCorpusIndex(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(TEST_FILE, 'r') as f:
+            text = f.read().rstrip("\n") + "\n"
+        self.path = os.path.join(self.directory, "two_parts.v4_auto_conll")
+        with open(self.path, 'w') as f:
+            f.write(text)
+            f.write(text.replace("part 000", "part 001"))
+        with gzip.open(self.path + ".gz", 'wt') as f:
+            f.write(text)
+
+        self.index = CorpusIndex(self.directory)
+        self.index.build(CoNLLDataReader().get_files_from_folder(
+            self.directory))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parts_and_sentences(self):
+        entry = self.index.files["two_parts.v4_auto_conll"]
+        dr = CoNLLDataReader()
+        dr.read_data_file(self.path)
+        assert [part["name"] for part in entry["parts"]] == \
+            [document[0] for document in dr.data]
+        for part, document in zip(entry["parts"], dr.data):
+            assert [sentence[2] for sentence in part["sentences"]] == \
+                [len(sentence) for sentence in document[1]]
+
+        # the manifest hash, the file is not read again to hash it
+        assert entry["hash"] == get_file_hash(self.path)
+
+        # compressed files can not be read at an offset
+        assert self.index.files["two_parts.v4_auto_conll.gz"]["parts"] \
+            is None
+
+    def test_find_and_read_document(self):
+        found = self.index.find_documents(["two_parts.v4_auto_conll_part_001"])
+        assert len(found) == 1
+        path, part = found[0]
+        assert path == self.path
+        text, gold = CoNLLDataReader().read_part(path, part["start"],
+                                                 part["end"])
+        assert (text, gold) == CoNLLDataReader().read_file_in(TEST_FILE)
+
+        # all parts of a document ID
+        assert len(self.index.find_documents(["bc/cctv/00/cctv_0000"])) == 2
+
+    def test_file_cost(self):
+        dr = CoNLLDataReader()
+        dr.read_data_file(self.path)
+        documents = DataTranformer().create_document_objects_from_data(
+            dr.data)
+        assert self.index.get_file_cost(self.path) == \
+            sum(estimate_cost_from_tokens(
+                len(sentence.list_of_sent_data)
+                for sentence in document.sentences)
+                for document in documents)
+        assert self.index.get_file_cost(self.path + ".gz") is None
+
+    def test_save_load_and_changed_file(self):
+        index_path = get_index_path(self.directory)
+        self.index.save(index_path)
+        loaded = CorpusIndex(self.directory)
+        loaded.load(index_path)
+        assert loaded.files == self.index.files
+
+        with open(self.path, 'a') as f:
+            f.write("\n")
+        assert loaded.get_entry(self.path) is None
@@ -0,0 +1,91 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+
+TEST_FILE = "test_data/gold_test.v4_auto_conll"
+
+
+class TestDocumentParts(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.expected = CoNLLDataReader().read_file_in(TEST_FILE)
+
+        # the test document twice, as part 000 and part 001
+        with open(TEST_FILE, 'r') as f:
+            text = f.read().rstrip("\n") + "\n"
+        self.path = os.path.join(self.directory, "two_parts.v4_auto_conll")
+        with open(self.path, 'w') as f:
+            f.write(text)
+            f.write(text.replace("part 000", "part 001"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_one_document_per_part(self):
+        dr = CoNLLDataReader()
+        dr.read_data_file(self.path)
+        assert [document[0] for document in dr.data] == [
+            "two_parts.v4_auto_conll_part_000",
+            "two_parts.v4_auto_conll_part_001"]
+        # sentence numbers and gold IDs of each part start anew
+        for document in dr.data:
+            assert tuple(document[1:]) == self.expected
+
+    def test_parts_are_read_one_after_another(self):
+        dr = CoNLLDataReader()
+        with open(self.path, 'r') as f:
+            text = f.read()
+        stream = io.StringIO(text)
+        parts = dr.iterate_parts_in(stream, block_size=1000)
+        first = next(parts)
+        # the first part is yielded before the stream is read completely
+        assert stream.tell() < len(text)
+        assert tuple(first[2:]) == self.expected
+        assert [part[:2] for part in [first] + list(parts)] == [
+            ["bc/cctv/00/cctv_0000", "000"], ["bc/cctv/00/cctv_0000", "001"]]
+
+        documents = dr.iterate_documents(self.path)
+        assert next(documents)[0] == "two_parts.v4_auto_conll_part_000"
+        # nothing is added to the data of the reader
+        assert dr.data == []
+        assert [document[0] for document in documents] == [
+            "two_parts.v4_auto_conll_part_001"]
+
+    def test_compressed_parts(self):
+        path = self.path + ".gz"
+        with open(self.path, 'rb') as f_in, gzip.open(path, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        dr = CoNLLDataReader()
+        dr.read_data_file(path)
+        assert len(dr.data) == 2
+
+    def test_read_part_by_offsets(self):
+        dr = CoNLLDataReader()
+        offsets = dr.get_part_offsets(self.path)
+        assert [offset[:2] for offset in offsets] == [
+            ("bc/cctv/00/cctv_0000", "000"), ("bc/cctv/00/cctv_0000", "001")]
+        assert offsets[0][2] == 0
+        assert offsets[0][3] == offsets[1][2]
+        assert offsets[1][3] == os.path.getsize(self.path)
+        for document_id, part, start, end in offsets:
+            assert dr.read_part(self.path, start, end) == self.expected
+
+    def test_file_without_parts(self):
+        dr = CoNLLDataReader()
+        with open(TEST_FILE, 'r') as f:
+            lines = [line for line in f if not line.startswith("#")]
+        path = os.path.join(self.directory, "no_parts.v4_auto_conll")
+        with open(path, 'w') as f:
+            f.writelines(lines)
+
+        assert dr.get_part_offsets(path) == [
+            (None, None, 0, os.path.getsize(path))]
+        dr.read_data_file(path)
+        assert dr.data[0][0] == "no_parts.v4_auto_conll"
+        assert tuple(dr.data[0][1:]) == self.expected
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
+    import ExactMatchSieve
+
+
+def cluster_state(document):
+    return [(ID, list(cluster.mentions))
+            for ID, cluster in document.clusters.items()]
+
+
+class TestDocumentSnapshot(TestCase):
+
+    def setUp(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        self.document = DataTranformer().create_document_objects_from_data(
+            [["gold_test", text, gold]])[0]
+        self.document.extract_mentions()
+
+    def test_restore_undoes_sieve(self):
+        before = cluster_state(self.document)
+        snapshot = self.document.snapshot_clusters()
+        ExactMatchSieve().sieve(self.document)
+        after = cluster_state(self.document)
+        assert after != before
+
+        changes = self.document.get_cluster_changes(snapshot)
+        assert len(changes) == len(before) - len(after)
+
+        self.document.restore_clusters(snapshot)
+        assert cluster_state(self.document) == before
+
+        # sieving again gives the same result as the first time
+        ExactMatchSieve().sieve(self.document)
+        assert cluster_state(self.document) == after
+
+    def test_nested_snapshots(self):
+        outer = self.document.snapshot_clusters()
+        before = cluster_state(self.document)
+        mention_a, mention_b = list(self.document.mentions.values())[:2]
+        self.document.unify_clusters(mention_a, mention_b)
+
+        inner = self.document.snapshot_clusters()
+        middle = cluster_state(self.document)
+        ExactMatchSieve().sieve(self.document)
+
+        self.document.restore_clusters(inner)
+        assert cluster_state(self.document) == middle
+        self.document.restore_clusters(outer)
+        assert cluster_state(self.document) == before
+
+        # the inner snapshot is not valid anymore
+        with self.assertRaises(ValueError):
+            self.document.restore_clusters(inner)
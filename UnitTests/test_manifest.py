@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.manifest import RunManifest, get_file_hash, \
+    get_code_version
+
+
+class TestRunManifest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, "output_a.json"), 'w') as f:
+            f.write("{}")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_entry_written_when_all_documents_done(self):
+        manifest = RunManifest(self.directory, ["exact"], "v1")
+        manifest.add_document("a", "output_a.json")
+        manifest.add_document("a", "output_b.json")
+        manifest.input_read("a", "hash")
+        manifest.document_done("a")
+        assert not manifest.is_up_to_date("a", "hash")
+        manifest.document_done("a")
+
+        with open(os.path.join(self.directory, "output_b.json"), 'w') as f:
+            f.write("{}")
+
+        loaded = RunManifest(self.directory, ["exact"], "v1")
+        loaded.load()
+        assert loaded.is_up_to_date("a", "hash")
+        assert not loaded.is_up_to_date("a", "other hash")
+        assert not loaded.is_up_to_date("b", "hash")
+
+        # missing output
+        os.remove(os.path.join(self.directory, "output_b.json"))
+        assert not loaded.is_up_to_date("a", "hash")
+
+    def test_documents_registered_while_reading(self):
+        manifest = RunManifest(self.directory, ["exact"], "v1")
+        manifest.add_document("a", "output_a.json")
+        manifest.document_done("a")
+        # more documents of the file may follow
+        assert not manifest.is_up_to_date("a", "hash")
+        manifest.input_read("a", "hash")
+        assert manifest.is_up_to_date("a", "hash")
+
+        manifest.add_document("b", "output_a.json")
+        manifest.input_read("b", "hash", ["output_b"])
+        assert not manifest.is_up_to_date("b", "hash")
+        manifest.document_done("b")
+        assert manifest.entries["b"]["outputs"] == ["output_a.json",
+                                                    "output_b"]
+
+        # a file without documents is finished when it is read
+        manifest.input_read("c", "hash")
+        assert manifest.is_up_to_date("c", "hash")
+
+    def test_configuration_changes(self):
+        manifest = RunManifest(self.directory, ["exact"], "v1")
+        manifest.add_document("a", "output_a.json")
+        manifest.input_read("a", "hash")
+        manifest.document_done("a")
+
+        for sieves, code_version in [(["exact", "pronoun"], "v1"),
+                                     (["exact"], "v2")]:
+            loaded = RunManifest(self.directory, sieves, code_version)
+            loaded.load()
+            assert not loaded.is_up_to_date("a", "hash")
+
+        # the same sieves on gold mentions
+        loaded = RunManifest(self.directory, ["exact"], "v1", "gold")
+        loaded.load()
+        assert not loaded.is_up_to_date("a", "hash")
+
+    def test_code_version_of_all_sources(self):
+        for code_dir in ["DataReader", "MultiSievePassCorefResolution",
+                         "CorpusProcessing"]:
+            os.mkdir(os.path.join(self.directory, code_dir))
+        versions = {get_code_version(self.directory)}
+        for path in ["resolve.py", "CorpusProcessing/conll_writer.py",
+                     "DataReader/reader.py"]:
+            with open(os.path.join(self.directory, path), 'w') as f:
+                f.write("# changed")
+            versions.add(get_code_version(self.directory))
+        assert len(versions) == 4
+
+    def test_hashes(self):
+        path = os.path.join(self.directory, "output_a.json")
+        assert get_file_hash(path) == get_file_hash(path)
+        assert len(get_code_version()) == 64
+
+    def test_budget_and_degraded_documents(self):
+        budget = {"document_seconds": 2.0, "max_candidates": 50}
+        manifest = RunManifest(self.directory, ["exact"], "v1",
+                               budget=budget)
+        manifest.add_document("a", "output_a.json")
+        manifest.input_read("a", "hash")
+        manifest.document_done("a")
+
+        for other_budget in [None, {"document_seconds": 2.0}]:
+            loaded = RunManifest(self.directory, ["exact"], "v1",
+                                 budget=other_budget)
+            loaded.load()
+            assert not loaded.is_up_to_date("a", "hash")
+        loaded = RunManifest(self.directory, ["exact"], "v1", budget=budget)
+        loaded.load()
+        assert loaded.is_up_to_date("a", "hash")
+
+        # a degraded document replaces the valid entry
+        manifest.add_document("a", "output_a.json")
+        manifest.input_read("a", "hash")
+        manifest.document_done("a", degraded=True)
+        assert manifest.entries["a"]["degraded"]
+        loaded.load()
+        assert not loaded.is_up_to_date("a", "hash")
@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.memory_profile import MemoryProfiler
+
+
+class TestMemoryProfiler(TestCase):
+
+    def setUp(self):
+        self.profiler = MemoryProfiler(top=5)
+        self.profiler.start()
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def test_growth_per_document_and_token(self):
+        self.profiler.begin("document")
+        data = [bytearray(1000) for _ in range(100)]
+        self.profiler.record("read", "document", documents=1, tokens=10)
+        self.profiler.record("transform", "document", documents=1, tokens=10,
+                             end=True)
+
+        stages = self.profiler.get_report()["stages"]
+        assert stages["read"]["grown_bytes"] >= 100 * 1000
+        assert stages["read"]["bytes_per_token"] \
+            == stages["read"]["grown_bytes"] / 10
+        # nothing was allocated in the second stage
+        assert stages["transform"]["grown_bytes"] < 1000
+        del data
+
+    def test_top_allocation_sites(self):
+        self.profiler.begin("document")
+        data = [bytearray(10000) for _ in range(100)]
+        self.profiler.record("read", "document", tokens=1)
+
+        report = self.profiler.get_report()
+        assert report["peak_stage"] == "read"
+        assert report["peak_bytes"] >= 100 * 10000
+        assert len(report["top_lines"]) <= 5
+        assert report["top_lines"][0]["site"].startswith(__file__)
+        assert report["top_lines"][0]["bytes"] >= 100 * 10000
+        del data
+
+    def test_write_report(self):
+        self.profiler.begin("document")
+        self.profiler.record("write", "document", tokens=1, end=True)
+        with tempfile.TemporaryDirectory() as out_put_dir:
+            report_path = os.path.join(out_put_dir, "memory_profile.json")
+            self.profiler.write_report(report_path)
+            with open(report_path, encoding='utf-8') as f:
+                report = json.load(f)
+
+        assert report["stages"]["write"]["documents"] == 1
+        assert "write" in self.profiler.format_report()
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.sentence_class import Sentence
+
+
+class TestMentionExtraction(TestCase):
+
+    def test_unary_chain_gives_one_mention(self):
+        # (NP (NP (NNP John))) is one mention
+        sentence = Sentence([('0', 'John', 'NNP', '(TOP(S(NP(NP(NP*)))'),
+                             ('1', 'sleeps', 'VBZ', '(VP*)'),
+                             ('2', '.', '.', '*))')])
+        assert [mention[1] for mention in sentence.mentions] == [(0, 0)]
+        assert sentence.merged_mentions == 2
+
+    def test_no_orphan_clusters(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        document = DataTranformer().create_document_objects_from_data(
+            [["gold_test", text, gold]])[0]
+        document.extract_mentions()
+
+        # one cluster per mention and every cluster has its mention
+        assert len(document.clusters) == len(document.mentions)
+        for mention in document.mentions.values():
+            assert document.clusters[mention.cluster_ID].head_mention_span \
+                == mention.sent_num_span
+
+        stats = document.get_mention_stats()
+        assert stats["mentions"] == len(document.mentions)
+        assert stats["noun_phrases"] == stats["mentions"] + stats["merged"]
+
+    def test_gold_mentions(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        document = DataTranformer().create_document_objects_from_data(
+            [["gold_test", text, gold]], requirements=frozenset(),
+            gold_mentions=True)[0]
+        document.extract_mentions()
+
+        # the mentions are exactly the gold spans, no tree was built
+        gold_spans = {tuple(mention) for cluster in gold.values()
+                      for mention in cluster}
+        assert set(document.mentions) == gold_spans
+        assert all(sentence.tree is None for sentence in document.sentences)
+
+    def test_gold_mentions_levelorder(self):
+        sentence = Sentence([('0', 'the', 'DT', '*'),
+                             ('1', 'man', 'NN', '*'),
+                             ('2', 'and', 'CC', '*'),
+                             ('3', 'his', 'PRP$', '*'),
+                             ('4', 'dog', 'NN', '*')],
+                            requirements=frozenset(),
+                            mention_spans=[(3, 4), (0, 4), (0, 1), (3, 3),
+                                           (0, 1)])
+        assert [mention[1] for mention in sentence.mentions] \
+            == [(0, 4), (0, 1), (3, 4), (3, 3)]
+        # enclosing mentions first, then by position
+        assert [spans[0] for spans in sentence.levelorder(True)] \
+            == [(0, 4), (0, 1), (3, 4), (3, 3)]
+        assert [spans[0] for spans in sentence.levelorder(False)] \
+            == [(0, 4), (3, 4), (0, 1), (3, 3)]
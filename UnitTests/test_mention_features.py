@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
+    import ExactMatchSieve
+from MultiSievePassCorefResolution.Sieves.precise_construct_sieve \
+    import PreciseConstructSieve
+from MultiSievePassCorefResolution.Sieves.pronoun_sieve import PronounSieve
+
+
+class TestMentionFeatures(TestCase):
+
+    def setUp(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        self.document = DataTranformer().create_document_objects_from_data(
+            [["gold_test", text, gold]], dr.vocabulary)[0]
+        self.document.extract_mentions()
+
+    def test_candidate_rows(self):
+        for mention in self.document.mentions.values():
+            for left_to_right in [True, False]:
+                candidates = self.document.get_candidates(mention,
+                                                          left_to_right)
+                rows = self.document.get_candidate_rows(mention, left_to_right)
+                assert list(rows) == [c.table_idx for c in candidates]
+
+    def test_masks_agree_with_is_compatible(self):
+        features = self.document.get_mention_features()
+        for sieve in [ExactMatchSieve(), PronounSieve(),
+                      PreciseConstructSieve()]:
+            for mention in self.document.mentions.values():
+                rows = self.document.get_candidate_rows(mention, True)
+                mask = sieve.compatibility_mask(mention, rows, features)
+                compatible = [bool(sieve.is_compatible(
+                    mention, features.mentions[row], self.document))
+                    for row in rows]
+                # the mask is only used for mentions passing the prefilter
+                if not sieve.prefilter_mention(mention):
+                    continue
+                if sieve.mask_is_complete:
+                    assert list(mask) == compatible
+                else:
+                    assert all(compatible[i] for i in range(len(rows))
+                               if mask[i])
+
+    def test_sentence_distance(self):
+        features = self.document.get_mention_features()
+        mention = list(self.document.mentions.values())[-1]
+        rows = self.document.get_candidate_rows(mention, True)
+        distance = features.get_sentence_distance(mention.table_idx, rows)
+        assert set(distance) <= {0, 1}
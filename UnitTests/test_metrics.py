@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from CorpusProcessing.metrics import RunMetrics
+
+
+class TestRunMetrics(TestCase):
+
+    def test_counts_and_percentiles(self):
+        metrics = RunMetrics(workers=2)
+        document = SimpleNamespace(
+            sentences=[SimpleNamespace(list_of_sent_data=[None] * 5),
+                       SimpleNamespace(list_of_sent_data=[None] * 3)],
+            mentions={1: None, 2: None}, merged_mentions=1)
+        for i in range(100):
+            metrics.document_submitted()
+            metrics.document_started()
+            metrics.record_stage("sieves", i / 100)
+            metrics.document_finished(document, 0.01)
+        metrics.document_submitted()
+
+        snapshot = metrics.get_snapshot()
+        assert snapshot["counts"] == {"documents": 100, "sentences": 200,
+                                      "tokens": 800, "mentions": 200,
+                                      "merged_mentions": 100}
+        assert snapshot["queued"] == 1
+        assert snapshot["running"] == 0
+        assert snapshot["percentiles"]["sieves"][0.5] == 0.5
+        assert snapshot["percentiles"]["sieves"][0.99] == 0.99
+
+        prometheus = metrics.to_prometheus()
+        assert "coref_documents_total 100\n" in prometheus
+        assert 'coref_stage_seconds_count{stage="sieves"} 100\n' in prometheus
+        assert "coref_queued_documents 1\n" in prometheus
+        assert "docs" in metrics.format_progress_line()
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.errors import UnknownSieveError
+from MultiSievePassCorefResolution.pipeline import Pipeline
+
+
+class TestPipeline(TestCase):
+
+    def setUp(self):
+        with open("test_data/gold_test.v4_auto_conll", encoding='utf-8') as f:
+            self.text = f.read().rstrip("\n") + "\n"
+        dr = CoNLLDataReader()
+        self.sentences, self.gold = dr.read_file_in(
+            "test_data/gold_test.v4_auto_conll")
+        self.pipeline = Pipeline()
+
+    def test_text(self):
+        results = self.pipeline.resolve(self.text, "gold_test")
+        assert len(results) == 1
+        assert results[0]["document"] == "gold_test"
+        assert results[0]["clusters"]
+        assert 0.0 < results[0]["f1"] <= 1.0
+        assert 0.0 < results[0]["precision"] <= 1.0
+        assert set(results[0]["metrics"]) == {"muc", "bcub", "ceafe"}
+        assert 0.0 < results[0]["conll_f1"] <= 1.0
+
+    def test_tuples_and_documents(self):
+        expected = self.pipeline.resolve(self.text, "gold_test")[0]
+
+        # (token, pos_tag, tree_part) without the index
+        sentences = [[elem[1:] for elem in sentence]
+                     for sentence in self.sentences]
+        result = self.pipeline.resolve(sentences, "gold_test",
+                                       list(self.gold.values()))[0]
+        assert result == expected
+
+        document = DataTranformer().create_document_objects_from_data(
+            [["gold_test", self.sentences, self.gold]])[0]
+        assert self.pipeline.resolve(document)[0] == expected
+
+    def test_document_parts(self):
+        # the test document twice, as part 000 and part 001
+        text = self.text + self.text.replace("part 000", "part 001")
+        results = self.pipeline.resolve(text, "a")
+        assert [result["document"] for result in results] \
+            == ["a_part_000", "a_part_001"]
+        assert results[0]["clusters"] == results[1]["clusters"]
+
+    def test_resolve_all_in_threads(self):
+        sieve_objects = list(self.pipeline.sieve_objects)
+        expected = list(self.pipeline.resolve_all([self.text] * 5))
+        results = list(self.pipeline.resolve_all([self.text] * 5, workers=3))
+        assert results == expected
+        assert [result["document"] for result in results] \
+            == [f"document_{i}" for i in range(5)]
+        # the same sieve objects are used for all documents
+        assert self.pipeline.sieve_objects == sieve_objects
+
+    def test_configuration(self):
+        with self.assertRaises(UnknownSieveError):
+            Pipeline(["exact", "unknown"])
+        with self.assertRaises(ValueError):
+            Pipeline(mentions="predicted")
+
+        pipeline = Pipeline("exact,pronoun", mentions="gold")
+        assert pipeline.sieve_names == ["exact", "pronoun"]
+        result = pipeline.resolve(self.text)[0]
+        assert result["mention_stats"]["mentions"] \
+            == len({tuple(mention) for cluster in self.gold.values()
+                    for mention in cluster})
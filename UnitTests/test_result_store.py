@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.result_store import ResultStore
+from MultiSievePassCorefResolution.pipeline import Pipeline
+
+
+class TestResultStore(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "results.db")
+        with open("test_data/gold_test.v4_auto_conll", encoding='utf-8') as f:
+            text = f.read()
+        pipeline = Pipeline()
+        self.results = []
+        for name in ["a", "b", "c"]:
+            document = pipeline.create_documents(text, name)[0]
+            self.results.append((pipeline.resolve_document(document),
+                                 document))
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def store_run(self, batch_size=2):
+        store = ResultStore(self.path, batch_size)
+        store.start("test_data", ["exact", "precise", "pronoun"])
+        for result, document in self.results:
+            store.add_document(result, document)
+        store.close()
+        return store.run_id
+
+    def test_rows(self):
+        run_id = self.store_run()
+        connection = sqlite3.connect(self.path)
+        result, document = self.results[0]
+
+        assert connection.execute(
+            "SELECT count(*) FROM documents WHERE run_id = ?",
+            (run_id,)).fetchone()[0] == 3
+        f1_score = connection.execute(
+            "SELECT f1 FROM scores WHERE document = 'a' AND metric = "
+            "'pairwise'").fetchone()[0]
+        assert abs(f1_score - result["f1"]) < 1e-9
+
+        sizes = connection.execute(
+            "SELECT size FROM clusters WHERE document = 'a' "
+            "ORDER BY cluster_id").fetchall()
+        assert [size for size, in sizes] \
+            == [len(cluster) for cluster in result["clusters"]]
+
+        # the surface forms of the clustered mentions
+        sent_num, span_start, span_end = result["clusters"][0][0]
+        surface = connection.execute(
+            "SELECT surface FROM mentions WHERE document = 'a' AND "
+            "sent_num = ? AND span_start = ? AND span_end = ?",
+            (sent_num, span_start, span_end)).fetchone()[0]
+        assert surface == document.mentions[
+            (sent_num, span_start, span_end)].get_mention_as_str()
+        connection.close()
+
+    def test_runs_can_be_compared(self):
+        first_run = self.store_run()
+        second_run = self.store_run(batch_size=500)
+        assert second_run == first_run + 1
+
+        connection = sqlite3.connect(self.path)
+        changed = connection.execute(
+            "SELECT count(*) FROM scores a JOIN scores b "
+            "ON a.document = b.document AND a.metric = b.metric "
+            "WHERE a.run_id = ? AND b.run_id = ? AND a.f1 != b.f1",
+            (first_run, second_run)).fetchone()[0]
+        assert changed == 0
+        connection.close()
+
+    def test_invalid_path(self):
+        store = ResultStore(os.path.join(self.temporary_directory.name,
+                                         "missing", "results.db"))
+        with self.assertRaises(sqlite3.Error):
+            store.start()
+
+    def test_failing_insert_is_raised(self):
+        class Unbindable:
+            def __conform__(self, protocol):
+                raise ValueError("can not be stored")
+
+        result, _ = self.results[0]
+        store = ResultStore(self.path)
+        store.start()
+        store.add_document(dict(result, document=Unbindable()))
+        with self.assertRaises(ValueError):
+            store.close()
+        with self.assertRaises(ValueError):
+            store.add_document(result)
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures.thread import ThreadPoolExecutor
+from unittest import TestCase
+
+from CorpusProcessing.scheduler import BoundedExecutor, \
+    estimate_cost_from_tokens, order_longest_first
+
+
+class TestBoundedExecutor(TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def work(self, seconds):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+
+    def test_max_documents(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bounded_executor = BoundedExecutor(executor, max_documents=3)
+            for _ in range(12):
+                bounded_executor.submit(self.work, 0.01)
+                assert bounded_executor.in_flight_documents <= 3
+            bounded_executor.wait()
+
+        assert self.max_running <= 3
+        assert bounded_executor.in_flight_documents == 0
+
+    def test_max_tokens(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bounded_executor = BoundedExecutor(executor, max_documents=8,
+                                               max_tokens=100)
+            for _ in range(8):
+                bounded_executor.submit(self.work, 0.01, tokens=40)
+                assert bounded_executor.in_flight_tokens <= 100
+            # larger than the limit, accepted when nothing is in flight
+            bounded_executor.submit(self.work, 0.01, tokens=500)
+            bounded_executor.wait()
+
+        assert self.max_running <= 2
+
+    def test_errors_raised_on_wait(self):
+        def fail():
+            raise RuntimeError("broken document")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bounded_executor = BoundedExecutor(executor, max_documents=2)
+            bounded_executor.submit(fail)
+            with self.assertRaises(RuntimeError):
+                bounded_executor.wait()
+
+    def test_makespan(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bounded_executor = BoundedExecutor(executor, max_documents=2)
+            for seconds in [0.05, 0.01, 0.01]:
+                bounded_executor.submit(self.work, seconds)
+            bounded_executor.wait()
+
+        makespan, ideal = bounded_executor.get_makespan(2)
+        assert bounded_executor.longest_seconds >= 0.05
+        assert ideal >= bounded_executor.longest_seconds
+        assert makespan >= ideal * 0.9
+
+
+class TestLongestFirst(TestCase):
+
+    def test_order_longest_first(self):
+        small = [3, 3]
+        large = [20]
+        many_sentences = [5, 5, 5]
+        assert estimate_cost_from_tokens(small) == 9 + 3 * 6
+        ordered = order_longest_first([small, large, many_sentences],
+                                      estimate_cost_from_tokens)
+        assert ordered == [large, many_sentences, small]
+        assert order_longest_first([1, 2, 3], lambda item: 0) == [1, 2, 3]
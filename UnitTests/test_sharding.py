@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from CorpusProcessing.sharding import parse_shard, select_shard, \
+    merge_shard_outputs
+
+
+class TestSharding(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+        for i in range(20):
+            path = os.path.join(self.directory, f"doc_{i}.v4_auto_conll")
+            with open(path, 'w') as f:
+                f.write("x" * (i * 100 + 1))
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parse_shard(self):
+        assert parse_shard("1/4") == (1, 4)
+        for shard in ["4/4", "-1/4", "1", "a/b", "0/0"]:
+            with self.assertRaises(ValueError):
+                parse_shard(shard)
+
+    def test_shards_partition_files(self):
+        for balance_by_size in [False, True]:
+            selected = []
+            for shard_index in range(3):
+                selected.extend(select_shard(self.files, shard_index, 3,
+                                             balance_by_size, self.directory))
+            assert sorted(selected) == sorted(self.files)
+
+    def test_hash_independent_of_root(self):
+        shard = select_shard(self.files, 0, 3, root=self.directory)
+        relative = [os.path.relpath(path, self.directory)
+                    for path in self.files]
+        relative_shard = select_shard(relative, 0, 3)
+        assert [os.path.basename(path) for path in shard] == relative_shard
+
+    def test_balance_by_size(self):
+        sizes = []
+        for shard_index in range(4):
+            shard = select_shard(self.files, shard_index, 4, True)
+            sizes.append(sum(os.path.getsize(path) for path in shard))
+        assert max(sizes) - min(sizes) <= 2000
+
+    def test_merge_shard_outputs(self):
+        shard_dirs = [os.path.join(self.directory, "shard_0"),
+                      os.path.join(self.directory, "shard_1")]
+        for i, shard_dir in enumerate(shard_dirs):
+            os.mkdir(shard_dir)
+            out_put = {"document": f"doc_{i}", "clusters": [], "f1": 0.5,
+                       "pair_counts": {"true_positives": 1,
+                                       "false_positives": 1,
+                                       "false_negatives": i}}
+            with open(os.path.join(shard_dir, f"output_doc_{i}.json"),
+                      'w') as f:
+                json.dump(out_put, f)
+
+        merged = merge_shard_outputs(shard_dirs)
+        assert len(merged["documents"]) == 2
+        assert merged["true_positives"] == 2
+        assert merged["false_negatives"] == 1
+        assert merged["precision"] == 0.5
+
+        with self.assertRaises(ValueError):
+            merge_shard_outputs([shard_dirs[0], shard_dirs[0]])
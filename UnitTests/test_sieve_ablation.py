@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
+    import ExactMatchSieve
+from MultiSievePassCorefResolution.Sieves.pronoun_sieve import PronounSieve
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+from MultiSievePassCorefResolution.sieve_ablation import SieveAblation
+
+
+def read_documents():
+    dr = CoNLLDataReader()
+    text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+    return DataTranformer().create_document_objects_from_data(
+        [["gold_test", text, gold]])
+
+
+class TestSieveAblation(TestCase):
+
+    def test_counts_equal_independent_runs(self):
+        exact = ExactMatchSieve()
+        pronoun = PronounSieve()
+        configurations = [[exact, pronoun], [exact], [pronoun, exact], []]
+
+        ablation = SieveAblation(configurations)
+        for document in read_documents():
+            ablation.run(document)
+
+        for idx, sieve_objects in enumerate(configurations):
+            document = read_documents()[0]
+            document.extract_mentions()
+            resolver = CoreferenceChainResolver()
+            resolver.resolve(document, sieve_objects)
+            resolver.sieve_mentions()
+            counts = resolver.count_pairs(document.gold)
+            assert tuple(ablation.counts[idx]) == counts
+
+        assert ablation.documents == 1
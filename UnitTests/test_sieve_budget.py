@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
+    import ExactMatchSieve
+from MultiSievePassCorefResolution.Sieves.precise_construct_sieve \
+    import PreciseConstructSieve
+from MultiSievePassCorefResolution.Sieves.pronoun_sieve import PronounSieve
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+from MultiSievePassCorefResolution.sieve_budget import SieveBudget
+
+
+class ScalarExactMatchSieve(ExactMatchSieve):
+    """The exact match sieve without its vectorised rule."""
+
+    def compatibility_mask(self, mention, candidate_rows, features):
+        return None
+
+
+class TestSieveBudget(TestCase):
+
+    def setUp(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        self.data = [["gold_test", text, gold]]
+
+    def resolve(self, budget, sieves=None):
+        document = DataTranformer().create_document_objects_from_data(
+            self.data)[0]
+        document.extract_mentions()
+        resolver = CoreferenceChainResolver()
+        if sieves is None:
+            sieves = [ExactMatchSieve(), PreciseConstructSieve(),
+                      PronounSieve()]
+        resolver.resolve(document, sieves, budget)
+        resolver.sieve_mentions()
+        return document.get_relevant_clusters()
+
+    def test_unlimited_budget_is_not_degraded(self):
+        budget = SieveBudget()
+        assert self.resolve(budget) == self.resolve(None)
+        assert not budget.is_degraded()
+
+    def test_exceeded_document_budget(self):
+        # nothing is sieved, every sieve is skipped
+        budget = SieveBudget(document_seconds=0)
+        assert self.resolve(budget) == []
+        assert budget.is_degraded()
+        assert len(budget.degradations) == 3
+
+    def test_expensive_sieve_is_skipped_first(self):
+        budget = SieveBudget(document_seconds=60, expensive_fraction=0)
+        self.resolve(budget)
+        assert budget.degradations == [
+            "PreciseConstructSieve: skipped, document time budget "
+            "running short"]
+
+    def test_exceeded_sieve_budget(self):
+        budget = SieveBudget(sieve_seconds=0)
+        assert self.resolve(budget) == []
+        assert "ExactMatchSieve: stopped, time budget exceeded" \
+            in budget.degradations
+
+    def test_candidates_capped(self):
+        budget = SieveBudget(max_candidates=2)
+        assert budget.cap_candidates([1, 2], "Sieve") == [1, 2]
+        assert not budget.is_degraded()
+        assert budget.cap_candidates([1, 2, 3], "Sieve") == [1, 2]
+        assert budget.degradations == [
+            "Sieve: candidates capped at 2 per mention"]
+
+    def test_capped_before_vectorised_rules(self):
+        # with one candidate, matches that are not the closest candidate
+        # are not found, with or without the vectorised rule
+        capped = self.resolve(SieveBudget(max_candidates=1),
+                              [ExactMatchSieve()])
+        assert capped != self.resolve(None, [ExactMatchSieve()])
+        assert capped == self.resolve(SieveBudget(max_candidates=1),
+                                      [ScalarExactMatchSieve()])
@@ -0,0 +1,110 @@
+from unittest import TestCase
+
+from DataReader.conll_data_reader import CoNLLDataReader
+from DataReader.data_transformer import DataTranformer
+from MultiSievePassCorefResolution.Sieves.abstract_sieve_class import \
+    PARSE_TREE, SENTENCE_STRINGS
+from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
+    import ExactMatchSieve
+from MultiSievePassCorefResolution.errors import InvalidSieveClassError, \
+    UnknownSieveError
+from MultiSievePassCorefResolution.sieve_registry import SIEVES, \
+    parse_sieve_names, create_sieves, get_requirements, register_sieve, \
+    get_sieve_class
+
+
+class TestSieveRegistry(TestCase):
+
+    def test_parse_sieve_names(self):
+        assert parse_sieve_names("exact, pronoun") == ["exact", "pronoun"]
+        with self.assertRaises(UnknownSieveError):
+            parse_sieve_names("exact,unknown")
+
+    def test_create_sieves(self):
+        sieves = create_sieves(["exact", "exact"])
+        assert all(isinstance(sieve, ExactMatchSieve) for sieve in sieves)
+        assert sieves[0] is not sieves[1]
+
+    def test_requirements(self):
+        requirements = get_requirements(["exact", "pronoun"])
+        assert SENTENCE_STRINGS not in requirements
+        assert PARSE_TREE not in requirements
+        assert SENTENCE_STRINGS in get_requirements(["exact", "precise"])
+
+    def test_register_sieve(self):
+        with self.assertRaises(InvalidSieveClassError):
+            register_sieve("other", object)
+
+        class OtherSieve(ExactMatchSieve):
+            requires = ExactMatchSieve.requires | {PARSE_TREE}
+
+        register_sieve("other", OtherSieve)
+        try:
+            assert PARSE_TREE in get_requirements(["exact", "other"])
+        finally:
+            del SIEVES["other"]
+
+    def test_register_sieve_by_path(self):
+        # the module of the sieve is imported when the sieve is used
+        register_sieve("other", "MultiSievePassCorefResolution.Sieves."
+                                "exact_match_sieve.ExactMatchSieve")
+        register_sieve("invalid", "MultiSievePassCorefResolution."
+                                  "vocabulary_class.Vocabulary")
+        try:
+            assert get_sieve_class("other") is ExactMatchSieve
+            assert SIEVES["other"] is ExactMatchSieve
+            with self.assertRaises(InvalidSieveClassError):
+                get_sieve_class("invalid")
+            with self.assertRaises(UnknownSieveError):
+                get_sieve_class("unknown")
+        finally:
+            del SIEVES["other"], SIEVES["invalid"]
+
+
+class TestSentenceRequirements(TestCase):
+
+    def setUp(self):
+        dr = CoNLLDataReader()
+        text, gold = dr.read_file_in("test_data/gold_test.v4_auto_conll")
+        self.data = [["gold_test", text, gold]]
+
+    @staticmethod
+    def levelorder_of_tree(tree, left_to_right):
+        """Breadth-first traversal of the nltk Tree, like levelorder did."""
+        noun_phrases = []
+        queue = [tree]
+        while queue:
+            current_tree = queue.pop(0)
+            if isinstance(current_tree, str):
+                continue
+            children = list(current_tree)
+            for child in children if left_to_right else children[::-1]:
+                queue.append(child)
+                if not isinstance(child, str) and child.label() == "NP":
+                    noun_phrases.append(child.leaves())
+
+        return noun_phrases
+
+    def test_structures_not_required_are_built_on_first_use(self):
+        document = DataTranformer().create_document_objects_from_data(
+            self.data, requirements=get_requirements(["exact"]))[0]
+        sentence = document.sentences[0]
+        assert sentence.tree is None
+        assert sentence.sentence_str is None
+
+        tokens = [elem[1] for elem in sentence.list_of_sent_data]
+        assert sentence.get_sentence_as_str() == " ".join(tokens)
+        assert sentence.get_tree().leaves() == tokens
+
+    def test_levelorder_without_tree(self):
+        # the levelorder from the tree parts equals the traversal of the tree
+        for sentence in DataTranformer().create_document_objects_from_data(
+                self.data, requirements=frozenset())[0].sentences:
+            tokens = [elem[1] for elem in sentence.list_of_sent_data]
+            for left_to_right in (True, False):
+                spans = [span[0] for span
+                         in sentence.levelorder(left_to_right)]
+                leaves = self.levelorder_of_tree(sentence.get_tree(),
+                                                 left_to_right)
+                assert [tokens[start:end + 1] for start, end in spans] \
+                    == leaves
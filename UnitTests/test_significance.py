@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from CorpusProcessing.significance import f1_from_sums, load_run, \
+    compare_runs, paired_bootstrap
+from MultiSievePassCorefResolution.coreference_chain_resolver \
+    import CoreferenceChainResolver
+
+
+class TestSignificance(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        # b finds more of the gold pairs than a in every document
+        self.run_a = {}
+        self.run_b = {}
+        for i in range(40):
+            gold = int(rng.integers(5, 30))
+            found = int(rng.integers(0, gold // 2))
+            self.run_a[f"doc_{i}"] = [found, found + 3, found, gold]
+            self.run_b[f"doc_{i}"] = [found + 2, found + 4, found + 2, gold]
+
+    def test_f1_from_sums(self):
+        for counts in [(3, 2, 5), (0, 0, 0), (0, 4, 1), (7, 0, 0)]:
+            true_positives, false_positives, false_negatives = counts
+            sums = np.array([true_positives, true_positives + false_positives,
+                             true_positives, true_positives + false_negatives])
+            assert abs(f1_from_sums(sums) - CoreferenceChainResolver
+                       .f1_from_counts(*counts)) < 1e-12
+
+    def test_bootstrap_resamples_documents(self):
+        counts = np.array(list(self.run_a.values()), dtype=np.float64)
+        f1_a, f1_b = paired_bootstrap(counts, counts, 500,
+                                      np.random.default_rng(0))
+        assert f1_a.shape == (500,)
+        # the same documents are drawn for both runs
+        assert np.array_equal(f1_a, f1_b)
+        assert f1_a.std() > 0
+
+    def test_compare_runs(self):
+        comparison = compare_runs(self.run_a, self.run_b, 2000, 2000,
+                                  seed=0)
+        assert comparison["documents"] == 40
+        assert comparison["difference"] > 0
+        low, high = comparison["difference_interval"]
+        assert 0 < low <= comparison["difference"] <= high
+        assert comparison["bootstrap_p"] < 0.01
+        assert comparison["randomization_p"] < 0.01
+
+        # reproducible with a seed
+        assert compare_runs(self.run_a, self.run_b, 2000, 2000,
+                            seed=0)["randomization_p"] \
+            == comparison["randomization_p"]
+
+    def test_compare_equal_runs(self):
+        comparison = compare_runs(self.run_a, dict(self.run_a), 1000, 1000,
+                                  seed=0)
+        assert comparison["difference"] == 0
+        assert comparison["bootstrap_p"] == 1
+        assert comparison["randomization_p"] == 1
+
+        with self.assertRaises(ValueError):
+            compare_runs(self.run_a, {"other": [1, 1, 1, 1]})
+
+    def test_compare_conll(self):
+        # three metrics per document, b is better in the second one only
+        run_a = {name: counts * 3 for name, counts in self.run_a.items()}
+        run_b = {name: counts + self.run_b[name] + counts
+                 for name, counts in self.run_a.items()}
+        comparison = compare_runs(run_a, run_b, 1000, 1000, seed=0)
+        single = compare_runs(self.run_a, self.run_b, 10, 10, seed=0)
+        assert abs(comparison["difference"]
+                   - single["difference"] / 3) < 1e-12
+        assert comparison["randomization_p"] < 0.01
+
+    def test_load_run(self):
+        directory = tempfile.mkdtemp()
+        try:
+            out_put = {"document": "doc_0", "clusters": [], "f1": 0.5,
+                       "pair_counts": {"true_positives": 2,
+                                       "false_positives": 1,
+                                       "false_negatives": 3}}
+            with open(os.path.join(directory, "output_doc_0.json"),
+                      'w') as f:
+                json.dump(out_put, f)
+
+            assert load_run([directory]) == {"doc_0": [2, 3, 2, 5]}
+            with self.assertRaises(ValueError):
+                load_run([directory], "muc")
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# prints the modules imported by resolve.py that should be imported on demand
+CHECK_IMPORTS = """
+import sys
+import resolve
+from Benchmarks.benchmark_startup import LAZY_MODULES
+sieves = "MultiSievePassCorefResolution.Sieves."
+print(",".join(sorted(name for name in sys.modules
+                      if name.split(".")[0] == "nltk"
+                      or name.startswith(sieves)
+                      and not name.endswith("abstract_sieve_class")
+                      or name in LAZY_MODULES)))
+"""
+
+
+class TestStartup(TestCase):
+
+    def run_python(self, code):
+        return subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True, check=True).stdout
+
+    def test_lazy_imports(self):
+        assert self.run_python(CHECK_IMPORTS).strip() == ""
+
+    def test_sieves_and_tree_imported_on_use(self):
+        out_put = self.run_python("""
+import sys
+from MultiSievePassCorefResolution.pipeline import Pipeline
+pipeline = Pipeline(["exact"])
+with open("UnitTests/test_data/gold_test.v4_auto_conll") as f:
+    document = pipeline.create_documents(f.read())[0]
+print("nltk" in sys.modules, end=" ")
+document.sentences[0].get_tree()
+print("nltk" in sys.modules, end=" ")
+print("MultiSievePassCorefResolution.Sieves.pronoun_sieve" in sys.modules)
+""")
+        assert out_put.split() == ["False", "True", "False"]
@@ -0,0 +1,24 @@
+from unittest import TestCase
+
+from MultiSievePassCorefResolution.vocabulary_class import Vocabulary
+
+
+class TestVocabulary(TestCase):
+
+    def test_lower_ids(self):
+        vocabulary = Vocabulary()
+        IDs = vocabulary.get_ids(['The', 'summer', 'the', 'THE'])
+        assert IDs[0] != IDs[2]
+        assert len(set(vocabulary.get_lower_ids(IDs))) == 2
+        assert vocabulary.get_lower_ids(IDs)[0] == IDs[2]
+        assert vocabulary.get_token(vocabulary.get_lower_id(IDs[3])) == 'the'
+        # 'The', 'the', 'summer', 'THE'
+        assert len(vocabulary) == 4
+
+    def test_intern_returns_stored_string(self):
+        vocabulary = Vocabulary()
+        first = vocabulary.intern(''.join(['Hong', 'Kong']))
+        second = vocabulary.intern(''.join(['Hong', 'Kong']))
+        assert first is second
+        assert vocabulary.get_id('hongkong') is not None
+        assert vocabulary.get_id('unknown') is None
@@ -1,188 +1,775 @@
-# Script to determine conference chains using the Multi-Sieve-Pass Algorithm.
-from concurrent import futures
-from concurrent.futures import Executor
-from concurrent.futures.thread import ThreadPoolExecutor
-import threading
-import click
-import json
-
-# data reader and transformer
-from DataReader.conll_data_reader import CoNLLDataReader
-from DataReader.data_transformer import DataTranformer
-
-# sieve classes
-from MultiSievePassCorefResolution.Sieves.exact_match_sieve \
-    import ExactMatchSieve
-from MultiSievePassCorefResolution.Sieves.precise_construct_sieve \
-    import PreciseConstructSieve
-from MultiSievePassCorefResolution.Sieves.pronoun_sieve \
-    import PronounSieve
-
-# class dealing with the application of the sieves on the document object
-from MultiSievePassCorefResolution.coreference_chain_resolver \
-    import CoreferenceChainResolver
-
-
-def create_json_file(dictionary, filename_out):
-    """
-    Parameter:
-                dictionary : tokens are key, counts are values
-                filename_out (str) : path to the result csv-file
-
-    Create a json.file.
-    """
-    with open(filename_out, 'w',encoding='utf-8', newline='\n') \
-            as json_file:
-        json.dump(dictionary, json_file)
-
-
-def exec(document, out_put_dir):
-    """Running multiple threads. One document is one thread."""
-    print(f"thread {threading.current_thread().getName()} "
-          f"for file {document.path} started...")
-    document.extract_mentions()
-
-    # Instantiate sieve objects
-    exact_sieve_pass = ExactMatchSieve()
-    precise_construct_pass = PreciseConstructSieve()
-    pronoun_sieve = PronounSieve()
-
-    # Instantiate the CoreferenceChainResolver
-    coref_chain_resolver = CoreferenceChainResolver()
-    coref_chain_resolver.resolve(document, [exact_sieve_pass,
-                                            precise_construct_pass,
-                                            pronoun_sieve])
-
-    # Apply all sieves on the document
-    sieved_document_obj = coref_chain_resolver.sieve_mentions()
-
-    # Get modified cluster from document
-    clusters = sieved_document_obj.get_relevant_clusters()
-
-    # Evaluation:
-    f1_score = coref_chain_resolver.evaluate(document.gold)
-
-    # save results in a json file
-    out_put = dict()
-    out_put["document"] = sieved_document_obj.path
-    out_put["clusters"] = clusters
-    out_put["f1"] = f1_score
-
-    create_json_file(out_put, out_put_dir + "/output_"
-                     + sieved_document_obj.path + ".json")
-    print(f"thread {threading.current_thread().getName()} "
-          f"for file {document.path}  finished!")
-
-
-@click.command()
-@click.option('-f', 'file_path', type=click.Path(exists=True),
-              required=True, help='The file path (str) to the data.')
-@click.option('-o', 'out_put_dir', type=click.Path(exists=True),
-              required=True, help='The file path (str) were the output '
-                                  'will be saved.')
-def cli(file_path, out_put_dir):
-    data_reader = CoNLLDataReader()
-    data_reader.read_data(file_path)
-    data = data_reader.data
-    data_transformer = DataTranformer()
-    transformed_data = data_transformer.create_document_objects_from_data(data)
-
-    # thread pool for async processing of documents
-    executor = ThreadPoolExecutor(max_workers=None, thread_name_prefix='COREF')
-
-    # stores all submitted "future" objects
-    future_list = []
-
-    for document in transformed_data:
-        # on every document
-        # - sieves will be applied,
-        # - f1 score calculated and
-        # - json result written to file
-        # in a separate thread managed by the thread pool
-        future_list.append(executor.submit(exec, document, out_put_dir))
-
-    # waiting for all submitted futures to be finished before
-    # program will terminate
-    for future in future_list:
-        future.result()
-
-
-def demo():
-    # Instantiate a CoNLLDataReader object,
-    #   - which reads the data in from a given data path.
-    #   - The cleaned data is attribute from this class.
-    # data = [[file_path, documents[list of sentences], gold_standard]
-    dr = CoNLLDataReader()
-    dr.read_data("DemoData/one_text")
-    data = dr.data
-
-    # Transforms data into a list of document objects.
-    data_transformer = DataTranformer()
-    transformed_data = data_transformer.create_document_objects_from_data(data)
-    # Get out the mentions from the first document first sentence:
-    # data = list of document objects
-    # print(transformed_data[0].sentences[0].mentions)
-
-    # Extract mentions for each document object
-    for document in transformed_data:
-        # Extracts all mention (all tagged NPs).
-        # This will initialize also the clusters for the document,
-        # bc all mention is first a cluster of its own.
-        document.extract_mentions()
-        # mention = dict of mention objects:
-        # keys are the (sent_num, span_start, span_end)
-
-        # print(document.clusters[0].mentions)
-
-        # Cluster object:
-        #   - ID = (int) a unique number to identify the cluster
-        #   - information = (set) shared attributes a cluster has
-        #   - head_mention_span:
-        #       tuple(sent_num(int), span_start(int), span_end(int))
-        #   - mentions = [list] of mentions, initialized with the head_mention
-        #       - one mention be like : (0, 1, 5)
-        #       - (sentence, span_start, span_end)
-
-        # Instantiate sieve objects
-        exact_sieve_pass = ExactMatchSieve()
-        precise_construct_pass = PreciseConstructSieve()
-        pronoun_sieve = PronounSieve()
-
-        # Instantiate the CoreferenceChainResolver
-        # First argument is a document object
-        # Second argument is a list of sieve objects
-        #   - They have to inherit from the AbstractSieve Class
-        #   - The sieve method of the sieve objects will be applied the document
-        #     object in order of the passed list of sieve objects
-        coref_chain_resolver = CoreferenceChainResolver()
-        coref_chain_resolver.resolve(document, [exact_sieve_pass,
-                                                precise_construct_pass,
-                                                pronoun_sieve])
-
-        # Apply all sieves on the document
-        sieved_document_obj = coref_chain_resolver.sieve_mentions()
-
-        # Get modified cluster from document
-        clusters = list(sieved_document_obj.get_clusters())
-        for cluster in clusters:
-            if len(cluster.mentions) > 1:
-                print(cluster.mentions)
-
-        # Evaluation:
-        #   Pairwise F1 is used for evaluation, in which pairs are formed from
-        #   mentions within each cluster (transitive shell), which are compared
-        #   to the pairs of the gold standard. Singleton clusters containing only
-        #   one mention, are ignored.
-
-        # print(document.gold)
-        # output: [[[0, 23, 24], [1, 14, 15], [4, 29, 30]],
-        # [[9, 11, 12], [12, 10, 11]]]
-
-        f1_score = coref_chain_resolver.evaluate(document.gold)
-        print(f1_score)
-
-
-if __name__ == "__main__":
-    # If you want to run the demo, uncomment demo() and incomment cli()
-    # demo()
-    cli()
+# Script to determine conference chains using the Multi-Sieve-Pass Algorithm.
+import os
+import threading
+import time
+import click
+import json
+
+# data reader, the transformer into document objects is imported where the
+# documents are built (the documents need NumPy)
+from DataReader.conll_data_reader import CoNLLDataReader
+
+# sieve classes selectable by name and their requirements, the sieve modules
+# are imported when a sieve is used
+from MultiSievePassCorefResolution.sieve_registry import SIEVES, \
+    DEFAULT_SIEVES, parse_sieve_names, get_requirements, get_sieve_class, \
+    create_sieves
+from MultiSievePassCorefResolution.errors import UnknownSieveError
+
+# splitting a corpus in shards and merging their outputs
+from CorpusProcessing.sharding import parse_shard, select_shard, \
+    merge_shard_outputs, get_input_key, OUTPUT_PREFIX
+# record of the finished input files to resume runs
+from CorpusProcessing.manifest import RunManifest, get_file_hash, \
+    create_file_hash, get_code_version
+# limits of the documents processed at the same time
+from CorpusProcessing.scheduler import BoundedExecutor, get_document_tokens, \
+    estimate_cost_from_tokens, estimate_file_cost, order_longest_first
+
+# the scores that runs can be compared by. The modules only a run, an option
+# or a command needs are imported there: the pipeline and the thread pool,
+# the corpus index, the metrics (http.server), the CoNLL output, the memory
+# profiler (tracemalloc), the SQLite results (sqlite3), the sieve ablation
+# and the significance tests (NumPy)
+from MultiSievePassCorefResolution.coreference_metrics import ALL_METRICS
+
+MEMORY_PROFILE_FILE = "memory_profile.json"
+
+
+def create_json_file(dictionary, filename_out):
+    """
+    Parameter:
+                dictionary : tokens are key, counts are values
+                filename_out (str) : path to the result csv-file
+
+    Create a json.file.
+    """
+    with open(filename_out, 'w',encoding='utf-8', newline='\n') \
+            as json_file:
+        json.dump(dictionary, json_file)
+
+
+def get_output_file_name(document_name):
+    """Returns the name of the json output file of a document."""
+    return OUTPUT_PREFIX + document_name + ".json"
+
+
+def record_stage(metrics, stage, stage_start):
+    """Records the duration of a stage, if metrics are collected.
+    Returns the start time of the next stage."""
+    now = time.perf_counter()
+    if metrics is not None:
+        metrics.record_stage(stage, now - stage_start)
+
+    return now
+
+
+def exec(document, out_put_dir, pipeline=None, metrics=None,
+         memory_profiler=None, result_store=None):
+    """Running multiple threads. One document is one thread.
+    The Pipeline holds the sieves (shared by all documents and threads) and
+    the budget limits of the documents, default: Pipeline(). If a RunMetrics
+    object is passed, the durations of the stages are recorded. With a
+    MemoryProfiler the traced memory is recorded after every stage. With a
+    ResultStore the result is also stored in its database. Returns the
+    output of the document (see Pipeline.get_result)."""
+    if pipeline is None:
+        from MultiSievePassCorefResolution.pipeline import Pipeline
+        pipeline = Pipeline()
+    print(f"thread {threading.current_thread().getName()} "
+          f"for file {document.path} started...")
+    if metrics is not None:
+        metrics.document_started()
+    start = stage_start = time.perf_counter()
+
+    sieve_done = None
+    if memory_profiler is not None:
+        tokens = get_document_tokens(document)
+        memory_profiler.begin(document.path)
+        sieve_done = lambda sieve: memory_profiler.record(
+            "sieve:" + type(sieve).__name__, document.path, tokens=tokens)
+
+    document.extract_mentions()
+    stage_start = record_stage(metrics, "extract_mentions", stage_start)
+    if memory_profiler is not None:
+        memory_profiler.record("extract_mentions", document.path,
+                               tokens=tokens)
+
+    # Apply all sieves on the document
+    coref_chain_resolver, budget = pipeline.apply_sieves(document, sieve_done)
+    stage_start = record_stage(metrics, "sieves", stage_start)
+
+    # clusters, evaluation and mention stats of the document
+    out_put = pipeline.get_result(document, coref_chain_resolver, budget)
+    if out_put["degraded"]:
+        print(f"document {document.path} degraded: "
+              f"{'; '.join(budget.degradations)}")
+    stage_start = record_stage(metrics, "evaluate", stage_start)
+
+    # save results in a json file
+    create_json_file(out_put, out_put_dir + "/"
+                     + get_output_file_name(document.path))
+    if result_store is not None:
+        result_store.add_document(out_put, document)
+    record_stage(metrics, "write", stage_start)
+    if memory_profiler is not None:
+        memory_profiler.record("write", document.path, tokens=tokens,
+                               end=True)
+    if metrics is not None:
+        metrics.document_finished(document, time.perf_counter() - start)
+    print(f"thread {threading.current_thread().getName()} "
+          f"for file {document.path}  finished!")
+
+    return out_put
+
+
+@click.group(invoke_without_command=True)
+@click.option('-f', 'file_path', type=click.Path(exists=True),
+              help='The file path (str) to the data.  [required]')
+@click.option('-o', 'out_put_dir', type=click.Path(exists=True),
+              help='The file path (str) were the output '
+                   'will be saved.  [required]')
+@click.option('--shard', 'shard', default=None,
+              help='Process only one shard of the files, given as i/n with '
+                   '0 <= i < n. Files are assigned by a hash of their path.')
+@click.option('--balance-by-size', is_flag=True,
+              help='Assign the files to the shards by file size instead of '
+                   'by hash, so that all shards get about the same bytes.')
+@click.option('-w', 'workers', type=click.IntRange(min=1),
+              default=min(32, (os.cpu_count() or 1) + 4),
+              help='Number of worker threads.', show_default=True)
+@click.option('--max-in-flight', type=click.IntRange(min=1), default=None,
+              help='Maximal number of documents read but not finished. '
+                   '[default: 2 * workers]')
+@click.option('--max-in-flight-tokens', type=click.IntRange(min=1),
+              default=None, help='Maximal number of tokens of the documents '
+                                 'read but not finished.')
+@click.option('--max-rss-mb', type=click.IntRange(min=1), default=None,
+              help='Wait with reading new documents while the memory of the '
+                   'process is above this limit (Linux only).')
+@click.option('--schedule', type=click.Choice(['lpt', 'input']),
+              default='lpt', show_default=True,
+              help='Order in which the documents are dispatched: lpt = '
+                   'largest files first and within a file the documents with '
+                   'the highest estimated cost first (only for files in the '
+                   'corpus index, the others in file order), input = order '
+                   'of the directory listing.')
+@click.option('--progress', 'progress_seconds', type=float, default=None,
+              help='Print a progress line with throughput metrics every '
+                   'given seconds.')
+@click.option('--metrics-file', type=click.Path(dir_okay=False),
+              default=None, help='Write the metrics periodically to this '
+                                 'file in the Prometheus text format.')
+@click.option('--metrics-port', type=click.IntRange(min=1, max=65535),
+              default=None, help='Serve the metrics in the Prometheus text '
+                                 'format on http://127.0.0.1:PORT/.')
+@click.option('--resume', is_flag=True,
+              help='Skip input files, whose outputs in the output directory '
+                   'were produced from the same content, sieves, budget '
+                   'limits and code version without degraded documents (see '
+                   'manifest.jsonl).')
+@click.option('--document-seconds', type=click.FloatRange(min=0),
+              default=None, help='Time budget of the sieves per document. '
+                                 'When it runs short, expensive sieves are '
+                                 'skipped, when it is exceeded, the clusters '
+                                 'found so far are written.')
+@click.option('--sieve-seconds', type=click.FloatRange(min=0), default=None,
+              help='Time budget per sieve and document, after which the '
+                   'sieve stops.')
+@click.option('--max-candidates', type=click.IntRange(min=1), default=None,
+              help='Maximal number of candidates checked per mention, the '
+                   'closest ones are kept.')
+@click.option('--index-file', type=click.Path(dir_okay=False), default=None,
+              help='Corpus index built with the index command.  '
+                   '[default: corpus_index.json in the corpus directory]')
+@click.option('--doc', 'document_ids', multiple=True,
+              help='Process only this document, given by its ID (all parts, '
+                   'e.g. bc/cctv/00/cctv_0000) or its name (one part). Can be '
+                   'given more than once. Uses the corpus index.')
+@click.option('--conll-output', is_flag=True,
+              help='Also write the input files with the clusters in the last '
+                   'column (CoNLL-2012 format) to the output directory. The '
+                   'input files are read (and decompressed) a second time.')
+@click.option('--sieves', 'sieves', default=",".join(DEFAULT_SIEVES),
+              show_default=True,
+              help='Comma separated names of the sieves in the order they '
+                   'are applied, from: ' + ", ".join(SIEVES) + '. Only the '
+                   'structures the sieves need are built for the documents.')
+@click.option('--mentions', type=click.Choice(['parse', 'gold']),
+              default='parse', show_default=True,
+              help='Where the mentions come from: parse = the NPs of the '
+                   'parse trees, gold = the spans of the gold standard (the '
+                   'tree column is then only read if a sieve requires it).')
+@click.option('--sqlite', 'sqlite_path', type=click.Path(dir_okay=False),
+              default=None,
+              help='Also store the documents, scores, clusters and mentions '
+                   'in this SQLite database (created if needed), every run '
+                   'with its own run_id.')
+@click.option('--profile-memory', is_flag=True,
+              help='Trace the memory with tracemalloc after every stage and '
+                   'write the bytes per document and token of the stages and '
+                   'the top allocation sites to memory_profile.json in the '
+                   'output directory. Slow, use it with -w 1 for an exact '
+                   'attribution to the stages.')
+@click.pass_context
+def cli(ctx, file_path, out_put_dir, shard, balance_by_size, workers,
+        max_in_flight, max_in_flight_tokens, max_rss_mb, schedule,
+        progress_seconds, metrics_file, metrics_port, resume,
+        document_seconds, sieve_seconds, max_candidates, index_file,
+        document_ids, conll_output, sieves, mentions, sqlite_path,
+        profile_memory):
+    # a command like "ablate" was given, that does its own work
+    if ctx.invoked_subcommand is not None:
+        return
+
+    if file_path is None or out_put_dir is None:
+        raise click.UsageError('Options -f and -o are required.')
+
+    if document_ids and resume:
+        raise click.UsageError('Options --doc and --resume can not be '
+                               'combined.')
+
+    if document_ids and conll_output:
+        raise click.UsageError('Options --doc and --conll-output can not be '
+                               'combined.')
+
+    from concurrent.futures.thread import ThreadPoolExecutor
+
+    # resolving documents in-process with sieves shared by all documents
+    from MultiSievePassCorefResolution.pipeline import Pipeline
+    # index of the documents and sentences of a corpus
+    from CorpusProcessing.corpus_index import CorpusIndex, INDEX_FILE, \
+        get_index_path
+    # builds the document objects of the documents that are read
+    from DataReader.data_transformer import DataTranformer
+
+    # every document gets its own budget with these limits
+    budget_limits = {name: limit for name, limit
+                     in [("document_seconds", document_seconds),
+                         ("sieve_seconds", sieve_seconds),
+                         ("max_candidates", max_candidates)]
+                     if limit is not None}
+
+    # the sieve objects are created once and used in all threads
+    try:
+        pipeline = Pipeline(parse_sieve_names(sieves), mentions,
+                            budget_limits)
+    except UnknownSieveError as error:
+        raise click.BadParameter(str(error), param_hint='--sieves')
+
+    data_reader = CoNLLDataReader()
+    root = None
+    file_list = [file_path]
+    if os.path.isdir(file_path):
+        root = file_path
+        file_list = [path for path
+                     in data_reader.get_files_from_folder(file_path)
+                     if os.path.basename(path) != INDEX_FILE]
+
+    # the costs of the files are taken from the index, if all are indexed
+    corpus_index = CorpusIndex(root)
+    corpus_index.load(index_file or get_index_path(file_path))
+    file_costs = {path: corpus_index.get_file_cost(path) for path in file_list}
+    if None in file_costs.values():
+        file_costs = None
+
+    # only the parts of the given documents are read, unindexed files are
+    # indexed in memory
+    document_parts = {}
+    if document_ids:
+        corpus_index.build(file_list, data_reader)
+        for path, part in corpus_index.find_documents(document_ids):
+            document_parts.setdefault(path, []).append(part)
+        if not document_parts:
+            raise click.BadParameter('No such document in the corpus.',
+                                     param_hint='--doc')
+        file_list = [path for path in file_list if path in document_parts]
+
+    if shard is not None:
+        try:
+            shard_index, shard_count = parse_shard(shard)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint='--shard')
+
+        file_list = select_shard(file_list, shard_index, shard_count,
+                                 balance_by_size, root, file_costs)
+
+    # longest-processing-time-first: the cost of the files is estimated
+    # from their size, the one of the documents from their sentences
+    if schedule == 'lpt':
+        file_list = order_longest_first(
+            file_list, file_costs.get if file_costs else estimate_file_cost)
+
+    # the manifest records the finished input files, on resume the files
+    # with valid outputs are not even read
+    manifest = RunManifest(out_put_dir, pipeline.sieve_names,
+                           get_code_version(),
+                           mentions, budget_limits)
+    if resume:
+        manifest.load()
+
+    # the CoNLL output of a file is written when all its documents are done
+    conll_writer = None
+    if conll_output:
+        from CorpusProcessing.conll_writer import ConllOutput, \
+            get_conll_output_name
+        conll_writer = ConllOutput(out_put_dir, data_reader)
+
+    # thread pool for async processing of documents, the bounded executor
+    # accepts a new document only if the limits of in-flight work allow it
+    executor = ThreadPoolExecutor(max_workers=workers,
+                                  thread_name_prefix='COREF')
+    max_rss_bytes = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+    bounded_executor = BoundedExecutor(executor,
+                                       max_in_flight or 2 * workers,
+                                       max_in_flight_tokens, max_rss_bytes)
+    data_transformer = DataTranformer()
+
+    # metrics are collected if they are reported in any way
+    metrics = None
+    reporter = None
+    if progress_seconds or metrics_file or metrics_port:
+        # throughput metrics and progress reports
+        from CorpusProcessing.metrics import RunMetrics, MetricsReporter
+        metrics = RunMetrics(workers)
+        reporter = MetricsReporter(metrics, progress_seconds or 5.0,
+                                   bool(progress_seconds), metrics_file,
+                                   metrics_port)
+        reporter.start()
+
+    # one writer thread inserts the results of all documents
+    result_store = None
+    if sqlite_path:
+        import sqlite3
+        from CorpusProcessing.result_store import ResultStore
+        result_store = ResultStore(sqlite_path)
+        try:
+            result_store.start(file_path, pipeline.sieve_names, mentions,
+                               manifest.code_version)
+        except sqlite3.Error as error:
+            raise click.BadParameter(str(error), param_hint='--sqlite')
+
+    memory_profiler = None
+    if profile_memory:
+        # memory of the stages, traced with tracemalloc
+        from CorpusProcessing.memory_profile import MemoryProfiler
+        memory_profiler = MemoryProfiler()
+        memory_profiler.start()
+
+    skipped_files = 0
+    for file in file_list:
+        input_key = get_input_key(file, root)
+        # the hash is only needed for the manifest: on resume before the
+        # file is read, to skip it, else it is computed while it is read
+        input_hash = None
+        file_hash = None
+        if resume:
+            input_hash = get_file_hash(file)
+            if manifest.is_up_to_date(input_key, input_hash):
+                skipped_files += 1
+                continue
+        elif not document_ids:
+            file_hash = create_file_hash()
+
+        # with lpt the parts of an indexed (uncompressed) file are read at
+        # their offsets, the most expensive ones first, else in file order
+        parts = None
+        if document_ids:
+            parts = document_parts[file]
+        elif schedule == 'lpt':
+            entry = corpus_index.get_entry(file)
+            if entry is not None and entry["parts"]:
+                parts = entry["parts"]
+                # the file is not read as a whole, the index has its hash
+                if file_hash is not None:
+                    input_hash = entry.get("hash") or get_file_hash(file)
+                    file_hash = None
+
+        # the documents are read one after another: the next one only when
+        # a slot is free, the reader does not keep the previous ones
+        if parts is not None:
+            # the CoNLL output takes the clusters in the order of the file
+            if conll_writer is not None:
+                for part in parts:
+                    conll_writer.add_document(input_key, file, part["name"])
+            # [file_path, document, gold] of the parts at their offsets
+            if schedule == 'lpt':
+                parts = order_longest_first(
+                    parts, lambda part: estimate_cost_from_tokens(
+                        sentence[2] for sentence in part["sentences"]))
+            documents = ([part["name"]] + list(data_reader.read_part(
+                file, part["start"], part["end"])) for part in parts)
+        else:
+            documents = data_reader.iterate_documents(file, file_hash)
+
+        while True:
+            bounded_executor.wait_for_slot()
+            stage_start = time.perf_counter()
+            if memory_profiler is not None:
+                memory_profiler.begin(input_key)
+            new_document = next(documents, None)
+            if new_document is None:
+                break
+            stage_start = record_stage(metrics, "read", stage_start)
+            tokens = sum(len(sentence) for sentence in new_document[1])
+            if memory_profiler is not None:
+                memory_profiler.record("read", input_key, tokens=tokens)
+
+            # the document object is only built right before it is submitted
+            document = data_transformer.create_document_object(
+                *new_document, data_reader.vocabulary, pipeline.requirements,
+                pipeline.gold_mentions)
+            del new_document
+            record_stage(metrics, "transform", stage_start)
+            if memory_profiler is not None:
+                memory_profiler.record("transform", input_key, tokens=tokens,
+                                       end=True)
+
+            # single documents do not finish an input file
+            if not document_ids:
+                manifest.add_document(input_key,
+                                      get_output_file_name(document.path))
+            if conll_writer is not None and parts is None:
+                conll_writer.add_document(input_key, file, document.path)
+
+            # on every document
+            # - sieves will be applied,
+            # - f1 score calculated and
+            # - json result written to file
+            # in a separate thread managed by the thread pool
+            future = bounded_executor.submit(
+                exec, document, out_put_dir, pipeline, metrics,
+                memory_profiler, result_store, tokens=tokens)
+            if metrics is not None:
+                metrics.document_submitted()
+            # the CoNLL output is written before the manifest entry
+            if conll_writer is not None:
+                future.add_done_callback(
+                    lambda done, key=input_key, name=document.path:
+                    done.exception() is None
+                    and conll_writer.document_done(
+                        key, name, done.result()["clusters"]))
+            if not document_ids:
+                future.add_done_callback(
+                    lambda done, key=input_key:
+                    done.exception() is None and manifest.document_done(
+                        key, done.result()["degraded"]))
+            # the finished document is not referenced anymore
+            del document, future
+
+        # the file is finished when its last documents are done
+        if not document_ids:
+            outputs = []
+            if conll_writer is not None:
+                conll_writer.input_read(input_key, file)
+                # the names of the members of an archive are not known here
+                if not data_reader.is_archive(file):
+                    outputs.append(get_conll_output_name(
+                        data_reader.get_document_name(file)))
+            if file_hash is not None:
+                input_hash = file_hash.hexdigest()
+            manifest.input_read(input_key, input_hash, outputs)
+
+    if resume:
+        print(f"{skipped_files} of {len(file_list)} files are up to date "
+              f"and skipped.")
+
+    # waiting for all submitted documents to be finished before
+    # program will terminate
+    try:
+        bounded_executor.wait()
+    finally:
+        executor.shutdown()
+        if reporter is not None:
+            reporter.stop()
+        if result_store is not None:
+            result_store.close()
+            print(f"results stored in {sqlite_path} as run "
+                  f"{result_store.run_id}")
+        if memory_profiler is not None:
+            memory_profiler.write_report(os.path.join(out_put_dir,
+                                                      MEMORY_PROFILE_FILE))
+            memory_profiler.stop()
+            print(memory_profiler.format_report())
+
+    makespan, ideal = bounded_executor.get_makespan(workers)
+    if makespan > 0:
+        print(f"makespan: {makespan:.2f}s, ideal: {ideal:.2f}s "
+              f"(+{makespan / ideal - 1 if ideal > 0 else 0:.0%})")
+
+
+@cli.command()
+@click.option('-i', 'shard_dirs', type=click.Path(exists=True),
+              multiple=True, required=True,
+              help='An output directory of one shard. Can be given multiple '
+                   'times.')
+@click.option('-o', 'out_put_dir', type=click.Path(exists=True),
+              required=True, help='The directory were the merged results '
+                                  'will be saved.')
+def merge(shard_dirs, out_put_dir):
+    """Merges the outputs of shards into one result file (merged_results.json)
+    and reports the corpus scores of the summed up pair counts."""
+    try:
+        merged = merge_shard_outputs(shard_dirs)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    create_json_file(merged, os.path.join(out_put_dir, "merged_results.json"))
+
+    print(f"{len(merged['documents'])} documents from "
+          f"{len(shard_dirs)} shards")
+    print(f"true positives: {merged['true_positives']}, "
+          f"false positives: {merged['false_positives']}, "
+          f"false negatives: {merged['false_negatives']}")
+    print(f"precision: {merged['precision']:.4f}, "
+          f"recall: {merged['recall']:.4f}, f1: {merged['f1']:.4f}")
+    for metric, scores in merged['metrics'].items():
+        print(f"{metric}: precision: {scores['precision']:.4f}, "
+              f"recall: {scores['recall']:.4f}, f1: {scores['f1']:.4f}")
+    print(f"conll f1: {merged['conll_f1']:.4f}")
+
+
+@cli.command()
+@click.option('-a', 'run_a_dirs', type=click.Path(exists=True),
+              multiple=True, required=True,
+              help='An output directory (or shard directory) of the first '
+                   'run. Can be given multiple times.')
+@click.option('-b', 'run_b_dirs', type=click.Path(exists=True),
+              multiple=True, required=True,
+              help='An output directory (or shard directory) of the second '
+                   'run. Can be given multiple times.')
+@click.option('--resamples', type=click.IntRange(min=1), default=10000,
+              show_default=True, help='Number of bootstrap resamples.')
+@click.option('--trials', type=click.IntRange(min=1), default=10000,
+              show_default=True,
+              help='Number of approximate randomisation trials.')
+@click.option('--confidence', type=click.FloatRange(min=0, max=1),
+              default=0.95, show_default=True,
+              help='Level of the bootstrap confidence intervals.')
+@click.option('--seed', type=int, default=None,
+              help='Seed of the random numbers, for reproducible p-values.')
+@click.option('--metric', type=click.Choice(ALL_METRICS),
+              default='pairwise', show_default=True,
+              help='The f1-score that is compared, conll is the average of '
+                   'muc, bcub and ceafe.')
+def compare(run_a_dirs, run_b_dirs, resamples, trials, confidence, seed,
+            metric):
+    """Compares the f1-scores of two runs on the same corpus: paired
+    bootstrap confidence intervals and the p-values of the bootstrap and of
+    approximate randomisation over the documents both runs resolved."""
+    from CorpusProcessing.significance import load_run, compare_runs
+
+    try:
+        comparison = compare_runs(load_run(run_a_dirs, metric),
+                                  load_run(run_b_dirs, metric),
+                                  resamples, trials, confidence, seed)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    print(f"{comparison['documents']} documents "
+          f"(only in a: {comparison['only_a']}, "
+          f"only in b: {comparison['only_b']})")
+    print(f"{'run':<10}  {'f1':>8}  {confidence:.0%} interval ({metric})")
+    for run, key in [("a", "f1_a"), ("b", "f1_b"), ("b - a", "difference")]:
+        low, high = comparison[key + "_interval"]
+        print(f"{run:<10}  {comparison[key]:8.4f}  [{low:.4f}, {high:.4f}]")
+    print(f"paired bootstrap ({resamples} resamples): "
+          f"p = {comparison['bootstrap_p']:.4f}")
+    print(f"approximate randomisation ({trials} trials): "
+          f"p = {comparison['randomization_p']:.4f}")
+    print(f"{comparison['seconds']:.3f}s")
+
+
+@cli.command()
+@click.option('-f', 'file_path', type=click.Path(exists=True), required=True,
+              help='The file path (str) to the data (file or directory).')
+@click.option('--index-file', type=click.Path(dir_okay=False), default=None,
+              help='Path of the index.  [default: corpus_index.json in the '
+                   'corpus directory]')
+def index(file_path, index_file):
+    """Builds an index with the byte offsets and token counts of the files,
+    document parts and sentences of a corpus. Files that did not change
+    since the last index are not read again."""
+    from CorpusProcessing.corpus_index import CorpusIndex, INDEX_FILE, \
+        get_index_path
+
+    data_reader = CoNLLDataReader()
+    root = None
+    file_list = [file_path]
+    if os.path.isdir(file_path):
+        root = file_path
+        file_list = [path for path
+                     in data_reader.get_files_from_folder(file_path)
+                     if os.path.basename(path) != INDEX_FILE]
+
+    index_file = index_file or get_index_path(file_path)
+    corpus_index = CorpusIndex(root)
+    corpus_index.load(index_file)
+    corpus_index.build(file_list, data_reader)
+    corpus_index.save(index_file)
+
+    parts = [part for entry in corpus_index.files.values()
+             for part in entry["parts"] or []]
+    print(f"{len(corpus_index.files)} files, {len(parts)} documents, "
+          f"{sum(len(part['sentences']) for part in parts)} sentences, "
+          f"{sum(part['tokens'] for part in parts)} tokens")
+    print(f"index written to {index_file}")
+
+
+def parse_sieve_configuration(configuration, sieve_objects):
+    """Turns a comma separated list of sieve names like "exact,pronoun" into
+    a list of sieve objects. The same sieve object is used for a name in all
+    configurations, so that the configurations can share their prefixes."""
+    try:
+        names = parse_sieve_names(configuration)
+    except UnknownSieveError as error:
+        raise click.BadParameter(str(error))
+
+    configuration_objects = []
+    for name in names:
+        if name not in sieve_objects:
+            sieve_objects[name] = get_sieve_class(name)()
+        configuration_objects.append(sieve_objects[name])
+
+    return configuration_objects
+
+
+@cli.command()
+@click.option('-f', 'file_path', type=click.Path(exists=True),
+              required=True, help='The file path (str) to the data.')
+@click.option('-c', 'configurations', multiple=True, required=True,
+              help='A sieve configuration: comma separated sieve names in '
+                   'the order they are applied, e.g. exact,precise,pronoun. '
+                   'Can be given multiple times.')
+@click.option('--mentions', type=click.Choice(['parse', 'gold']),
+              default='parse', show_default=True,
+              help='Where the mentions come from: parse = the NPs of the '
+                   'parse trees, gold = the spans of the gold standard (the '
+                   'tree column is then only read if a sieve requires it).')
+def ablate(file_path, configurations, mentions):
+    """Compares sieve configurations on one corpus. Every document is parsed
+    once and sieves that configurations share at the beginning are applied
+    only once."""
+    from MultiSievePassCorefResolution.sieve_ablation import SieveAblation
+    from DataReader.data_transformer import DataTranformer
+
+    sieve_objects = {}
+    configuration_objects = [parse_sieve_configuration(conf, sieve_objects)
+                             for conf in configurations]
+    # the structures needed by any of the configurations
+    requirements = get_requirements(sieve_objects)
+
+    start = time.perf_counter()
+    data_reader = CoNLLDataReader()
+    data_reader.read_data(file_path)
+    data_transformer = DataTranformer()
+    transformed_data = data_transformer.create_document_objects_from_data(
+        data_reader.data, data_reader.vocabulary, requirements,
+        mentions == 'gold')
+    read_seconds = time.perf_counter() - start
+    ablation = SieveAblation(configuration_objects)
+    for document in transformed_data:
+        ablation.run(document)
+
+    # table with one row per configuration
+    width = max(len(conf) for conf in configurations + ("configuration",))
+    print(f"{'configuration':<{width}}  precision     recall         f1"
+          f"     muc f1    bcub f1   ceafe f1   conll f1  sieve time (s)")
+    for conf, result in zip(configurations, ablation.get_results()):
+        metric_f1 = "".join(f"{scores['f1']:9.4f}  " for scores
+                            in result['metrics'].values())
+        print(f"{conf:<{width}}  {result['precision']:9.4f}  "
+              f"{result['recall']:9.4f}  {result['f1']:9.4f}  "
+              f"{metric_f1}{result['conll_f1']:9.4f}  "
+              f"{result['seconds']:14.3f}")
+
+    independent_seconds = sum(result['seconds']
+                              for result in ablation.get_results())
+    print(f"\n{ablation.documents} documents, "
+          f"read and parse: {read_seconds:.3f}s, "
+          f"mention extraction: {ablation.mention_seconds:.3f}s")
+    print(f"sieve time: {ablation.get_shared_seconds():.3f}s "
+          f"(independent runs: {independent_seconds:.3f}s)")
+
+
+def demo():
+    from DataReader.data_transformer import DataTranformer
+    # class dealing with the application of the sieves on the document object
+    from MultiSievePassCorefResolution.coreference_chain_resolver \
+        import CoreferenceChainResolver
+
+    # Instantiate a CoNLLDataReader object,
+    #   - which reads the data in from a given data path.
+    #   - The cleaned data is attribute from this class.
+    # data = [[file_path, documents[list of sentences], gold_standard]
+    dr = CoNLLDataReader()
+    dr.read_data("DemoData/one_text")
+    data = dr.data
+
+    # Transforms data into a list of document objects.
+    data_transformer = DataTranformer()
+    transformed_data = data_transformer.create_document_objects_from_data(
+        data, dr.vocabulary)
+    # Get out the mentions from the first document first sentence:
+    # data = list of document objects
+    # print(transformed_data[0].sentences[0].mentions)
+
+    # Extract mentions for each document object
+    for document in transformed_data:
+        # Extracts all mention (all tagged NPs).
+        # This will initialize also the clusters for the document,
+        # bc all mention is first a cluster of its own.
+        document.extract_mentions()
+        # mention = dict of mention objects:
+        # keys are the (sent_num, span_start, span_end)
+
+        # print(document.clusters[0].mentions)
+
+        # Cluster object:
+        #   - ID = (int) a unique number to identify the cluster
+        #   - information = (set) shared attributes a cluster has
+        #   - head_mention_span:
+        #       tuple(sent_num(int), span_start(int), span_end(int))
+        #   - mentions = [list] of mentions, initialized with the head_mention
+        #       - one mention be like : (0, 1, 5)
+        #       - (sentence, span_start, span_end)
+
+        # Instantiate sieve objects (exact, precise, pronoun)
+        sieve_objects = create_sieves(DEFAULT_SIEVES)
+
+        # Instantiate the CoreferenceChainResolver
+        # First argument is a document object
+        # Second argument is a list of sieve objects
+        #   - They have to inherit from the AbstractSieve Class
+        #   - The sieve method of the sieve objects will be applied the document
+        #     object in order of the passed list of sieve objects
+        coref_chain_resolver = CoreferenceChainResolver()
+        coref_chain_resolver.resolve(document, sieve_objects)
+
+        # Apply all sieves on the document
+        sieved_document_obj = coref_chain_resolver.sieve_mentions()
+
+        # Get modified cluster from document
+        clusters = list(sieved_document_obj.get_clusters())
+        for cluster in clusters:
+            if len(cluster.mentions) > 1:
+                print(cluster.mentions)
+
+        # Evaluation:
+        #   Pairwise F1 is used for evaluation, in which pairs are formed from
+        #   mentions within each cluster (transitive shell), which are compared
+        #   to the pairs of the gold standard. Singleton clusters containing only
+        #   one mention, are ignored.
+
+        # print(document.gold)
+        # output: [[[0, 23, 24], [1, 14, 15], [4, 29, 30]],
+        # [[9, 11, 12], [12, 10, 11]]]
+
+        f1_score = coref_chain_resolver.evaluate(document.gold)
+        print(f1_score)
+
+
+if __name__ == "__main__":
+    # If you want to run the demo, uncomment demo() and incomment cli()
+    # demo()
+    cli()